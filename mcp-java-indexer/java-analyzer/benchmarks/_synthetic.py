@@ -0,0 +1,81 @@
+"""
+벤치마크용 합성 Java 소스 생성기
+
+실제 Spring 서비스 코드와 비슷하게 Javadoc(한국어 포함), 어노테이션, 필드, 오버로드 메서드,
+중첩 클래스를 섞은 결정적(deterministic) 소스를 만듭니다.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# benchmarks/ 에서 직접 실행해도 java-analyzer 패키지를 import할 수 있도록 경로 추가
+_ANALYZER_ROOT = Path(__file__).resolve().parents[1]
+if str(_ANALYZER_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ANALYZER_ROOT))
+
+FIXTURES_DIR = _ANALYZER_ROOT / "tests" / "fixtures"
+
+
+def _method(class_idx: int, method_idx: int) -> str:
+    return f"""
+  /**
+   * 메일 사용자 기준으로 상세 정보를 조회합니다. ({class_idx}-{method_idx})
+   *
+   * @param user 조회 대상 사용자
+   * @param limit 최대 건수
+   * @return 조회 결과 목록
+   */
+  @Transactional(readOnly = true)
+  public java.util.List<Detail{class_idx}> selectDetailByMailUser{method_idx}(
+      final MailUser user,
+      int limit) throws IllegalStateException {{
+    java.util.List<Detail{class_idx}> result = new java.util.ArrayList<>();
+    for (int i = 0; i < limit; i++) {{
+      if (user.isActive() && i % 2 == 0) {{
+        result.add(repository.find(user.getId(), i));
+      }}
+    }}
+    return result;
+  }}
+"""
+
+
+def synthetic_class(class_idx: int, methods: int = 20, fields: int = 6) -> str:
+    parts = [
+        "/**",
+        f" * 합성 서비스 클래스 {class_idx}",
+        " */",
+        "@Slf4j",
+        "@Service",
+        "@RequiredArgsConstructor",
+        f"public class SyntheticService{class_idx} extends AbstractService<Long> implements Runnable {{",
+    ]
+    for field_idx in range(fields):
+        parts.append(f"  /** 필드 {field_idx} */")
+        parts.append(f"  private final Repository{field_idx} repository{field_idx};")
+    parts.append(f"  public SyntheticService{class_idx}(Repository0 repository0) {{ this.repository0 = repository0; }}")
+    for method_idx in range(methods):
+        parts.append(_method(class_idx, method_idx))
+    parts.append("  public static class Nested {")
+    parts.append("    private int value;")
+    parts.append("    public int getValue() { return value; }")
+    parts.append("  }")
+    parts.append("}")
+    return "\n".join(parts)
+
+
+def synthetic_source(classes: int = 10, methods: int = 20, fields: int = 6) -> str:
+    header = "package com.example.synthetic;\n\nimport java.util.*;\n\n"
+    return header + "\n\n".join(synthetic_class(idx, methods, fields) for idx in range(classes)) + "\n"
+
+
+def write_synthetic_file(directory: Path, name: str = "Synthetic.java", **kwargs) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_text(synthetic_source(**kwargs), encoding="utf-8")
+    return path
+
+
+def fixture_files() -> list[Path]:
+    return sorted(FIXTURES_DIR.glob("*.java"))
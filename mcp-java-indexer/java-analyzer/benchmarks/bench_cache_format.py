@@ -0,0 +1,92 @@
+"""
+캐시 직렬화 형식 벤치마크
+
+기존 형식(들여쓰기 + ASCII 이스케이프 JSON)과 compact JSON, marshal 바이너리 형식의
+저장/로드 지연 시간과 디스크 사용량을 비교합니다.
+
+    python benchmarks/bench_cache_format.py [--classes 40] [--repeat 200]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from _synthetic import fixture_files, write_synthetic_file
+
+from cache.cache_store import CacheStore
+from cache.serializers import JsonSerializer, MarshalSerializer
+from parser.indexer import _compute_hash, _index_source
+
+
+class _LegacyJsonSerializer(JsonSerializer):
+    """변경 전 CacheStore.save와 같은 출력 (indent=2, ensure_ascii=True)"""
+
+    name = "json-legacy"
+
+    def encode(self, obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=True, indent=2).encode("utf-8")
+
+
+def _index(path: Path) -> dict:
+    source = path.read_bytes()
+    return _index_source(str(path), source, _compute_hash(source))
+
+
+def _bench(serializer, indexes: list[dict], repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CacheStore(Path(tmp), serializer)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for idx, data in enumerate(indexes):
+                store.save(f"F{idx}.java", data, "bench")
+        save_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for idx, data in enumerate(indexes):
+                assert store.load(f"F{idx}.java", data["hash"], "bench") is not None
+        load_s = time.perf_counter() - start
+
+        total_bytes = sum(p.stat().st_size for p in store.cache_dir.iterdir())
+
+    ops = repeat * len(indexes)
+    return {
+        "format": serializer.name,
+        "bytes": total_bytes,
+        "save_us": save_s / ops * 1e6,
+        "load_us": load_s / ops * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", type=int, default=40, help="합성 파일의 클래스 수")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = write_synthetic_file(Path(tmp), classes=args.classes)
+        corpora = {
+            "fixtures": [_index(path) for path in fixture_files()],
+            "synthetic": [_index(synthetic)],
+        }
+
+    for corpus_name, indexes in corpora.items():
+        repeat = args.repeat if corpus_name == "fixtures" else max(1, args.repeat // 10)
+        print(f"\n[{corpus_name}] entries={len(indexes)} repeat={repeat}")
+        print(f"{'format':<12} {'bytes':>10} {'ratio':>7} {'save(us)':>10} {'load(us)':>10}")
+        baseline = None
+        for serializer in (_LegacyJsonSerializer(), JsonSerializer(), MarshalSerializer()):
+            row = _bench(serializer, indexes, repeat)
+            baseline = baseline or row["bytes"]
+            print(
+                f"{row['format']:<12} {row['bytes']:>10} {baseline / row['bytes']:>6.1f}x "
+                f"{row['save_us']:>10.1f} {row['load_us']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
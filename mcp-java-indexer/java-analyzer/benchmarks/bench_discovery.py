@@ -0,0 +1,82 @@
+"""
+Java 파일 탐색 벤치마크
+
+소스 디렉토리 옆에 빌드 출력(target/, pom.xml 옆)과 node_modules/, .git/ 같은 큰 디렉토리가 있는 합성 프로젝트에서
+.java 파일 목록을 만드는 시간을 비교합니다.
+
+- rglob: 이전 방식 (Path.rglob("*.java"), 모든 디렉토리를 내려가고 생성된 소스까지 포함)
+- scandir cold: parser/discovery.py, 디렉토리 목록 캐시가 빈 상태
+- scandir warm: 같은 트리를 다시 훑을 때 (바뀌지 않은 디렉토리는 scandir 없이 stat만)
+
+    python benchmarks/bench_discovery.py [--sources 2000] [--noise 20000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from parser.discovery import clear_listing_cache, iter_java_files
+
+
+def _write_tree(root: Path, sources: int, noise: int) -> None:
+    root.mkdir(parents=True)
+    (root / "pom.xml").write_text("<project/>\n", encoding="utf-8")
+    for idx in range(sources):
+        directory = root / "src" / "main" / "java" / f"pkg{idx % 64}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"Source{idx}.java").write_text(f"class Source{idx} {{}}\n", encoding="utf-8")
+    # 인덱싱하지 않아야 할 디렉토리: 생성된 소스/클래스 파일, 의존성, VCS 객체
+    for idx in range(noise):
+        for parent, name in (
+            (root / "target" / "generated-sources" / f"gen{idx % 128}", f"Generated{idx}.java"),
+            (root / "target" / "classes" / f"pkg{idx % 128}", f"Source{idx}.class"),
+            (root / "node_modules" / f"mod{idx % 256}", f"index{idx}.js"),
+            (root / ".git" / "objects" / f"{idx % 256:02x}", f"{idx:038x}"),
+        ):
+            parent.mkdir(parents=True, exist_ok=True)
+            (parent / name).write_bytes(b"x")
+    # 디렉토리 목록 캐시는 방금 바뀐 디렉토리를 보관하지 않으므로 수정 시각을 과거로 돌린다
+    stamp = time.time() - 60
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, (stamp, stamp))
+
+
+def _best_ms(fn, repeat: int, before=None) -> tuple[float, int]:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        count = sum(1 for _ in fn())
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sources", type=int, default=2000, help="src/ 아래 합성 .java 파일 수")
+    parser.add_argument("--noise", type=int, default=20000, help="target/, node_modules/, .git/ 각각의 파일 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "project"
+        _write_tree(root, args.sources, args.noise)
+
+        rglob_ms, rglob_files = _best_ms(lambda: root.rglob("*.java"), args.repeat)
+        cold_ms, files = _best_ms(lambda: iter_java_files(str(root)), args.repeat, before=clear_listing_cache)
+        warm_ms, _ = _best_ms(lambda: iter_java_files(str(root)), args.repeat)
+
+        print(f"sources={args.sources} noise={args.noise}")
+        print(f"{'method':<14} {'files':>7} {'ms':>9}")
+        print(f"{'rglob':<14} {rglob_files:>7} {rglob_ms:>9.1f}")
+        print(f"{'scandir cold':<14} {files:>7} {cold_ms:>9.1f}")
+        print(f"{'scandir warm':<14} {files:>7} {warm_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+스트리밍 심볼 검색 벤치마크
+
+합성 Java 파일 디렉토리 크기별로, 빈 캐시에서 find_symbols의 첫 결과까지 걸리는 시간을 비교합니다.
+
+- refresh+search: 테이블을 끝까지 갱신한 뒤 검색하던 이전 방식 (refresh_symbol_table + SymbolTable.search)
+- first result: iter_find_symbols가 첫 매치를 내보낼 때까지
+- maxResults: iter_find_symbols가 maxResults(기본 50)개를 채우고 멈출 때까지
+
+    python benchmarks/bench_find_stream.py [--sizes 250,1000,4000] [--max-results 50]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from _synthetic import write_synthetic_file
+
+
+def _write_tree(root: Path, files: int) -> None:
+    stamp = time.time() - 60
+    for idx in range(files):
+        path = write_synthetic_file(root / f"pkg{idx % 64}", f"Synthetic{idx}.java", classes=1, methods=4)
+        # 방금 쓴 파일은 stat을 신뢰하지 않으므로(racy window) 수정 시각을 과거로 돌린다
+        os.utime(path, (stamp, stamp))
+
+
+def _timed_ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="250,1000,4000", help="쉼표로 구분한 합성 파일 수")
+    parser.add_argument("--max-results", type=int, default=50)
+    parser.add_argument("--query", default="ByMailUser")
+    args = parser.parse_args()
+
+    from cache.cache_store import CacheStore
+    from parser.indexer import iter_find_symbols, refresh_symbol_table
+    from parser.symbol_table import invalidate_symbol_tables, symbol_table_for
+
+    options = {"maxResults": args.max_results, "workers": 1}
+    print(f"{'files':>6} {'refresh+search(ms)':>19} {'first result(ms)':>17} {'maxResults(ms)':>15}")
+    for files in [int(size) for size in args.sizes.split(",")]:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "src"
+            _write_tree(root, files)
+
+            def cold(name: str) -> CacheStore:
+                # 캐시/심볼 테이블 모두 빈 상태에서 시작
+                os.environ["MCP_JAVA_INDEX_CACHE_ROOT"] = str(Path(tmp) / name)
+                invalidate_symbol_tables()
+                return CacheStore(Path(tmp) / name)
+
+            cache = cold("refresh")
+
+            def refresh_then_search() -> None:
+                refresh_symbol_table(str(root), cache, workers=1)
+                symbol_table_for(str(root), cache).search(args.query, max_results=args.max_results)
+
+            full_ms = _timed_ms(refresh_then_search)
+            cold("first")
+            first_ms = _timed_ms(lambda: next(iter_find_symbols(str(root), args.query, options)))
+            cold("max")
+            max_ms = _timed_ms(lambda: list(iter_find_symbols(str(root), args.query, options)))
+            print(f"{files:>6} {full_ms:>19.1f} {first_ms:>17.1f} {max_ms:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+증분 재파싱 벤치마크
+
+약 5,000줄짜리 합성 파일에서 한 글자/한 줄을 고친 뒤 다시 인덱싱하는 시간을
+처음부터 파싱하는 경우(보관 트리 없음)와 이전 트리를 Tree.edit()로 재사용하는 경우로 비교합니다.
+
+    python benchmarks/bench_incremental_parse.py [--classes 12] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from _synthetic import synthetic_source
+
+from parser import indexer
+
+
+def _edits(source: bytes) -> dict[str, bytes]:
+    middle = source.index(b"result.add(", len(source) // 2)
+    return {
+        "1-char edit": source[:middle] + b"R" + source[middle + 1 :],
+        "insert line": source[:middle] + b"\n" + source[middle:],
+        "edit first class": source.replace(b"int limit)", b"int limits)", 1),
+    }
+
+
+def _time_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", type=int, default=12, help="합성 클래스 수 (클래스당 약 420줄)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    path = "Synthetic.java"
+    source = synthetic_source(classes=args.classes).encode("utf-8")
+    line_count = source.count(b"\n")
+    print(f"lines={line_count} bytes={len(source)}")
+    print(f"{'edit':<18} {'full(ms)':>9} {'incr(ms)':>9} {'speedup':>8}")
+
+    for label, edited in _edits(source).items():
+
+        def full():
+            indexer._RETAINED_TREES.clear()
+            indexer._index_source(path, edited, "bench")
+
+        def incremental():
+            indexer._RETAINED_TREES.clear()
+            indexer._index_source(path, source, "bench")
+            start = time.perf_counter()
+            indexer._index_source(path, edited, "bench")
+            return time.perf_counter() - start
+
+        full_ms = _time_ms(full, args.repeat)
+        incr_ms = min(incremental() for _ in range(args.repeat)) * 1000
+        print(f"{label:<18} {full_ms:>9.2f} {incr_ms:>9.2f} {full_ms / incr_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Javadoc 탐지 벤치마크
+
+큰 합성 파일의 모든 선언에 대해 Javadoc을 찾는 시간을 비교합니다.
+
+- line-scan: 이전 방식 (소스를 줄 목록으로 만든 뒤 선언 줄에서 위로 한 줄씩 훑기)
+- comment-node: 선언 바로 앞 형제 노드가 `/**` 블록 주석인지 확인 (preceding_comment, 줄 목록 불필요)
+
+    python benchmarks/bench_javadoc_lookup.py [--classes 200] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from _synthetic import synthetic_source
+
+from parser import indexer
+from parser.javadoc import preceding_comment
+
+
+def _declarations(body) -> list:
+    found = []
+    for child in body.named_children:
+        if child.type == "enum_body_declarations":
+            found.extend(_declarations(child))
+        elif child.type.endswith("_declaration"):
+            found.append(child)
+            if child.type in indexer.CLASS_NODE_KINDS:
+                inner = indexer._find_body_node(child)
+                if inner is not None:
+                    found.extend(_declarations(inner))
+    return found
+
+
+def _scan_javadoc(lines: list[str], anchor_line: int) -> bool:
+    # 이전 구현: 선언 줄 위의 빈 줄을 건너뛰고 "*/"로 끝나는 블록이 "/**"로 시작하는지 확인
+    idx = anchor_line - 2
+    while idx >= 0 and lines[idx].strip() == "":
+        idx -= 1
+    if idx < 0 or "*/" not in lines[idx]:
+        return False
+    for j in range(idx, -1, -1):
+        if "/**" in lines[j]:
+            return True
+        if "/*" in lines[j]:
+            return False
+    return False
+
+
+def _line_scan(source: bytes, decls: list) -> int:
+    lines = source.decode("utf-8", errors="replace").splitlines()
+    return sum(_scan_javadoc(lines, decl.start_point[0] + 1) for decl in decls)
+
+
+def _comment_node(source: bytes, decls: list) -> int:
+    return sum(preceding_comment(decl, source)[0] is not None for decl in decls)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", type=int, default=200, help="합성 파일의 클래스 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    source = synthetic_source(classes=args.classes).encode("utf-8")
+    decls = _declarations(indexer._parser().parse(source).root_node)
+    print(f"declarations: {len(decls)}")
+    print(f"{'method':<14} {'found':>6} {'best(ms)':>10}")
+    for label, run in (("line-scan", _line_scan), ("comment-node", _comment_node)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            found = run(source, decls)
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:<14} {found:>6} {best * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+멤버 추출 벤치마크
+
+파싱은 제외하고, 이미 만든 구문 트리에서 클래스/필드/생성자/메서드 dict를 만드는 시간만 측정해
+심볼당 비용(µs)을 보여 줍니다. tests/fixtures의 파일들과 큰 합성 파일을 각각 측정합니다.
+
+    python benchmarks/bench_member_extraction.py [--classes 40] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from _synthetic import fixture_files, synthetic_source
+
+from parser import indexer
+
+
+def _count_symbols(classes: list[dict]) -> int:
+    total = 0
+    for cls in classes:
+        total += 1 + len(cls["fields"]) + len(cls["constructors"]) + len(cls["methods"])
+        total += _count_symbols(cls["innerClasses"])
+    return total
+
+
+def _extract(source: bytes, tree) -> list[dict]:
+    # _index_source()에서 파싱/오류 수집을 뺀 부분과 같다
+    root = tree.root_node
+    ctx = indexer.ParseContext(
+        source_bytes=source,
+        package_name=indexer._package_name(root, source),
+        javadoc_texts={},
+    )
+    classes = []
+    for child in indexer._top_level_classes(root):
+        class_obj = indexer._parse_class_declaration(child, ctx, [])
+        if class_obj:
+            classes.append(class_obj)
+    return classes
+
+
+def _bench(label: str, sources: list[bytes], repeat: int) -> None:
+    trees = [indexer._parser().parse(source) for source in sources]
+    symbols = sum(_count_symbols(_extract(source, tree)) for source, tree in zip(sources, trees))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for source, tree in zip(sources, trees):
+            _extract(source, tree)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<12} {symbols:>8} {best * 1000:>10.2f} {best / symbols * 1e6:>12.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", type=int, default=40, help="합성 파일의 클래스 수")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'input':<12} {'symbols':>8} {'total(ms)':>10} {'µs/symbol':>12}")
+    _bench("fixtures", [path.read_bytes() for path in fixture_files()], args.repeat)
+    _bench("synthetic", [synthetic_source(classes=args.classes).encode("utf-8")], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+인덱스 메모리 벤치마크
+
+큰 합성 코퍼스(파일마다 클래스 이름이 다름)를 인덱싱한 뒤, 메모리에 들고 있는 구조의 심볼당 바이트를
+tracemalloc으로 측정합니다.
+
+정규 인덱스 (메모리 캐시에 올라가는 dict)
+- unshared: JSON으로 한 번 왕복한 dict. 문자열/목록을 심볼마다 따로 갖는 이전 표현과 같다
+- shared: marshal 캐시에서 읽은 dict (parser/compact.py로 공유한 값과 intern된 문자열이 유지됨)
+- estimate: 메모리 캐시가 한도 계산에 쓰는 추정치 (_estimate_size)
+
+심볼 테이블 (find_symbols가 프로세스에 들고 있는 프로젝트 단위 색인)
+- tuples: 심볼마다 레코드 튜플을 만들어 TermIndex에 넣던 이전 구성
+- columns: 현재 구성 (FileSymbols 열 + TermIndex)
+
+    python benchmarks/bench_memory.py [--files 100] [--classes 4]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import marshal
+import tracemalloc
+
+from _synthetic import synthetic_class
+
+from cache.cache_store import _estimate_size
+from parser.indexer import _index_source
+from parser.symbol_table import SymbolTable, extract_symbols
+from parser.trigram_index import TermIndex
+
+
+def _corpus(files: int, classes: int) -> list[tuple[str, bytes]]:
+    header = "package com.example.synthetic;\n\nimport java.util.*;\n\n"
+    sources = []
+    for file_idx in range(files):
+        body = "\n\n".join(synthetic_class(file_idx * classes + idx) for idx in range(classes))
+        sources.append((f"pkg/Synthetic{file_idx}.java", (header + body + "\n").encode("utf-8")))
+    return sources
+
+
+def _traced(build):
+    """build()가 만든 객체와 그 객체가 유지하는 메모리 (바이트)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        built = build()
+        gc.collect()
+        return built, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def _tuple_table(canonicals: list[tuple[str, dict]]) -> tuple[dict, TermIndex]:
+    # 이전 구성: 파일별 레코드 튜플 목록 + TermIndex에 (순번, 레코드)
+    files: dict[str, list] = {}
+    names = TermIndex()
+    for file_path, canonical in canonicals:
+        symbols = extract_symbols(canonical)
+        records = [symbols.record(seq) for seq in range(len(symbols))]
+        files[file_path] = [None, canonical["hash"], records]
+        for seq, record in enumerate(records):
+            names.add(record[0], file_path, seq, record, record[1])
+    return files, names
+
+
+def _column_table(canonicals: list[tuple[str, dict]]) -> SymbolTable:
+    table = SymbolTable("pkg", None)
+    for file_path, canonical in canonicals:
+        table._set_file(file_path, None, canonical["hash"], extract_symbols(canonical))
+    return table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=100, help="합성 파일 수")
+    parser.add_argument("--classes", type=int, default=4, help="파일당 클래스 수")
+    args = parser.parse_args()
+
+    corpus = _corpus(args.files, args.classes)
+    indexes = [_index_source(path, source, str(idx)) for idx, (path, source) in enumerate(corpus)]
+    symbols = sum(len(index["symbolIndex"]) for index in indexes)
+    as_json = [json.dumps(index, ensure_ascii=False) for index in indexes]
+    as_marshal = [marshal.dumps(index) for index in indexes]
+    del indexes
+
+    print(f"files={args.files} symbols={symbols}")
+    print(f"{'structure':<28} {'bytes/symbol':>12}")
+
+    unshared, unshared_bytes = _traced(lambda: [json.loads(payload) for payload in as_json])
+    print(f"{'canonical unshared':<28} {unshared_bytes / symbols:>12.0f}")
+    shared, shared_bytes = _traced(lambda: [marshal.loads(payload) for payload in as_marshal])
+    print(f"{'canonical shared':<28} {shared_bytes / symbols:>12.0f}")
+    print(f"{'canonical estimate':<28} {sum(_estimate_size(index) for index in shared) / symbols:>12.0f}")
+
+    # 테이블 레코드는 메모리 캐시와 따로 살아 있으므로 문자열을 공유하지 않는 사본에서 만든다
+    canonicals = [(index["filePath"], index) for index in unshared]
+    del shared
+    tuples, tuple_bytes = _traced(lambda: _tuple_table(json.loads(json.dumps(canonicals))))
+    print(f"{'symbol table tuples':<28} {tuple_bytes / symbols:>12.0f}")
+    del tuples
+    table, column_bytes = _traced(lambda: _column_table(json.loads(json.dumps(canonicals))))
+    print(f"{'symbol table columns':<28} {column_bytes / symbols:>12.0f}")
+    assert table.stats()["symbols"] == symbols
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+개요(outline) 인덱스 벤치마크
+
+캐시가 빈 상태에서 큰 파일의 첫 ultra 모드 조회 시간을 정규 인덱스 경로(index_java_file)와
+개요 인덱스 경로(index_java_outline)로 비교합니다. 각 반복마다 새 캐시 디렉토리를 씁니다.
+
+    python benchmarks/bench_outline_index.py [--classes 200] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from _synthetic import write_synthetic_file
+
+from cache.cache_store import CacheStore, MemoryCacheStore
+from parser import indexer
+from parser.formatters import format_ultra_compact
+
+_FORMAT = {"with_fields": True, "scope": "all"}
+
+
+def _first_call(load, path: Path, repeat: int) -> tuple[float, dict]:
+    best = float("inf")
+    result = {}
+    for _ in range(repeat):
+        indexer._RETAINED_TREES.clear()
+        with tempfile.TemporaryDirectory() as tmp:
+            # 서버 기본값과 같이 메모리 LRU + 디스크 캐시
+            store = MemoryCacheStore(CacheStore(Path(tmp)), 64 * 1024 * 1024)
+            start = time.perf_counter()
+            result = format_ultra_compact(load(str(path), {}, store), _FORMAT)
+            best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", type=int, default=200, help="합성 파일의 클래스 수")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_file(Path(tmp), classes=args.classes)
+        full_s, full = _first_call(indexer.index_java_file, path, args.repeat)
+        outline_s, outline = _first_call(indexer.index_java_outline, path, args.repeat)
+        assert full == outline
+
+        source = path.read_bytes()
+        start = time.perf_counter()
+        indexer._parser().parse(source)
+        parse_s = time.perf_counter() - start
+
+    print(f"lines: {full['lines']}  tree-sitter parse only: {parse_s * 1000:.0f}ms")
+    print(f"{'path':<10} {'first ultra call(ms)':>22}")
+    print(f"{'full':<10} {full_s * 1000:>22.0f}")
+    print(f"{'outline':<10} {outline_s * 1000:>22.0f}")
+    print(f"speedup: {full_s / outline_s:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+병렬 디렉토리 인덱싱 벤치마크
+
+합성 Java 파일 디렉토리를 워커 수별로 콜드 스캔(빈 캐시)하여 처리량과 1워커 대비 속도 향상을 측정합니다.
+워커 풀 시작 비용은 측정에서 제외합니다 (MCP 서버에서는 풀을 재사용하므로).
+
+    python benchmarks/bench_parallel_index.py [--files 400] [--classes 3] [--workers 1,2,4,8]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from _synthetic import write_synthetic_file
+
+from cache.cache_store import CacheStore
+from parser import parallel
+from parser.indexer import index_directory
+
+
+def _cold_scan(root: Path, workers: int) -> float:
+    with tempfile.TemporaryDirectory() as cache_tmp:
+        store = CacheStore(Path(cache_tmp))
+        if workers > 1:
+            # 풀을 미리 띄워 프로세스 시작 비용을 제외
+            list(parallel.map_chunks(_noop_chunk, [None] * workers, workers, store, _noop_chunk))
+        start = time.perf_counter()
+        summary = index_directory(str(root), cache_store=store, workers=workers)
+        elapsed = time.perf_counter() - start
+        assert summary["fileCount"] > 0
+    return elapsed
+
+
+def _noop_chunk(items):
+    return list(items)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=400, help="합성 파일 수")
+    parser.add_argument("--classes", type=int, default=3, help="파일당 클래스 수")
+    parser.add_argument("--workers", default=None, help="쉼표로 구분한 워커 수 (기본값: 1, 2, 4, ... CPU 코어 수)")
+    args = parser.parse_args()
+
+    if args.workers:
+        worker_counts = [int(value) for value in args.workers.split(",")]
+    else:
+        cpus = os.cpu_count() or 1
+        worker_counts = sorted({1, cpus} | {2**power for power in range(8) if 2**power <= cpus})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for idx in range(args.files):
+            write_synthetic_file(root / f"pkg{idx % 16}", f"Synthetic{idx}.java", classes=args.classes)
+
+        print(f"files={args.files} classes/file={args.classes} cpus={os.cpu_count()}")
+        print(f"{'workers':>8} {'seconds':>9} {'files/s':>9} {'speedup':>8}")
+        baseline = None
+        for workers in worker_counts:
+            elapsed = _cold_scan(root, workers)
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {args.files / elapsed:>9.1f} {baseline / elapsed:>7.2f}x")
+        parallel.shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+파싱 오류 수집 벤치마크
+
+이미 만든 구문 트리에서 오류 목록을 만드는 시간만 비교합니다.
+
+- recursive: 이전 구현 (노드마다 Python 재귀 호출, has_error인 자식만 방문, ERROR 노드만 보고)
+- stack: _collect_errors() (root.has_error로 바로 종료, 명시적 스택 반복 순회, MISSING 노드와 열 번호 포함)
+
+입력은 tests/fixtures, 오류 없는 큰 합성 파일, 메서드 본문 몇 곳에 오류를 넣은 합성 파일입니다.
+
+    python benchmarks/bench_parse_errors.py [--classes 200] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from _synthetic import fixture_files, synthetic_source
+
+from parser import indexer
+
+
+def _recursive(root, source: bytes) -> list[dict]:
+    errors: list[dict] = []
+
+    def walk(n):
+        if n.type == "ERROR":
+            errors.append({"level": "error", "message": "Parse error", "line": n.start_point[0] + 1})
+        for child in n.children:
+            if child.has_error:
+                walk(child)
+
+    walk(root)
+    return errors
+
+
+def _broken_source(classes: int) -> bytes:
+    # 메서드 400개마다 한 곳씩 본문의 세미콜론을 지워 MISSING / ERROR 노드를 만든다
+    source = synthetic_source(classes=classes)
+    parts = source.split("return result;")
+    return "".join(
+        part + ("return result" if index % 400 == 0 else "return result;")
+        for index, part in enumerate(parts[:-1])
+    ).encode("utf-8") + parts[-1].encode("utf-8")
+
+
+def _bench(label: str, sources: list[bytes], repeat: int) -> None:
+    roots = [indexer._parser().parse(source).root_node for source in sources]
+    for name, run in (("recursive", _recursive), ("stack", indexer._collect_errors)):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            found = sum(len(run(root, source)) for root, source in zip(roots, sources))
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:<12} {name:<10} {found:>7} {best * 1e6:>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", type=int, default=200, help="합성 파일의 클래스 수")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'input':<12} {'method':<10} {'errors':>7} {'best(µs)':>12}")
+    _bench("fixtures", [path.read_bytes() for path in fixture_files()], args.repeat)
+    _bench("synthetic", [synthetic_source(classes=args.classes).encode("utf-8")], args.repeat)
+    _bench("broken", [_broken_source(args.classes)], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+범위 읽기 벤치마크
+
+큰 합성 Java 파일(생성된 코드처럼 수 MB)에서 20줄 범위를 여러 번 읽는 시간을 비교합니다.
+
+- splitlines: 이전 방식 (호출마다 파일 전체를 디코딩하고 splitlines)
+- first read: 줄 오프셋 인덱스를 만드는 첫 호출 (파일을 한 번 훑음)
+- indexed: 인덱스가 있는 파일에서 mmap으로 요청 구간만 디코딩
+
+이어서 ultra 개요의 메서드를 하나씩 읽듯이 여러 파일의 메서드 범위를 읽는 시간을 비교합니다
+(MCP 왕복 비용은 빠져 있으므로 실제 차이는 더 큽니다).
+
+- per range: 범위마다 read_range 호출
+- batched: read_ranges 한 번 (파일별로 묶어 한 번씩 열고, 맞닿은 범위는 합쳐서 읽음)
+
+마지막으로 큰 파일의 메서드 본문을 symbolId로 읽는 시간을 비교합니다 (정규 인덱스는 캐시에 있음).
+
+- by lines: 인덱스의 startLine/endLine으로 이전 방식처럼 파일 전체를 splitlines
+- read_symbol: 인덱스의 startByte/endByte로 mmap에서 그 구간만 디코딩 (내용 해시 확인 포함)
+
+    python benchmarks/bench_read_range.py [--classes 400] [--reads 50] [--batch-files 20]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from _synthetic import write_synthetic_file
+
+from cache.cache_store import CacheStore, MemoryCacheStore
+from parser.indexer import _walk_symbols, index_java_file, load_canonical_index
+from parser.readers import _LINE_INDEXES, read_range, read_ranges, read_symbol
+
+
+def _read_range_splitlines(file_path: str, start_line: int, end_line: int) -> str:
+    # 이전 구현에서 줄 목록을 만드는 부분
+    lines = Path(file_path).read_text(encoding="utf-8", errors="replace").splitlines()
+    return "\n".join(f"{idx + 1}: {lines[idx]}" for idx in range(start_line - 1, end_line))
+
+
+def _method_ranges(paths: list[Path]) -> list[dict]:
+    requests = []
+    for path in paths:
+        for cls in index_java_file(str(path))["classes"]:
+            requests.extend(
+                {"filePath": str(path), "startLine": method["startLine"], "endLine": method["endLine"]}
+                for method in cls["methods"]
+            )
+    return requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", type=int, default=400, help="합성 파일의 클래스 수")
+    parser.add_argument("--reads", type=int, default=50, help="범위 읽기 횟수")
+    parser.add_argument("--batch-files", type=int, default=20, help="일괄 읽기에 쓰는 합성 파일 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_file(Path(tmp), classes=args.classes)
+        stamp = time.time() - 60
+        os.utime(path, (stamp, stamp))
+        size = path.stat().st_size
+        line_count = path.read_bytes().count(b"\n")
+        rng = random.Random(0)
+        starts = [rng.randint(1, line_count - 20) for _ in range(args.reads)]
+
+        start = time.perf_counter()
+        for line in starts:
+            _read_range_splitlines(str(path), line, line + 19)
+        old_ms = (time.perf_counter() - start) * 1000 / args.reads
+
+        _LINE_INDEXES.clear()
+        start = time.perf_counter()
+        read_range(str(path), starts[0], starts[0] + 19)
+        first_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for line in starts:
+            read_range(str(path), line, line + 19)
+        indexed_ms = (time.perf_counter() - start) * 1000 / args.reads
+
+        print(f"size={size / 1e6:.1f}MB lines={line_count}")
+        print(f"{'method':<12} {'ms/read':>9}")
+        print(f"{'splitlines':<12} {old_ms:>9.3f}")
+        print(f"{'first read':<12} {first_ms:>9.3f}")
+        print(f"{'indexed':<12} {indexed_ms:>9.3f}")
+
+        paths = [
+            write_synthetic_file(Path(tmp) / "batch", f"Batch{idx}.java", classes=2, methods=10)
+            for idx in range(args.batch_files)
+        ]
+        for batch_path in paths:
+            os.utime(batch_path, (stamp, stamp))
+        requests = _method_ranges(paths)
+        options = {"maxChars": 1 << 30}
+        start = time.perf_counter()
+        for request in requests:
+            read_range(request["filePath"], request["startLine"], request["endLine"], options)
+        single_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        read_ranges(requests, options)
+        batch_ms = (time.perf_counter() - start) * 1000
+
+        print(f"\nranges={len(requests)} files={len(paths)}")
+        print(f"{'method':<12} {'total(ms)':>9}")
+        print(f"{'per range':<12} {single_ms:>9.3f}")
+        print(f"{'batched':<12} {batch_ms:>9.3f}")
+
+        # 서버와 같이 디스크 캐시 앞에 메모리 캐시를 둔다 (큰 파일의 인덱스도 올라가도록 한도를 넉넉히)
+        store = MemoryCacheStore(CacheStore(Path(tmp) / "cache"), 1 << 30)
+        methods = [symbol for symbol in _walk_symbols(load_canonical_index(str(path), store)) if symbol["kind"] == "method"]
+        picked = rng.sample(methods, min(args.reads, len(methods)))
+        start = time.perf_counter()
+        for method in picked:
+            _read_range_splitlines(str(path), method["startLine"], method["endLine"])
+        lines_ms = (time.perf_counter() - start) * 1000 / len(picked)
+        start = time.perf_counter()
+        for method in picked:
+            read_symbol(str(path), method["symbolId"], {}, store)
+        symbol_ms = (time.perf_counter() - start) * 1000 / len(picked)
+
+        print(f"\nsymbols={len(picked)}")
+        print(f"{'method':<12} {'ms/read':>9}")
+        print(f"{'by lines':<12} {lines_ms:>9.3f}")
+        print(f"{'read_symbol':<12} {symbol_ms:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
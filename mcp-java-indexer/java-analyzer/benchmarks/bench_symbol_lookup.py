@@ -0,0 +1,49 @@
+"""
+symbolId 조회 벤치마크
+
+큰 합성 파일의 정규 인덱스에서 모든 심볼을 symbolId로 한 번씩 찾는 시간을
+트리 순회(_walk_symbols 후 선형 탐색)와 symbolIndex 조회로 비교합니다.
+
+    python benchmarks/bench_symbol_lookup.py [--classes 40] [--lookups 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from _synthetic import synthetic_source
+
+from parser import indexer
+
+
+def _walk_lookup(index_data: dict, symbol_id: str):
+    # 변경 전 find_symbol_by_id와 같다
+    for symbol in indexer._walk_symbols(index_data):
+        if symbol.get("symbolId") == symbol_id:
+            return symbol
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", type=int, default=40, help="합성 파일의 클래스 수")
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    source = synthetic_source(classes=args.classes).encode("utf-8")
+    data = indexer._index_source("Synthetic.java", source, "bench")
+    symbol_ids = [symbol["symbolId"] for symbol in indexer._walk_symbols(data)]
+    targets = [symbol_ids[(idx * 7919) % len(symbol_ids)] for idx in range(args.lookups)]
+
+    print(f"symbols: {len(symbol_ids)}  lookups: {len(targets)}")
+    print(f"{'method':<14} {'total(ms)':>10} {'µs/lookup':>10}")
+    for label, lookup in (("walk", _walk_lookup), ("symbolIndex", indexer.find_symbol_by_id)):
+        start = time.perf_counter()
+        for symbol_id in targets:
+            assert lookup(data, symbol_id)["symbolId"] == symbol_id
+        elapsed = time.perf_counter() - start
+        print(f"{label:<14} {elapsed * 1000:>10.1f} {elapsed / len(targets) * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+심볼 검색 벤치마크
+
+합성 Java 파일 디렉토리에서 find_symbols의 콜드 구축(빈 캐시), 테이블 갱신(stat 확인, 끝까지 / 첫 50개에서 멈춤),
+따뜻한 테이블 검색(갱신 주기 안) 지연 시간을 측정합니다.
+이어서 고유 이름 N개에 대해 3-gram 게시 목록 검색과 전체 이름 선형 비교를 비교하고,
+순위 검색(rank)의 상위 50개 선택 시간을 측정합니다.
+
+    python benchmarks/bench_symbol_search.py [--files 5000] [--queries 20] [--names 200000]
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from _synthetic import write_synthetic_file
+
+from parser.ranking import QueryScorer
+from parser.trigram_index import TermIndex
+
+_VERBS = ["select", "find", "update", "delete", "insert", "count", "load", "save", "get", "set", "is", "build"]
+_NOUNS = [
+    "Detail", "Mail", "User", "Order", "Account", "Item", "Member", "Group", "Notice", "Config", "Board",
+    "Comment", "File", "Attach", "Payment", "Refund", "Coupon", "Point", "Address", "Company", "Dept",
+    "Approval", "Schedule", "Calendar", "Message", "Template", "Category", "Product", "Stock", "Invoice",
+]
+_QUERIES = ["ByMailUser", "selectDetail", "getValue", "Nested", "repository3", "zzz", "Service1", "run"]
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def _bench_names(count: int, repeat: int) -> None:
+    rng = random.Random(0)
+    names = sorted(
+        {
+            rng.choice(_VERBS) + "".join(rng.choice(_NOUNS) for _ in range(rng.randint(1, 3)))
+            + rng.choice(["", "By" + rng.choice(_NOUNS) + rng.choice(_NOUNS), "List", str(rng.randint(0, 99))])
+            for _ in range(count)
+        }
+    )
+    index = TermIndex()
+    build_ms = _timed(lambda: [index.add(name, "F.java", 0, (name, "method"), "method") for name in names])
+    lowered = [name.lower() for name in names]
+
+    print(f"\nnames={len(names)} trigrams={len(index.postings)} build={build_ms:.0f} ms")
+    print(f"{'query':<16} {'hits':>6} {'trigram(ms)':>12} {'linear(ms)':>11}")
+    for query in ["ByMailUser", "selectDetail", "CouponPoint", "refundInvoiceBy", "zzz"]:
+        needle = query.lower()
+        hits = len(list(index.search(query, False, "any")))
+        trigram_ms = statistics.median(_timed(lambda: list(index.search(query, False, "any"))) for _ in range(repeat))
+        linear_ms = statistics.median(_timed(lambda: [n for n in lowered if needle in n]) for _ in range(repeat))
+        print(f"{query:<16} {hits:>6} {trigram_ms:>12.2f} {linear_ms:>11.2f}")
+
+    print(f"\n{'ranked query':<16} {'top50(ms)':>10}")
+    for query in ["SDBMU", "selDetBMU", "couponpoint", "rfndinv"]:
+        scorer = QueryScorer(query)
+
+        def top50():
+            candidates = index.scan(scorer.scan_pattern, False)
+            scored = ((score, name) for name in candidates if (score := scorer.score(name)) is not None)
+            return heapq.nsmallest(50, scored)
+
+        ranked_ms = statistics.median(_timed(top50) for _ in range(repeat))
+        print(f"{query:<16} {ranked_ms:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=5000, help="합성 파일 수")
+    parser.add_argument("--methods", type=int, default=4, help="클래스당 메서드 수")
+    parser.add_argument("--queries", type=int, default=20, help="쿼리별 반복 횟수")
+    parser.add_argument("--names", type=int, default=200000, help="3-gram 비교용 고유 이름 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "src"
+        for idx in range(args.files):
+            path = write_synthetic_file(root / f"pkg{idx % 64}", f"Synthetic{idx}.java", classes=1, methods=args.methods)
+            # 방금 쓴 파일은 stat을 신뢰하지 않으므로(racy window) 수정 시각을 과거로 돌린다
+            os.utime(path, (time.time() - 60, time.time() - 60))
+        os.environ["MCP_JAVA_INDEX_CACHE_ROOT"] = str(Path(tmp) / "cache")
+
+        from parser.indexer import find_symbols
+
+        os.environ["MCP_JAVA_INDEX_SYMBOL_REFRESH_SEC"] = "0"
+        # 매치가 없는 쿼리는 maxResults에서 멈추지 않으므로 테이블을 끝까지 만든다
+        cold_ms = _timed(lambda: find_symbols(str(root), "zzz"))
+        revalidate_ms = statistics.median(_timed(lambda: find_symbols(str(root), "zzz")) for _ in range(5))
+        early_ms = statistics.median(_timed(lambda: find_symbols(str(root), "ByMailUser")) for _ in range(5))
+
+        os.environ["MCP_JAVA_INDEX_SYMBOL_REFRESH_SEC"] = "3600"
+        print(f"files={args.files}")
+        print(f"cold build            {cold_ms:>10.1f} ms")
+        print(f"stat revalidate+query {revalidate_ms:>10.1f} ms")
+        print(f"stat revalidate+first 50 {early_ms:>7.1f} ms")
+        for query in _QUERIES:
+            samples = [_timed(lambda: find_symbols(str(root), query)) for _ in range(args.queries)]
+            print(f"warm query {query:<12}{statistics.median(samples):>9.2f} ms")
+
+    _bench_names(args.names, args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,103 @@
 from __future__ import annotations
 
 import hashlib
-import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
+
+from cache.locking import LOCK_FILE_NAME, advisory_lock
+from cache.serializers import JsonSerializer, MarshalSerializer, decode_any, default_serializer
+
+
+CACHE_DIR_NAME = ".mcp-java-index-cache"
+
+# (size, mtime_ns, inode)
+FileStat = tuple[int, int, int]
+
+# 항목별 파일 백엔드의 캐시 파일 이름: {경로 SHA-1}[-{옵션 키}].{json|bin}
+_ENTRY_FILE_RE = re.compile(r"^([0-9a-f]{40})(?:-(.+))?\.(?:json|bin)$")
+
+# 원자적 쓰기용 임시 파일 이름: .{캐시 파일 이름}.{pid}.{난수}.tmp
+_TEMP_FILE_RE = re.compile(r"^\..+\.tmp$")
+
+# 이 시간보다 오래된 임시 파일은 쓰기 도중 종료된 프로세스가 남긴 것으로 보고 GC가 정리
+_STALE_TEMP_SECONDS = 10 * 60
+
+# SQLite 백엔드에서 접근 시각 갱신을 모아서 쓰는 단위
+_TOUCH_FLUSH_SIZE = 512
+
+# 저장 직전에 수정된 파일은 같은 mtime 안에서 다시 바뀔 수 있으므로 stat을 신뢰하지 않는다
+_RACY_WINDOW_NS = 2_000_000_000
+
+# SQLite는 한 문장에 바인딩할 수 있는 변수 개수에 제한이 있으므로 IN (...) 조회를 나눠서 실행
+_SQLITE_BATCH_SIZE = 500
+
+
+def file_stat(file_path: str) -> Optional[FileStat]:
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def atomic_write_bytes(target: Path, payload: bytes) -> None:
+    """
+    같은 디렉토리의 임시 파일에 쓴 뒤 os.replace로 교체
+
+    다른 프로세스는 항상 이전 파일이나 새 파일 전체만 보게 되므로, 동시에 같은 항목을 쓰더라도
+    일부만 기록된 파일이 생기지 않습니다. 캐시이므로 fsync는 하지 않습니다.
+    """
+    temp_path = target.with_name(f".{target.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp")
+    fd = os.open(str(temp_path), os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(payload)
+        os.replace(temp_path, target)
+    except BaseException:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def trusted_stat(stat: Optional[FileStat]) -> Optional[FileStat]:
+    if stat is None:
+        return None
+    if time.time_ns() - stat[1] < _RACY_WINDOW_NS:
+        return None
+    return stat
+
+
+@dataclass
+class CacheEntryInfo:
+    """GC가 사용하는 캐시 항목 메타데이터"""
+
+    key: object
+    file_path: Optional[str]
+    options_key: str
+    size_bytes: int
+    accessed_at: float
 
 
 class CacheStore:
-    def __init__(self, base_dir: Path) -> None:
+    def __init__(self, base_dir: Path, serializer: Optional[JsonSerializer | MarshalSerializer] = None) -> None:
         self.base_dir = base_dir
-        self.cache_dir = base_dir / ".mcp-java-index-cache"
+        self.cache_dir = base_dir / CACHE_DIR_NAME
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.serializer = serializer or default_serializer()
+
+    def lock(self, exclusive: bool = False):
+        """캐시 디렉토리의 권고 잠금 (쓰기는 공유, GC 삭제는 배타)"""
+        return advisory_lock(self.cache_dir / LOCK_FILE_NAME, exclusive)
 
     def _path_key(self, file_path: str) -> str:
         digest = hashlib.sha1(file_path.encode("utf-8", errors="replace")).hexdigest()
@@ -20,34 +107,627 @@ class CacheStore:
         key = self._path_key(file_path)
         if options_key:
             key = f"{key}-{options_key}"
-        return self.cache_dir / f"{key}.json"
+        return self.cache_dir / f"{key}{self.serializer.extension}"
 
-    def load(self, file_path: str, content_hash: str, options_key: Optional[str] = None) -> Optional[dict]:
+    def _read_entry(self, file_path: str, options_key: Optional[str]) -> Optional[dict]:
         cache_file = self._cache_path(file_path, options_key)
         if not cache_file.exists():
             return None
         try:
-            data = json.loads(cache_file.read_text(encoding="utf-8"))
+            entry = decode_any(cache_file.read_bytes())
         except Exception:
             return None
-        if data.get("hash") != content_hash:
+        if not isinstance(entry, dict) or "data" not in entry:
             return None
-        return data
+        self._touch(cache_file)
+        return entry
 
-    def save(self, file_path: str, data: dict, options_key: Optional[str] = None) -> None:
+    @staticmethod
+    def _touch(cache_file: Path) -> None:
+        # 캐시 파일의 mtime을 마지막 접근 시각으로 사용 (GC의 LRU 기준)
+        try:
+            os.utime(cache_file, None)
+        except OSError:
+            pass
+
+    def load(self, file_path: str, content_hash: str, options_key: Optional[str] = None) -> Optional[dict]:
+        entry = self._read_entry(file_path, options_key)
+        if entry is None or entry.get("hash") != content_hash:
+            return None
+        return entry["data"]
+
+    def load_by_stat(self, file_path: str, stat: FileStat, options_key: Optional[str] = None) -> Optional[dict]:
+        """
+        파일 stat (size, mtime_ns, inode)이 저장 당시와 같으면 원본을 읽지 않고 캐시 반환
+        """
+        entry = self._read_entry(file_path, options_key)
+        if entry is None or entry.get("stat") is None:
+            return None
+        if tuple(entry["stat"]) != tuple(stat):
+            return None
+        return entry["data"]
+
+    def load_many(self, content_hashes: dict[str, str], options_key: Optional[str] = None) -> dict[str, dict]:
+        """
+        여러 파일의 캐시를 한 번에 로드
+
+        Args:
+            content_hashes: {파일 경로: 콘텐츠 해시}
+            options_key: 인덱싱 옵션 키
+
+        Returns:
+            해시가 일치하는 항목만 담은 {파일 경로: 인덱싱 결과}
+        """
+        found: dict[str, dict] = {}
+        for file_path, content_hash in content_hashes.items():
+            data = self.load(file_path, content_hash, options_key)
+            if data is not None:
+                found[file_path] = data
+        return found
+
+    def load_many_by_stat(self, stats: dict[str, FileStat], options_key: Optional[str] = None) -> dict[str, dict]:
+        found: dict[str, dict] = {}
+        for file_path, stat in stats.items():
+            data = self.load_by_stat(file_path, stat, options_key)
+            if data is not None:
+                found[file_path] = data
+        return found
+
+    def save(
+        self,
+        file_path: str,
+        data: dict,
+        options_key: Optional[str] = None,
+        stat: Optional[FileStat] = None,
+    ) -> None:
         cache_file = self._cache_path(file_path, options_key)
-        cache_file.write_text(json.dumps(data, ensure_ascii=True, indent=2), encoding="utf-8")
+        trusted = trusted_stat(stat)
+        entry = {
+            "path": file_path,
+            "hash": data.get("hash", ""),
+            "stat": list(trusted) if trusted else None,
+            "data": data,
+        }
+        payload = self.serializer.encode(entry)
+        with self.lock():
+            atomic_write_bytes(cache_file, payload)
 
+    def remember(
+        self,
+        file_path: str,
+        data: dict,
+        options_key: Optional[str] = None,
+        stat: Optional[FileStat] = None,
+    ) -> None:
+        """다른 프로세스가 이미 디스크에 저장한 항목을 알림 (디스크 백엔드는 할 일 없음)"""
 
-def default_cache_store() -> CacheStore:
-    base = Path.cwd()
-    env_override = None
+    def iter_entries(self) -> Iterator[CacheEntryInfo]:
+        """
+        저장된 모든 캐시 항목의 메타데이터 (GC용)
+
+        원본 경로는 항목을 디코딩해야 알 수 있으므로, 읽을 수 없는 항목은 file_path가 None입니다.
+        """
+        stale_before = time.time() - _STALE_TEMP_SECONDS
+        for cache_file in self.cache_dir.iterdir():
+            match = _ENTRY_FILE_RE.match(cache_file.name)
+            if match is None:
+                temp_entry = self._stale_temp_entry(cache_file, stale_before)
+                if temp_entry is not None:
+                    yield temp_entry
+                continue
+            try:
+                st = cache_file.stat()
+            except OSError:
+                continue
+            file_path = None
+            try:
+                entry = decode_any(cache_file.read_bytes())
+                if isinstance(entry, dict) and "data" in entry:
+                    file_path = entry.get("path") or entry["data"].get("filePath")
+            except Exception:
+                file_path = None
+            yield CacheEntryInfo(
+                key=cache_file.name,
+                file_path=file_path,
+                options_key=match.group(2) or "",
+                size_bytes=st.st_size,
+                accessed_at=st.st_mtime,
+            )
+
+    @staticmethod
+    def _stale_temp_entry(cache_file: Path, stale_before: float) -> Optional[CacheEntryInfo]:
+        # 쓰기 도중 종료된 프로세스가 남긴 임시 파일은 읽을 수 없는 항목으로 보고한다
+        if _TEMP_FILE_RE.match(cache_file.name) is None:
+            return None
+        try:
+            st = cache_file.stat()
+        except OSError:
+            return None
+        if st.st_mtime >= stale_before:
+            return None
+        return CacheEntryInfo(
+            key=cache_file.name,
+            file_path=None,
+            options_key="",
+            size_bytes=st.st_size,
+            accessed_at=st.st_mtime,
+        )
+
+    def delete_entries(self, keys: Iterable[object]) -> None:
+        for key in keys:
+            try:
+                (self.cache_dir / str(key)).unlink()
+            except FileNotFoundError:
+                pass
+
+
+class SqliteCacheStore(CacheStore):
+    """
+    모든 캐시 항목을 하나의 SQLite 데이터베이스(WAL 모드)에 저장하는 백엔드
+
+    파일마다 JSON을 하나씩 만드는 대신 (경로 해시, 옵션 키)를 기본 키로 하는
+    단일 테이블을 사용하므로, 대규모 저장소에서도 캐시 디렉토리에 파일이 하나만 생깁니다.
+    """
+
+    DB_FILE_NAME = "index.sqlite3"
+    SCHEMA_VERSION = 4
+
+    def __init__(self, base_dir: Path, serializer: Optional[JsonSerializer | MarshalSerializer] = None) -> None:
+        super().__init__(base_dir, serializer)
+        self.db_path = self.cache_dir / self.DB_FILE_NAME
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._touched: set[tuple[str, str]] = set()
+
+    def __getstate__(self) -> dict:
+        # 병렬 인덱싱 워커에 전달할 때 연결과 잠금은 넘기지 않고 워커에서 새로 연다
+        state = self.__dict__.copy()
+        state.update(_lock=None, _conn=None, _conn_pid=None, _touched=set())
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # fork된 자식 프로세스는 부모의 연결을 공유하면 안 되므로 pid가 바뀌면 새로 연다
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+        # 여러 프로세스가 동시에 처음 열 때 한쪽이 다른 쪽이 만든 테이블을 지우지 않도록 초기화를 직렬화
+        with self.lock(exclusive=True):
+            # auto_vacuum은 테이블을 만들기 전에만 적용되므로 새 DB에서 GC가 공간을 돌려줄 수 있게 먼저 설정
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                # 캐시이므로 스키마가 바뀌면 버리고 새로 만든다
+                conn.execute("DROP TABLE IF EXISTS entries")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    path_key TEXT NOT NULL,
+                    options_key TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    size INTEGER,
+                    mtime_ns INTEGER,
+                    inode INTEGER,
+                    accessed_at REAL NOT NULL,
+                    payload BLOB NOT NULL,
+                    PRIMARY KEY (path_key, options_key)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.commit()
+        self._conn = conn
+        self._conn_pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _decode(payload: bytes) -> Optional[dict]:
+        try:
+            return decode_any(payload)
+        except Exception:
+            return None
+
+    def _touch_rows(self, conn: sqlite3.Connection, keys: Iterable[tuple[str, str]]) -> None:
+        # 조회마다 쓰기 트랜잭션을 만들지 않도록 접근 시각 갱신은 모아서 반영
+        self._touched.update(keys)
+        if len(self._touched) >= _TOUCH_FLUSH_SIZE:
+            self._flush_touched(conn)
+
+    def _flush_touched(self, conn: sqlite3.Connection) -> None:
+        if not self._touched:
+            return
+        now = time.time()
+        conn.executemany(
+            "UPDATE entries SET accessed_at = ? WHERE path_key = ? AND options_key = ?",
+            [(now, path_key, options_key) for path_key, options_key in self._touched],
+        )
+        conn.commit()
+        self._touched.clear()
+
+    def load(self, file_path: str, content_hash: str, options_key: Optional[str] = None) -> Optional[dict]:
+        key = (self._path_key(file_path), options_key or "")
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT payload FROM entries WHERE path_key = ? AND options_key = ? AND content_hash = ?",
+                (*key, content_hash),
+            ).fetchone()
+            if row is not None:
+                self._touch_rows(conn, [key])
+        if row is None:
+            return None
+        return self._decode(row[0])
+
+    def load_by_stat(self, file_path: str, stat: FileStat, options_key: Optional[str] = None) -> Optional[dict]:
+        key = (self._path_key(file_path), options_key or "")
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT payload FROM entries WHERE path_key = ? AND options_key = ? "
+                "AND size = ? AND mtime_ns = ? AND inode = ?",
+                (*key, *stat),
+            ).fetchone()
+            if row is not None:
+                self._touch_rows(conn, [key])
+        if row is None:
+            return None
+        return self._decode(row[0])
+
+    def _select_many(self, paths: list[str], options_key: Optional[str]) -> list[tuple]:
+        by_key = {self._path_key(path): path for path in paths}
+        keys = list(by_key)
+        rows: list[tuple] = []
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(keys), _SQLITE_BATCH_SIZE):
+                chunk = keys[start : start + _SQLITE_BATCH_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                for path_key, content_hash, size, mtime_ns, inode, payload in conn.execute(
+                    f"SELECT path_key, content_hash, size, mtime_ns, inode, payload FROM entries "
+                    f"WHERE options_key = ? AND path_key IN ({placeholders})",
+                    [options_key or "", *chunk],
+                ):
+                    rows.append((by_key[path_key], content_hash, (size, mtime_ns, inode), payload))
+            self._touch_rows(conn, [(self._path_key(row[0]), options_key or "") for row in rows])
+        return rows
+
+    def load_many(self, content_hashes: dict[str, str], options_key: Optional[str] = None) -> dict[str, dict]:
+        found: dict[str, dict] = {}
+        for file_path, content_hash, _, payload in self._select_many(list(content_hashes), options_key):
+            if content_hashes[file_path] != content_hash:
+                continue
+            data = self._decode(payload)
+            if data is not None:
+                found[file_path] = data
+        return found
+
+    def load_many_by_stat(self, stats: dict[str, FileStat], options_key: Optional[str] = None) -> dict[str, dict]:
+        found: dict[str, dict] = {}
+        for file_path, _, stored_stat, payload in self._select_many(list(stats), options_key):
+            if stored_stat[0] is None or stored_stat != tuple(stats[file_path]):
+                continue
+            data = self._decode(payload)
+            if data is not None:
+                found[file_path] = data
+        return found
+
+    def save(
+        self,
+        file_path: str,
+        data: dict,
+        options_key: Optional[str] = None,
+        stat: Optional[FileStat] = None,
+    ) -> None:
+        payload = self.serializer.encode(data)
+        size, mtime_ns, inode = trusted_stat(stat) or (None, None, None)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(path_key, options_key, file_path, content_hash, size, mtime_ns, inode, accessed_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self._path_key(file_path),
+                    options_key or "",
+                    file_path,
+                    data.get("hash", ""),
+                    size,
+                    mtime_ns,
+                    inode,
+                    time.time(),
+                    payload,
+                ),
+            )
+            conn.commit()
+
+    def iter_entries(self) -> Iterator[CacheEntryInfo]:
+        with self._lock:
+            conn = self._connection()
+            self._flush_touched(conn)
+            rows = conn.execute(
+                "SELECT path_key, options_key, file_path, length(payload), accessed_at FROM entries"
+            ).fetchall()
+        for path_key, options_key, file_path, size_bytes, accessed_at in rows:
+            yield CacheEntryInfo(
+                key=(path_key, options_key),
+                file_path=file_path,
+                options_key=options_key,
+                size_bytes=size_bytes,
+                accessed_at=accessed_at,
+            )
+
+    def delete_entries(self, keys: Iterable[object]) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("DELETE FROM entries WHERE path_key = ? AND options_key = ?", list(keys))
+            conn.commit()
+            conn.execute("PRAGMA incremental_vacuum")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._flush_touched(self._conn)
+                self._conn.close()
+            self._conn = None
+            self._conn_pid = None
+
+
+def _estimate_size(obj, seen: Optional[set[int]] = None) -> int:
+    """
+    디코딩된 인덱스 dict가 차지하는 메모리를 대략 계산 (dict/list/str/int 재귀)
+
+    인덱스 안에서 공유된 객체(같은 modifiers 목록, 파라미터 dict 등, parser/compact.py)는 한 번만 셉니다.
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        item_id = id(item)
+        if item_id in seen:
+            continue
+        seen.add(item_id)
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item)
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return size
+
+
+class MemoryCacheStore:
+    """
+    디스크 백엔드 앞에 두는 프로세스 내 LRU 캐시
+
+    (파일 경로, 옵션 키)별로 디코딩된 인덱스 dict를 콘텐츠 해시/stat과 함께 보관하며,
+    조회 시 해시(또는 stat)가 일치할 때만 적중으로 처리합니다.
+    보관 중인 dict의 추정 크기 합이 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+
+    반환되는 dict는 캐시 내부 객체를 그대로 공유하므로 호출자는 수정하면 안 됩니다.
+    """
+
+    def __init__(self, backend: CacheStore, max_bytes: int) -> None:
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str], tuple[str, Optional[FileStat], dict, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._current_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def base_dir(self) -> Path:
+        return self.backend.base_dir
+
+    @property
+    def cache_dir(self) -> Path:
+        return self.backend.cache_dir
+
+    def _get(self, file_path: str, options_key: Optional[str], content_hash=None, stat=None) -> Optional[dict]:
+        key = (file_path, options_key or "")
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_hash, entry_stat, data, _ = entry
+                if (content_hash is not None and entry_hash == content_hash) or (
+                    stat is not None and entry_stat is not None and entry_stat == tuple(stat)
+                ):
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return data
+            self._misses += 1
+            return None
+
+    def _put(self, file_path: str, options_key: Optional[str], data: dict, stat: Optional[FileStat]) -> None:
+        if self.max_bytes <= 0:
+            return
+        size = _estimate_size(data)
+        if size > self.max_bytes:
+            return
+        key = (file_path, options_key or "")
+        trusted = trusted_stat(stat)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._current_bytes -= previous[3]
+            self._entries[key] = (data.get("hash", ""), trusted, data, size)
+            self._current_bytes += size
+            while self._current_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._current_bytes -= evicted[3]
+                self._evictions += 1
+
+    def load(self, file_path: str, content_hash: str, options_key: Optional[str] = None) -> Optional[dict]:
+        data = self._get(file_path, options_key, content_hash=content_hash)
+        if data is not None:
+            return data
+        data = self.backend.load(file_path, content_hash, options_key)
+        if data is not None:
+            self._put(file_path, options_key, data, None)
+        return data
+
+    def load_by_stat(self, file_path: str, stat: FileStat, options_key: Optional[str] = None) -> Optional[dict]:
+        data = self._get(file_path, options_key, stat=stat)
+        if data is not None:
+            return data
+        data = self.backend.load_by_stat(file_path, stat, options_key)
+        if data is not None:
+            self._put(file_path, options_key, data, stat)
+        return data
+
+    def load_many(self, content_hashes: dict[str, str], options_key: Optional[str] = None) -> dict[str, dict]:
+        found: dict[str, dict] = {}
+        remaining: dict[str, str] = {}
+        for file_path, content_hash in content_hashes.items():
+            data = self._get(file_path, options_key, content_hash=content_hash)
+            if data is not None:
+                found[file_path] = data
+            else:
+                remaining[file_path] = content_hash
+        if remaining:
+            for file_path, data in self.backend.load_many(remaining, options_key).items():
+                self._put(file_path, options_key, data, None)
+                found[file_path] = data
+        return found
+
+    def load_many_by_stat(self, stats: dict[str, FileStat], options_key: Optional[str] = None) -> dict[str, dict]:
+        found: dict[str, dict] = {}
+        remaining: dict[str, FileStat] = {}
+        for file_path, stat in stats.items():
+            data = self._get(file_path, options_key, stat=stat)
+            if data is not None:
+                found[file_path] = data
+            else:
+                remaining[file_path] = stat
+        if remaining:
+            for file_path, data in self.backend.load_many_by_stat(remaining, options_key).items():
+                self._put(file_path, options_key, data, remaining[file_path])
+                found[file_path] = data
+        return found
+
+    def save(
+        self,
+        file_path: str,
+        data: dict,
+        options_key: Optional[str] = None,
+        stat: Optional[FileStat] = None,
+    ) -> None:
+        self.backend.save(file_path, data, options_key, stat)
+        self._put(file_path, options_key, data, stat)
+
+    def remember(
+        self,
+        file_path: str,
+        data: dict,
+        options_key: Optional[str] = None,
+        stat: Optional[FileStat] = None,
+    ) -> None:
+        """디스크에는 이미 저장된 항목(병렬 워커가 저장)을 메모리에만 올림"""
+        self._put(file_path, options_key, data, stat)
+
+    def lock(self, exclusive: bool = False):
+        return self.backend.lock(exclusive)
+
+    def iter_entries(self) -> Iterator[CacheEntryInfo]:
+        return self.backend.iter_entries()
+
+    def delete_entries(self, keys: Iterable[object]) -> None:
+        # 메모리 항목은 내용이 여전히 유효하므로 남겨 두고 디스크 항목만 지운다
+        self.backend.delete_entries(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "currentBytes": self._current_bytes,
+                "maxBytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hitRate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_BACKENDS = {
+    "files": CacheStore,
+    # 이전 이름 (항목별 파일 백엔드가 JSON만 지원하던 시절)
+    "json": CacheStore,
+    "sqlite": SqliteCacheStore,
+}
+
+_DEFAULT_MEMORY_CACHE_MB = 64
+
+_DEFAULT_STORES: dict[tuple[str, str, int, str], CacheStore | MemoryCacheStore] = {}
+_DEFAULT_STORES_LOCK = threading.Lock()
+
+
+def _memory_cache_bytes() -> int:
+    raw = os.environ.get("MCP_JAVA_INDEX_MEMORY_CACHE_MB")
+    if raw is None or not raw.strip():
+        return _DEFAULT_MEMORY_CACHE_MB * 1024 * 1024
     try:
-        import os
+        return max(0, int(float(raw) * 1024 * 1024))
+    except ValueError:
+        return _DEFAULT_MEMORY_CACHE_MB * 1024 * 1024
+
 
-        env_override = os.environ.get("MCP_JAVA_INDEX_CACHE_ROOT")
-    except Exception:
-        env_override = None
+def default_cache_store() -> CacheStore | MemoryCacheStore:
+    """
+    환경 변수로 선택된 기본 캐시 스토어 반환
+
+    - MCP_JAVA_INDEX_CACHE_ROOT: 캐시 디렉토리를 만들 기준 경로 (기본값: 현재 디렉토리)
+    - MCP_JAVA_INDEX_CACHE_BACKEND: "files" (항목별 파일, 기본값) | "sqlite" (단일 DB)
+    - MCP_JAVA_INDEX_CACHE_FORMAT: "marshal" (바이너리, 기본값) | "json"
+    - MCP_JAVA_INDEX_MEMORY_CACHE_MB: 디스크 앞단 메모리 LRU 캐시 한도 (기본값: 64, 0이면 사용 안 함)
+
+    같은 설정에 대해서는 동일한 인스턴스를 재사용합니다.
+    """
+    base = Path.cwd()
+    env_override = os.environ.get("MCP_JAVA_INDEX_CACHE_ROOT")
     if env_override:
         base = Path(env_override)
-    return CacheStore(base)
+    backend = (os.environ.get("MCP_JAVA_INDEX_CACHE_BACKEND") or "files").strip().lower()
+    store_cls = _BACKENDS.get(backend)
+    if store_cls is None:
+        raise ValueError(f"Unknown cache backend: {backend}")
+
+    memory_bytes = _memory_cache_bytes()
+    serializer = default_serializer()
+    key = (backend, str(base.resolve()), memory_bytes, serializer.name)
+    with _DEFAULT_STORES_LOCK:
+        store = _DEFAULT_STORES.get(key)
+        if store is None:
+            store = store_cls(base, serializer)
+            if memory_bytes > 0:
+                store = MemoryCacheStore(store, memory_bytes)
+            _DEFAULT_STORES[key] = store
+        return store
+
+
+def validation_mode() -> str:
+    """
+    캐시 유효성 검증 방식 (MCP_JAVA_INDEX_VALIDATION)
+
+    - "stat" (기본값): (size, mtime_ns, inode)가 같으면 원본을 읽지 않고 캐시를 신뢰,
+      stat이 다를 때만 파일을 읽어 해시로 검증
+    - "hash": 항상 파일을 읽어 SHA-1 해시로 검증
+    """
+    mode = (os.environ.get("MCP_JAVA_INDEX_VALIDATION") or "stat").strip().lower()
+    return "hash" if mode == "hash" else "stat"
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from cache.cache_store import CacheEntryInfo
+
+
+_DAY_SECONDS = 24 * 60 * 60
+
+
+@dataclass
+class GcPolicy:
+    """
+    캐시 GC 정책
+
+    - max_bytes: 캐시 항목 전체 크기 상한 (None이면 제한 없음). 넘으면 오래 사용되지 않은 항목부터 삭제
+    - max_age_days: 마지막 접근 후 이 기간이 지난 항목 삭제 (None이면 제한 없음)
+    - remove_orphans: 원본 파일이 더 이상 존재하지 않는 항목 삭제 (절대 경로로 기록된 항목만)
+    - live_options_keys: 현재 인덱서가 사용하는 옵션 키. 지정하면 다른 키(이전 옵션 조합 등)는 삭제
+    """
+
+    max_bytes: Optional[int] = None
+    max_age_days: Optional[float] = None
+    remove_orphans: bool = True
+    live_options_keys: Optional[frozenset[str]] = None
+
+
+def _env_number(name: str) -> Optional[float]:
+    raw = os.environ.get(name)
+    if raw is None or not raw.strip():
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        return None
+
+
+def default_gc_policy(live_options_keys: Optional[Iterable[str]] = None) -> GcPolicy:
+    """
+    환경 변수 기반 GC 정책
+
+    - MCP_JAVA_INDEX_CACHE_MAX_MB: 캐시 크기 상한 (기본값: 512)
+    - MCP_JAVA_INDEX_CACHE_MAX_AGE_DAYS: 미사용 항목 보관 기간 (기본값: 30)
+    """
+    max_mb = _env_number("MCP_JAVA_INDEX_CACHE_MAX_MB")
+    max_age_days = _env_number("MCP_JAVA_INDEX_CACHE_MAX_AGE_DAYS")
+    return GcPolicy(
+        max_bytes=int((512 if max_mb is None else max_mb) * 1024 * 1024),
+        max_age_days=30 if max_age_days is None else max_age_days,
+        remove_orphans=True,
+        live_options_keys=frozenset(live_options_keys) if live_options_keys is not None else None,
+    )
+
+
+def _source_missing(file_path: str) -> bool:
+    # 상대 경로는 인덱싱 당시의 작업 디렉토리를 알 수 없으므로 원본이 없다고 판단하지 않는다
+    # (GC를 다른 디렉토리에서 실행해도 유효한 항목을 지우지 않으며, 이런 항목은 보관 기간/크기 상한으로 정리됨)
+    path = Path(file_path)
+    return path.is_absolute() and not path.exists()
+
+
+def _removal_reason(entry: CacheEntryInfo, policy: GcPolicy, now: float) -> Optional[str]:
+    if entry.file_path is None:
+        return "invalid"
+    if policy.live_options_keys is not None and entry.options_key not in policy.live_options_keys:
+        return "obsolete"
+    if policy.max_age_days is not None and now - entry.accessed_at > policy.max_age_days * _DAY_SECONDS:
+        return "expired"
+    if policy.remove_orphans and _source_missing(entry.file_path):
+        return "orphan"
+    return None
+
+
+def collect_garbage(store, policy: GcPolicy, dry_run: bool = False) -> dict:
+    """
+    캐시 GC 실행
+
+    읽을 수 없는 항목, 현재 사용하지 않는 옵션 키의 항목, 보관 기간이 지난 항목, 원본이 삭제된 항목을
+    먼저 지우고, 남은 항목이 max_bytes를 넘으면 마지막 접근 시각이 오래된 순서로 지웁니다.
+
+    Returns:
+        검사/삭제한 항목 수와 회수한 바이트 수
+    """
+    started = time.perf_counter()
+    now = time.time()
+    entries = list(store.iter_entries())
+
+    removed: dict[str, int] = {"invalid": 0, "obsolete": 0, "expired": 0, "orphan": 0, "overBudget": 0}
+    doomed: list[CacheEntryInfo] = []
+    survivors: list[CacheEntryInfo] = []
+    for entry in entries:
+        reason = _removal_reason(entry, policy, now)
+        if reason is None:
+            survivors.append(entry)
+        else:
+            removed[reason] += 1
+            doomed.append(entry)
+
+    remaining_bytes = sum(entry.size_bytes for entry in survivors)
+    if policy.max_bytes is not None and remaining_bytes > policy.max_bytes:
+        survivors.sort(key=lambda entry: entry.accessed_at)
+        keep_from = 0
+        while keep_from < len(survivors) and remaining_bytes > policy.max_bytes:
+            remaining_bytes -= survivors[keep_from].size_bytes
+            doomed.append(survivors[keep_from])
+            removed["overBudget"] += 1
+            keep_from += 1
+        survivors = survivors[keep_from:]
+
+    if doomed and not dry_run:
+        # 다른 프로세스의 쓰기가 끝날 때까지 기다렸다가 삭제
+        with store.lock(exclusive=True):
+            store.delete_entries([entry.key for entry in doomed])
+
+    return {
+        "cacheDir": str(store.cache_dir),
+        "dryRun": dry_run,
+        "scannedEntries": len(entries),
+        "scannedBytes": sum(entry.size_bytes for entry in entries),
+        "removedEntries": len(doomed),
+        "removed": removed,
+        "reclaimedBytes": sum(entry.size_bytes for entry in doomed),
+        "remainingEntries": len(survivors),
+        "remainingBytes": remaining_bytes,
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+
+LOCK_FILE_NAME = ".lock"
+
+# msvcrt.locking은 대기 시간이 정해져 있으므로 직접 재시도
+_MSVCRT_RETRY_SECONDS = 0.05
+
+
+@contextmanager
+def advisory_lock(lock_path: Path, exclusive: bool = False) -> Iterator[None]:
+    """
+    캐시 디렉토리 단위의 권고(advisory) 잠금
+
+    캐시 쓰기는 공유 잠금, GC 삭제와 스키마 초기화는 배타 잠금을 사용합니다.
+    획득할 때마다 파일을 새로 열기 때문에 같은 프로세스의 스레드끼리도 잠금이 적용됩니다.
+    Windows(msvcrt)에는 공유 잠금이 없으므로 항상 배타 잠금으로 동작하고,
+    둘 다 없는 플랫폼에서는 잠금 없이 진행합니다.
+    """
+    fd = os.open(str(lock_path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        elif msvcrt is not None:
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(_MSVCRT_RETRY_SECONDS)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+import marshal
+import os
+import sys
+import zlib
+from typing import Any
+
+
+# 바이너리 캐시 헤더: MAGIC(3) + 헤더 버전(1) + 코덱 ID(1) + 코덱 버전(1) + 파이썬 버전(major, minor 각 1)
+MAGIC = b"MJI"
+HEADER_VERSION = 2
+_HEADER_SIZE = len(MAGIC) + 5
+_PYTHON_VERSION = bytes(sys.version_info[:2])
+
+
+class SerializationError(ValueError):
+    pass
+
+
+class JsonSerializer:
+    """
+    사람이 읽을 수 있는 JSON 형식 (디버깅용)
+
+    헤더 없이 공백을 제거한 UTF-8 JSON을 저장하므로 jq 등으로 바로 확인할 수 있습니다.
+    """
+
+    name = "json"
+    codec_id = 1
+    extension = ".json"
+
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def decode(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+
+class MarshalSerializer:
+    """
+    stdlib marshal + zlib(레벨 1) 기반 압축 바이너리 형식 (기본값)
+
+    인덱스는 같은 키와 symbolId 접두사가 반복되므로 가벼운 zlib 압축만으로도 크기가 크게 줄고,
+    압축 해제 비용은 JSON 디코딩보다 훨씬 작습니다.
+    marshal 포맷은 파이썬 버전에 따라 바뀔 수 있고 marshal.version이 같아도 파이썬 버전 사이의
+    호환은 보장되지 않으므로, 헤더에 marshal.version과 파이썬 버전(major, minor)을 함께 기록하고
+    어느 쪽이든 다르면 캐시 미스로 처리합니다.
+    """
+
+    name = "marshal"
+    codec_id = 2
+    extension = ".bin"
+    compress_level = 1
+
+    def encode(self, obj: Any) -> bytes:
+        header = MAGIC + bytes((HEADER_VERSION, self.codec_id, marshal.version)) + _PYTHON_VERSION
+        return header + zlib.compress(marshal.dumps(obj), self.compress_level)
+
+    def decode(self, payload: bytes) -> Any:
+        _check_header(payload, self.codec_id, marshal.version)
+        return marshal.loads(zlib.decompress(memoryview(payload)[_HEADER_SIZE:]))
+
+
+def _check_header(payload: bytes, codec_id: int, codec_version: int) -> None:
+    if len(payload) < _HEADER_SIZE or payload[: len(MAGIC)] != MAGIC:
+        raise SerializationError("Missing cache header")
+    header_version, payload_codec, payload_codec_version = payload[len(MAGIC) : len(MAGIC) + 3]
+    if header_version != HEADER_VERSION:
+        raise SerializationError(f"Unsupported cache header version: {header_version}")
+    if payload_codec != codec_id or payload_codec_version != codec_version:
+        raise SerializationError("Cache payload was written with a different codec")
+    if payload[len(MAGIC) + 3 : _HEADER_SIZE] != _PYTHON_VERSION:
+        raise SerializationError("Cache payload was written by a different Python version")
+
+
+_SERIALIZERS = {
+    JsonSerializer.name: JsonSerializer,
+    MarshalSerializer.name: MarshalSerializer,
+}
+
+
+def get_serializer(name: str) -> JsonSerializer | MarshalSerializer:
+    serializer_cls = _SERIALIZERS.get(name.strip().lower())
+    if serializer_cls is None:
+        raise ValueError(f"Unknown cache format: {name}")
+    return serializer_cls()
+
+
+def default_serializer() -> JsonSerializer | MarshalSerializer:
+    """MCP_JAVA_INDEX_CACHE_FORMAT 환경 변수로 선택 ("marshal" 기본값 | "json")"""
+    return get_serializer(os.environ.get("MCP_JAVA_INDEX_CACHE_FORMAT") or MarshalSerializer.name)
+
+
+def decode_any(payload: bytes) -> Any:
+    """헤더를 보고 코덱을 골라 디코딩 (헤더가 없으면 JSON으로 간주)"""
+    if payload[: len(MAGIC)] == MAGIC:
+        if len(payload) < _HEADER_SIZE:
+            raise SerializationError("Truncated cache header")
+        codec_id = payload[len(MAGIC) + 1]
+        for serializer_cls in _SERIALIZERS.values():
+            if serializer_cls.codec_id == codec_id:
+                return serializer_cls().decode(payload)
+        raise SerializationError(f"Unknown cache codec: {codec_id}")
+    return json.loads(payload)
@@ -2,9 +2,24 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
+import time
 
-from parser.indexer import find_symbols, index_java_file
-from parser.readers import read_range
+from cache.cache_store import default_cache_store
+from cache.gc import collect_garbage, default_gc_policy
+from parser.indexer import (
+    LIVE_CACHE_KEYS,
+    DirectorySummary,
+    apply_view,
+    find_symbols,
+    index_directory,
+    index_java_file,
+    index_java_outline,
+    iter_find_symbols,
+    iter_index_directory,
+)
+from parser.parallel import resolve_workers
+from parser.readers import read_range, read_ranges, read_symbol
 from parser.formatters import format_ultra_compact, format_compact
 
 
@@ -12,6 +27,59 @@ def _print_json(data: dict) -> None:
     print(json.dumps(data, ensure_ascii=True, indent=2))
 
 
+def _print_jsonl(data: dict) -> None:
+    # JSON Lines: 한 줄에 객체 하나, 파이프로 받는 쪽이 바로 읽도록 줄마다 flush
+    sys.stdout.write(json.dumps(data, ensure_ascii=True, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+
+def _add_scope_arguments(parser: argparse.ArgumentParser) -> None:
+    # 디렉토리 탐색 범위 (parser/discovery.py)
+    parser.add_argument(
+        "--include", action="append", default=None, help="Only index paths matching this glob (relative to root, repeatable)"
+    )
+    parser.add_argument("--exclude", action="append", default=None, help="Skip paths matching this glob (repeatable)")
+    parser.add_argument("--no-gitignore", action="store_true", help="Do not apply .gitignore rules")
+
+
+def _scope_options(args: argparse.Namespace) -> dict:
+    return {
+        "include": args.include,
+        "exclude": args.exclude,
+        "useGitignore": False if args.no_gitignore else None,
+    }
+
+
+def _range_request(spec: str) -> dict:
+    # FILE:START-END (파일 경로에 ':'가 있어도 마지막 ':' 기준으로 나눈다)
+    file_path, _, lines = spec.rpartition(":")
+    start, _, end = lines.partition("-")
+    try:
+        start_line = int(start)
+        end_line = int(end) if end else start_line
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected FILE:START-END, got {spec!r}") from None
+    if not file_path:
+        raise argparse.ArgumentTypeError(f"expected FILE:START-END, got {spec!r}")
+    return {"filePath": file_path, "startLine": start_line, "endLine": end_line}
+
+
+def _stream_index_dir(root: str, workers: int | None, with_files: bool, scope: dict) -> None:
+    # 파일마다 한 줄 (--with-files면 파일 인덱스 전체), 마지막 줄은 index-dir 요약과 같은 형식
+    started = time.perf_counter()
+    workers = resolve_workers(workers)
+    summary = DirectorySummary(root, workers)
+    for file_path, data in iter_index_directory(root, workers=workers, options=scope):
+        summary.add(file_path, data)
+        if with_files:
+            _print_jsonl(apply_view(data, {}))
+        else:
+            _print_jsonl(
+                {"filePath": file_path, "classCount": len(data.get("classes", [])), "errorCount": len(data.get("errors", []))}
+            )
+    _print_jsonl(summary.result(time.perf_counter() - started))
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(prog="java-analyzer")
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -58,6 +126,7 @@ def main() -> None:
     index_parser.add_argument(
         "--javadoc-preview-chars", type=int, default=0, help="Include Javadoc preview chars (full mode)"
     )
+    index_parser.add_argument("--jsonl", action="store_true", help="Print the result as a single JSON line")
 
     range_parser = subparsers.add_parser("range", help="Read a range of lines")
     range_parser.add_argument("file", help="Path to Java file")
@@ -66,12 +135,64 @@ def main() -> None:
     range_parser.add_argument("--no-line-numbers", action="store_true", help="Omit line numbers")
     range_parser.add_argument("--max-chars", type=int, default=20000, help="Max output characters")
 
+    ranges_parser = subparsers.add_parser("ranges", help="Read several line ranges, grouped and merged per file")
+    ranges_parser.add_argument(
+        "ranges", nargs="+", type=_range_request, metavar="FILE:START-END", help="Line range to read (1-based, inclusive)"
+    )
+    ranges_parser.add_argument("--no-line-numbers", action="store_true", help="Omit line numbers")
+    ranges_parser.add_argument("--max-chars", type=int, default=20000, help="Max output characters for the whole batch")
+
+    symbol_parser = subparsers.add_parser("symbol", help="Read the source of a symbol by its symbolId")
+    symbol_parser.add_argument("file", help="Path to Java file")
+    symbol_parser.add_argument("symbol_id", help="symbolId from index/find")
+    symbol_parser.add_argument("--javadoc", action="store_true", help="Start at the preceding Javadoc comment")
+    symbol_parser.add_argument("--no-annotations", action="store_true", help="Skip leading annotations")
+    symbol_parser.add_argument("--max-chars", type=int, default=20000, help="Max output characters")
+    symbol_parser.add_argument("--expected-hash", help="Fail as stale unless the file content hash matches")
+
     find_parser = subparsers.add_parser("find", help="Find symbols in a directory")
     find_parser.add_argument("--root", required=True, help="Root directory")
     find_parser.add_argument("--query", required=True, help="Symbol name query")
     find_parser.add_argument("--kind", default="any", help="class|method|field|any")
     find_parser.add_argument("--max-results", type=int, default=50, help="Max results")
     find_parser.add_argument("--case-sensitive", action="store_true", help="Case sensitive search")
+    find_parser.add_argument(
+        "--rank", action="store_true", help="Rank by match quality (exact > prefix > camelCase > substring > fuzzy)"
+    )
+    find_parser.add_argument(
+        "--qualified", action="store_true", help="Also match qualified names (e.g. com.example.UserService#find)"
+    )
+    find_parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes for cold indexing (default: MCP_JAVA_INDEX_WORKERS or CPU count)"
+    )
+    find_parser.add_argument("--jsonl", action="store_true", help="Stream one JSON line per match as it is found")
+    _add_scope_arguments(find_parser)
+
+    index_dir_parser = subparsers.add_parser("index-dir", help="Index all Java files under a directory (warms the cache)")
+    index_dir_parser.add_argument("root", help="Root directory")
+    index_dir_parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: MCP_JAVA_INDEX_WORKERS or CPU count)"
+    )
+    index_dir_parser.add_argument("--with-files", action="store_true", help="Include the full index of every file")
+    index_dir_parser.add_argument(
+        "--jsonl", action="store_true", help="Stream one JSON line per file as it is indexed, then a summary line"
+    )
+    _add_scope_arguments(index_dir_parser)
+
+    cache_parser = subparsers.add_parser("cache", help="Manage the index cache")
+    cache_subparsers = cache_parser.add_subparsers(dest="cache_command", required=True)
+    gc_parser = cache_subparsers.add_parser("gc", help="Remove stale, orphaned and over-budget cache entries")
+    gc_parser.add_argument(
+        "--max-mb", type=float, default=None, help="Max total cache size in MB (default: MCP_JAVA_INDEX_CACHE_MAX_MB or 512)"
+    )
+    gc_parser.add_argument(
+        "--max-age-days",
+        type=float,
+        default=None,
+        help="Remove entries not accessed for this many days (default: MCP_JAVA_INDEX_CACHE_MAX_AGE_DAYS or 30)",
+    )
+    gc_parser.add_argument("--keep-orphans", action="store_true", help="Keep entries whose source file was deleted")
+    gc_parser.add_argument("--dry-run", action="store_true", help="Report what would be removed without deleting")
 
     args = parser.parse_args()
 
@@ -85,8 +206,11 @@ def main() -> None:
             "maxJavadocPreviewChars": args.javadoc_preview_chars,
         }
 
-        # 먼저 full 모드로 인덱싱
-        full_result = index_java_file(args.file, full_options)
+        # 먼저 full 모드로 인덱싱 (ultra는 개요 인덱스로 충분)
+        if args.mode == "ultra":
+            full_result = index_java_outline(args.file, full_options)
+        else:
+            full_result = index_java_file(args.file, full_options)
 
         # 모드에 따라 포맷팅
         if args.mode == "ultra":
@@ -104,7 +228,10 @@ def main() -> None:
         else:  # full
             result = full_result
 
-        _print_json(result)
+        if args.jsonl:
+            _print_jsonl(result)
+        else:
+            _print_json(result)
         return
 
     if args.command == "range":
@@ -116,16 +243,63 @@ def main() -> None:
         _print_json(result)
         return
 
+    if args.command == "ranges":
+        options = {
+            "includeLineNumbers": not args.no_line_numbers,
+            "maxChars": args.max_chars,
+        }
+        _print_json(read_ranges(args.ranges, options))
+        return
+
+    if args.command == "symbol":
+        options = {
+            "includeJavadoc": args.javadoc,
+            "includeAnnotations": not args.no_annotations,
+            "maxChars": args.max_chars,
+            "expectedHash": args.expected_hash,
+        }
+        _print_json(read_symbol(args.file, args.symbol_id, options, default_cache_store()))
+        return
+
     if args.command == "find":
         options = {
             "matchKind": args.kind,
             "maxResults": args.max_results,
             "caseSensitive": args.case_sensitive,
+            "matchQualifiedName": args.qualified,
+            "rank": args.rank,
+            "workers": args.workers,
+            **_scope_options(args),
         }
+        if args.jsonl:
+            for match in iter_find_symbols(args.root, args.query, options):
+                _print_jsonl(match)
+            return
         result = find_symbols(args.root, args.query, options)
         _print_json(result)
         return
 
+    if args.command == "index-dir":
+        if args.jsonl:
+            _stream_index_dir(args.root, args.workers, args.with_files, _scope_options(args))
+            return
+        result = index_directory(
+            args.root, _scope_options(args), workers=args.workers, include_files=args.with_files
+        )
+        _print_json(result)
+        return
+
+    if args.command == "cache" and args.cache_command == "gc":
+        policy = default_gc_policy(LIVE_CACHE_KEYS)
+        if args.max_mb is not None:
+            policy.max_bytes = int(args.max_mb * 1024 * 1024)
+        if args.max_age_days is not None:
+            policy.max_age_days = args.max_age_days
+        policy.remove_orphans = not args.keep_orphans
+        result = collect_garbage(default_cache_store(), policy, dry_run=args.dry_run)
+        _print_json(result)
+        return
+
 
 if __name__ == "__main__":
     main()
@@ -36,43 +36,14 @@ def first_identifier(node: Node) -> Optional[Node]:
     return None
 
 
-def modifiers_node(node: Node) -> Optional[Node]:
-    by_field = node.child_by_field_name("modifiers")
-    if by_field is not None:
-        return by_field
-    for child in node.named_children:
-        if child.type == "modifiers":
-            return child
-    return None
-
-
-def extract_modifiers(source_bytes: bytes, node: Node) -> list[str]:
-    mods_node = modifiers_node(node)
-    if mods_node is None:
-        return []
-    modifiers: list[str] = []
-    for child in mods_node.children:
-        text = node_text(source_bytes, child).strip()
-        if not text:
-            continue
-        if text.startswith("@"):
-            continue
-        modifiers.append(text)
-    return modifiers
-
-
-def modifier_anchor_line(node: Node) -> Optional[int]:
-    mods_node = modifiers_node(node)
-    if mods_node is None:
-        return None
-    return mods_node.start_point[0] + 1
-
-
 def normalize_whitespace(text: str) -> str:
     return " ".join(text.split())
 
 
 def split_top_level_commas(text: str) -> list[str]:
+    if "<" not in text:
+        # 제네릭이 없으면 모든 쉼표가 최상위 쉼표
+        return [part for part in (segment.strip() for segment in text.split(",")) if part]
     parts: list[str] = []
     current: list[str] = []
     depth = 0
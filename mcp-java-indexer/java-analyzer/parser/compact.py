@@ -0,0 +1,58 @@
+"""
+인덱스 값 공유 (메모리 절약)
+
+심볼 dict는 API 스키마 그대로 두고, 그 안의 작은 값을 심볼/파일 사이에서 공유합니다.
+
+- 이름/타입 문자열은 sys.intern()으로 하나만 남깁니다. marshal 캐시 형식은 intern 여부를 기록하므로
+  디스크 캐시에서 읽은 인덱스도 같은 문자열 객체를 씁니다.
+- modifiers/어노테이션/throws 같은 문자열 목록과 파라미터 dict는 내용이 같으면 같은 객체를 돌려줍니다.
+  한 파일 안에서 공유된 객체는 marshal이 참조로 저장하므로 디스크에서 읽을 때도 공유가 유지됩니다.
+
+공유된 값은 읽기 전용입니다 (메모리 캐시가 돌려주는 dict와 같은 규칙).
+"""
+from __future__ import annotations
+
+import sys
+
+# 공유 테이블이 이 크기를 넘으면 비운다 (이미 공유된 객체는 그대로 두고 이후 값부터 새로 공유)
+_SHARED_LIMIT = 1 << 16
+
+_SHARED: dict[tuple, object] = {}
+
+
+def _remember(key: tuple, value):
+    if len(_SHARED) >= _SHARED_LIMIT:
+        _SHARED.clear()
+    return _SHARED.setdefault(key, value)
+
+
+def shared_text(text: str) -> str:
+    """이름/타입처럼 여러 심볼에서 반복되는 짧은 문자열"""
+    return sys.intern(text)
+
+
+def shared_strings(items: list[str]) -> list[str]:
+    """내용이 같은 문자열 목록은 같은 list 객체로 (빈 목록 포함)"""
+    key = ("strings", *items)
+    shared = _SHARED.get(key)
+    if shared is None:
+        shared = _remember(key, [sys.intern(item) for item in items])
+    return shared
+
+
+def shared_param(name: str, type_text: str) -> dict:
+    """파라미터 {"name", "typeText"} dict (같은 이름과 타입이면 같은 객체)"""
+    key = ("param", name, type_text)
+    shared = _SHARED.get(key)
+    if shared is None:
+        shared = _remember(key, {"name": sys.intern(name), "typeText": sys.intern(type_text)})
+    return shared
+
+
+def shared_path(path: list) -> list:
+    """symbolIndex 경로 ([클래스 번호, 멤버 키, 번호, ...]): 파일이 달라도 같은 경로가 많다"""
+    key = ("path", *path)
+    shared = _SHARED.get(key)
+    if shared is None:
+        shared = _remember(key, path)
+    return shared
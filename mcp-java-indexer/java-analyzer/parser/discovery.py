@@ -0,0 +1,453 @@
+"""
+Java 파일 탐색 (os.scandir + 디렉토리 가지치기)
+
+루트 아래를 깊이 우선으로 훑으면서 .java 파일을 이름순으로 내보냅니다 (디렉토리의 파일 → 하위 디렉토리 순).
+다음 디렉토리는 내려가지 않습니다 (rglob은 모두 내려가서 생성된 소스까지 인덱싱했습니다).
+
+- 항상 제외: .git/.hg/.svn, .gradle/.idea, node_modules, 인덱스 캐시 디렉토리(.mcp-java-index-cache)
+- 빌드 출력: pom.xml/build.gradle 등 빌드 파일이 있는 디렉토리의 target/build/out
+  (이름만 보고 지우면 com/example/build 같은 패키지 디렉토리까지 빠지므로 빌드 파일 옆에 있을 때만)
+- .gitignore: 루트와 하위 디렉토리의 .gitignore, 루트가 Git 저장소 안이면 저장소 루트까지의 상위 .gitignore와
+  .git/info/exclude (MCP_JAVA_INDEX_GITIGNORE=0 또는 useGitignore: false면 사용 안 함)
+- 사용자 glob: exclude는 파일과 디렉토리를 모두 제외하고, include가 있으면 파일이나 상위 디렉토리가
+  하나라도 맞는 파일만 내보냅니다. 패턴 문법은 .gitignore와 같고 루트 기준 상대 경로에 맞춥니다
+  (MCP_JAVA_INDEX_INCLUDE/EXCLUDE, 쉼표 구분).
+
+디렉토리 목록은 디렉토리 stat(mtime 포함)을 키로 프로세스 안에 보관합니다. 다시 훑을 때 stat이 같은 디렉토리는
+scandir을 하지 않고 보관한 목록을 씁니다. 하위 디렉토리가 바뀌어도 상위 디렉토리의 mtime은 그대로이므로
+디렉토리마다 stat 한 번은 필요합니다. 심볼릭 링크 디렉토리는 순환을 막기 위해 따라가지 않습니다.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from cache.cache_store import CACHE_DIR_NAME, file_stat, trusted_stat
+
+
+ALWAYS_EXCLUDED_DIRS = frozenset({".git", ".hg", ".svn", ".gradle", ".idea", "node_modules", CACHE_DIR_NAME})
+BUILD_OUTPUT_DIRS = frozenset({"target", "build", "out"})
+BUILD_FILES = frozenset({"pom.xml", "build.gradle", "build.gradle.kts", "settings.gradle", "settings.gradle.kts", "build.xml"})
+
+GITIGNORE_NAME = ".gitignore"
+
+# 디렉토리 목록 캐시가 이 개수를 넘으면 비운다
+_LISTING_LIMIT = 1 << 16
+
+
+@dataclass(frozen=True)
+class DiscoveryRules:
+    """탐색 규칙 (include/exclude glob, .gitignore 사용 여부)"""
+
+    include: tuple[str, ...] = ()
+    exclude: tuple[str, ...] = ()
+    use_gitignore: bool = True
+
+    def key(self) -> str:
+        """기본 규칙이면 빈 문자열 (심볼 테이블을 규칙별로 나눌 때 사용)"""
+        if self == DiscoveryRules():
+            return ""
+        parts = ["+" + item for item in self.include] + ["-" + item for item in self.exclude]
+        return "\0".join(parts + [str(self.use_gitignore)])
+
+
+def _patterns(value) -> tuple[str, ...]:
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = value.split(",")
+    return tuple(item.strip() for item in value if item and item.strip())
+
+
+def discovery_rules(options: Optional[dict] = None) -> DiscoveryRules:
+    """
+    옵션(include/exclude/useGitignore)과 환경 변수로 탐색 규칙 구성
+
+    MCP_JAVA_INDEX_INCLUDE/MCP_JAVA_INDEX_EXCLUDE의 패턴과 옵션의 패턴을 모두 적용합니다.
+    """
+    opts = options or {}
+    gitignore_env = (os.environ.get("MCP_JAVA_INDEX_GITIGNORE") or "1").strip().lower()
+    use_gitignore = opts.get("useGitignore")
+    if use_gitignore is None:
+        use_gitignore = gitignore_env not in ("0", "false", "no", "off")
+    return DiscoveryRules(
+        include=_patterns(os.environ.get("MCP_JAVA_INDEX_INCLUDE")) + _patterns(opts.get("include")),
+        exclude=_patterns(os.environ.get("MCP_JAVA_INDEX_EXCLUDE")) + _patterns(opts.get("exclude")),
+        use_gitignore=bool(use_gitignore),
+    )
+
+
+# ----- .gitignore 패턴 -----
+
+
+def _translate_segment(segment: str) -> str:
+    out = []
+    idx = 0
+    while idx < len(segment):
+        char = segment[idx]
+        if char == "\\" and idx + 1 < len(segment):
+            out.append(re.escape(segment[idx + 1]))
+            idx += 2
+            continue
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = segment.find("]", idx + 2)
+            if end < 0:
+                out.append(re.escape(char))
+            else:
+                body = segment[idx + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                idx = end
+        else:
+            out.append(re.escape(char))
+        idx += 1
+    return "".join(out)
+
+
+def compile_pattern(pattern: str) -> Optional[tuple[re.Pattern, bool, bool]]:
+    """
+    .gitignore 한 줄 → (상대 경로 정규식, 부정 여부, 디렉토리 전용 여부) (빈 줄/주석이면 None)
+
+    슬래시가 처음이나 중간에 있으면 기준 디렉토리에 고정되고, 아니면 어느 깊이의 이름에도 맞습니다.
+    """
+    line = pattern.rstrip("\n\r")
+    # 끝의 공백은 "\ "로 이스케이프하지 않았으면 무시
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+    if not line or line.startswith("#"):
+        return None
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+    directory_only = line.endswith("/")
+    line = line.rstrip("/")
+    anchored = "/" in line
+    line = line.lstrip("/")
+    if not line:
+        return None
+
+    segments = line.split("/")
+    parts: list[str] = []
+    for position, segment in enumerate(segments):
+        last = position == len(segments) - 1
+        if segment == "**":
+            parts.append(".*" if last else "(?:.*/)?")
+            continue
+        parts.append(_translate_segment(segment) + ("" if last else "/"))
+    body = "".join(parts)
+    prefix = "" if anchored else "(?:.*/)?"
+    return re.compile(f"{prefix}{body}"), negated, directory_only
+
+
+class IgnoreRules:
+    """한 기준 디렉토리의 패턴 목록 (마지막으로 맞은 패턴이 결정)"""
+
+    __slots__ = ("rules",)
+
+    def __init__(self, lines) -> None:
+        self.rules = [rule for rule in (compile_pattern(line) for line in lines) if rule is not None]
+
+    def match(self, relative_path: str, is_dir: bool) -> Optional[bool]:
+        """제외면 True, 부정 패턴으로 다시 포함되면 False, 맞는 패턴이 없으면 None"""
+        result = None
+        for regex, negated, directory_only in self.rules:
+            if directory_only and not is_dir:
+                continue
+            if regex.fullmatch(relative_path):
+                result = not negated
+        return result
+
+
+# ----- 디렉토리 목록 캐시 -----
+
+
+@dataclass
+class _Listing:
+    stat: tuple
+    files: tuple[str, ...]
+    directories: tuple[str, ...]
+    has_build_file: bool
+    has_gitignore: bool
+
+
+_LOCK = threading.Lock()
+_LISTINGS: dict[str, _Listing] = {}
+_GITIGNORES: dict[str, tuple[tuple, IgnoreRules]] = {}
+
+
+def clear_listing_cache() -> None:
+    with _LOCK:
+        _LISTINGS.clear()
+        _GITIGNORES.clear()
+
+
+def _scan(directory: str) -> Optional[_Listing]:
+    stat = file_stat(directory)
+    if stat is None:
+        return None
+    with _LOCK:
+        cached = _LISTINGS.get(directory)
+    if cached is not None and cached.stat == stat:
+        return cached
+
+    files: list[str] = []
+    directories: list[str] = []
+    has_build_file = has_gitignore = False
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(name)
+                    elif name.endswith(".java"):
+                        if entry.is_file():
+                            files.append(name)
+                    elif name in BUILD_FILES:
+                        has_build_file = True
+                    elif name == GITIGNORE_NAME:
+                        has_gitignore = True
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    files.sort()
+    directories.sort()
+    listing = _Listing(stat, tuple(files), tuple(directories), has_build_file, has_gitignore)
+    # 방금 바뀐 디렉토리는 같은 mtime 안에서 다시 바뀔 수 있으므로 보관하지 않는다
+    if trusted_stat(stat) is not None:
+        with _LOCK:
+            if len(_LISTINGS) >= _LISTING_LIMIT:
+                _LISTINGS.clear()
+            _LISTINGS[directory] = listing
+    return listing
+
+
+def _ignore_file(path: str) -> Optional[IgnoreRules]:
+    stat = file_stat(path)
+    if stat is None:
+        return None
+    with _LOCK:
+        cached = _GITIGNORES.get(path)
+    if cached is not None and cached[0] == stat:
+        return cached[1]
+    try:
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            rules = IgnoreRules(handle.read().splitlines())
+    except OSError:
+        return None
+    if trusted_stat(stat) is not None:
+        with _LOCK:
+            if len(_GITIGNORES) >= _LISTING_LIMIT:
+                _GITIGNORES.clear()
+            _GITIGNORES[path] = (stat, rules)
+    return rules
+
+
+def _ancestor_ignores(root: str) -> list[tuple[IgnoreRules, str]]:
+    # 루트가 Git 저장소(루트 자신 포함) 안이면 저장소의 .git/info/exclude와 저장소 루트부터 루트의 부모까지의
+    # .gitignore (루트 기준 접두사와 함께). 루트 자신의 .gitignore는 탐색하면서 읽는다
+    absolute = Path(os.path.abspath(root))
+    chain = []
+    for ancestor in (absolute, *absolute.parents):
+        chain.append(ancestor)
+        if (ancestor / ".git").exists():
+            break
+    else:
+        return []
+    ignores: list[tuple[IgnoreRules, str]] = []
+    for ancestor in reversed(chain):
+        paths = [ancestor / ".git" / "info" / "exclude"]
+        if ancestor == absolute:
+            prefix = ""
+        else:
+            prefix = absolute.relative_to(ancestor).as_posix() + "/"
+            paths.append(ancestor / GITIGNORE_NAME)
+        for path in paths:
+            rules = _ignore_file(str(path))
+            if rules is not None:
+                ignores.append((rules, prefix))
+    return ignores
+
+
+def _ignored(ignores: list[tuple[IgnoreRules, str]], name: str, is_dir: bool) -> bool:
+    # 상위 → 하위 순으로 적용하고 하위 .gitignore의 결정이 우선
+    result = False
+    for rules, prefix in ignores:
+        matched = rules.match(prefix + name, is_dir)
+        if matched is not None:
+            result = matched
+    return result
+
+
+@dataclass
+class _Walk:
+    """iter_directories() 한 번의 탐색 설정 (루트 기준 규칙)"""
+
+    rules: DiscoveryRules
+    include: Optional[IgnoreRules]
+    exclude: Optional[IgnoreRules]
+
+
+# 탐색 스택 항목: (디렉토리 경로, 루트 기준 상대 경로 접두사,
+#  [(.gitignore 규칙, 그 기준 디렉토리에서 이 디렉토리까지의 접두사)], include 패턴에 맞는 상위 디렉토리가 있는지)
+_Frame = tuple[str, str, list[tuple[IgnoreRules, str]], bool]
+
+
+def _start(root_dir: str, rules: Optional[DiscoveryRules]) -> tuple[_Walk, _Frame]:
+    rules = rules if rules is not None else discovery_rules()
+    walk = _Walk(
+        rules,
+        IgnoreRules(rules.include) if rules.include else None,
+        IgnoreRules(rules.exclude) if rules.exclude else None,
+    )
+    base = str(Path(root_dir))
+    root_ignores = _ancestor_ignores(base) if rules.use_gitignore else []
+    return walk, (base, "", root_ignores, walk.include is None)
+
+
+def _enter(walk: _Walk, frame: _Frame) -> Optional[tuple[_Listing, list[tuple[IgnoreRules, str]]]]:
+    # 디렉토리 목록과 (디렉토리의 .gitignore까지 더한) 적용할 규칙
+    directory, _, ignores, _ = frame
+    listing = _scan(directory)
+    if listing is None:
+        return None
+    if listing.has_gitignore and walk.rules.use_gitignore:
+        local = _ignore_file(os.path.join(directory, GITIGNORE_NAME))
+        if local is not None:
+            ignores = ignores + [(local, "")]
+    return listing, ignores
+
+
+def _file_included(walk: _Walk, frame: _Frame, ignores: list[tuple[IgnoreRules, str]], name: str) -> bool:
+    _, relative, _, included = frame
+    if ignores and _ignored(ignores, name, False):
+        return False
+    if walk.exclude is not None and walk.exclude.match(relative + name, False):
+        return False
+    if not included and not walk.include.match(relative + name, False):
+        return False
+    return True
+
+
+def _child(
+    walk: _Walk, frame: _Frame, listing: _Listing, ignores: list[tuple[IgnoreRules, str]], name: str
+) -> Optional[_Frame]:
+    directory, relative, _, included = frame
+    if name in ALWAYS_EXCLUDED_DIRS:
+        return None
+    if listing.has_build_file and name in BUILD_OUTPUT_DIRS:
+        return None
+    if ignores and _ignored(ignores, name, True):
+        return None
+    child = relative + name
+    if walk.exclude is not None and walk.exclude.match(child, True):
+        return None
+    child_ignores = [(item, prefix + name + "/") for item, prefix in ignores]
+    child_included = included or bool(walk.include.match(child, True))
+    return os.path.join(directory, name), child + "/", child_ignores, child_included
+
+
+def _descend(walk: _Walk, frame: _Frame, relative_parts: list[str]) -> Optional[_Frame]:
+    # 루트에서 하위 디렉토리까지 한 단계씩 내려가며 규칙을 쌓는다 (도중에 제외되면 None)
+    for name in relative_parts:
+        entered = _enter(walk, frame)
+        if entered is None or name not in entered[0].directories:
+            return None
+        frame = _child(walk, frame, entered[0], entered[1], name)
+        if frame is None:
+            return None
+    return frame
+
+
+def _relative_parts(root_dir: str, path: str) -> Optional[list[str]]:
+    relative = os.path.relpath(os.path.abspath(path), os.path.abspath(root_dir))
+    if relative == os.curdir:
+        return []
+    parts = relative.split(os.sep)
+    if parts[0] == os.pardir:
+        return None
+    return parts
+
+
+def iter_directories(
+    root_dir: str, rules: Optional[DiscoveryRules] = None, start: Optional[str] = None
+) -> Iterator[tuple[str, list[str]]]:
+    """
+    root_dir 아래에서 탐색 규칙이 제외하지 않는 디렉토리와 그 안의 .java 파일 경로 (iter_java_files와 같은 순서)
+
+    Args:
+        root_dir: 루트 디렉토리 (규칙의 기준)
+        rules: 탐색 규칙 (None이면 discovery_rules()의 기본값)
+        start: 이 하위 디렉토리부터 훑음 (루트부터의 .gitignore/빌드 출력 규칙은 그대로 적용,
+            루트 밖이거나 제외된 디렉토리면 아무것도 내보내지 않음)
+    """
+    walk, frame = _start(root_dir, rules)
+    if start is not None:
+        parts = _relative_parts(root_dir, start)
+        descended = _descend(walk, frame, parts) if parts is not None else None
+        if descended is None:
+            return
+        frame = descended
+    stack = [frame]
+    while stack:
+        frame = stack.pop()
+        entered = _enter(walk, frame)
+        if entered is None:
+            continue
+        listing, ignores = entered
+        directory = frame[0]
+        yield directory, [
+            os.path.join(directory, name) for name in listing.files if _file_included(walk, frame, ignores, name)
+        ]
+        children = [_child(walk, frame, listing, ignores, name) for name in listing.directories]
+        # 스택이므로 역순으로 넣어야 이름순으로 내려간다
+        stack.extend(reversed([child for child in children if child is not None]))
+
+
+def iter_java_files(root_dir: str, rules: Optional[DiscoveryRules] = None) -> Iterator[str]:
+    """
+    root_dir 아래의 .java 파일 경로 (root_dir을 앞에 붙인 경로, 디렉토리별 이름순, 지연 생성)
+
+    Args:
+        root_dir: 루트 디렉토리
+        rules: 탐색 규칙 (None이면 discovery_rules()의 기본값)
+    """
+    for _, files in iter_directories(root_dir, rules):
+        yield from files
+
+
+def is_java_file_included(root_dir: str, path: str, rules: Optional[DiscoveryRules] = None) -> bool:
+    """path가 존재하고 iter_java_files(root_dir, rules)가 내보낼 .java 파일인지 (파일 감시기의 변경 경로 확인용)"""
+    if not path.endswith(".java") or not os.path.isfile(path):
+        return False
+    parts = _relative_parts(root_dir, path)
+    if not parts:
+        return False
+    walk, frame = _start(root_dir, rules)
+    parent = _descend(walk, frame, parts[:-1])
+    if parent is None:
+        return False
+    entered = _enter(walk, parent)
+    return entered is not None and _file_included(walk, parent, entered[1], parts[-1])
+
+
+def path_order_key(root_dir: str, path: str) -> list[tuple[int, str]]:
+    """
+    iter_java_files() 순서의 정렬 키 (디렉토리의 파일 → 하위 디렉토리, 각각 이름순)
+
+    탐색을 다시 하지 않고 새 파일을 탐색 순서 자리에 끼워 넣을 때 씁니다.
+    """
+    parts = os.path.relpath(path, str(Path(root_dir))).split(os.sep)
+    return [(1, name) for name in parts[:-1]] + [(0, parts[-1])]
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from tree_sitter import Tree
+
+
+@dataclass(frozen=True)
+class SourceEdit:
+    """이전 소스 → 새 소스 사이의 바뀐 구간 하나 (tree-sitter Tree.edit() 인자와 같은 형태)"""
+
+    start_byte: int
+    old_end_byte: int
+    new_end_byte: int
+    start_point: tuple[int, int]
+    old_end_point: tuple[int, int]
+    new_end_point: tuple[int, int]
+
+    @property
+    def row_delta(self) -> int:
+        return self.new_end_point[0] - self.old_end_point[0]
+
+    def apply(self, tree: Tree) -> None:
+        tree.edit(
+            start_byte=self.start_byte,
+            old_end_byte=self.old_end_byte,
+            new_end_byte=self.new_end_byte,
+            start_point=self.start_point,
+            old_end_point=self.old_end_point,
+            new_end_point=self.new_end_point,
+        )
+
+
+@dataclass
+class RetainedClass:
+    """이전 파싱에서 추출한 최상위 클래스 (위치가 그대로면 다시 추출하지 않고 재사용)"""
+
+    node_type: str
+    start_byte: int
+    end_byte: int
+    # 추출 결과가 의존하는 줄 범위 (0부터, 양 끝 포함). Javadoc 탐색이 클래스 위쪽 줄까지 읽으므로 first_row ≤ 클래스 시작 줄
+    first_row: int
+    last_row: int
+    data: dict
+    javadoc_texts: dict[str, str]
+
+
+@dataclass
+class RetainedTree:
+    source_bytes: bytes
+    tree: Tree
+    package_name: str
+    classes: dict[tuple[str, int, int], RetainedClass]
+
+
+def _common_prefix_len(old: bytes, new: bytes) -> int:
+    # 슬라이스 비교(memcmp)로 이분 탐색하면 바이트마다 파이썬 반복을 돌지 않는다
+    lo, hi = 0, min(len(old), len(new))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[:mid] == new[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_len(old: bytes, new: bytes, limit: int) -> int:
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[len(old) - mid :] == new[len(new) - mid :]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _point_at(source: bytes, offset: int) -> tuple[int, int]:
+    row = source.count(b"\n", 0, offset)
+    return row, offset - (source.rfind(b"\n", 0, offset) + 1)
+
+
+def compute_edit(old: bytes, new: bytes) -> Optional[SourceEdit]:
+    """
+    두 소스의 공통 접두사/접미사를 뺀 나머지를 하나의 편집으로 계산 (같으면 None)
+
+    여러 곳을 고쳤으면 첫 변경부터 마지막 변경까지가 하나의 편집이 됩니다.
+    """
+    if old == new:
+        return None
+    prefix = _common_prefix_len(old, new)
+    suffix = _common_suffix_len(old, new, min(len(old), len(new)) - prefix)
+    old_end = len(old) - suffix
+    new_end = len(new) - suffix
+    return SourceEdit(
+        start_byte=prefix,
+        old_end_byte=old_end,
+        new_end_byte=new_end,
+        start_point=_point_at(old, prefix),
+        old_end_point=_point_at(old, old_end),
+        new_end_point=_point_at(new, new_end),
+    )
+
+
+def reusable_class(
+    retained: RetainedTree,
+    edit: Optional[SourceEdit],
+    node_type: str,
+    start_byte: int,
+    end_byte: int,
+    start_row: int,
+    end_row: int,
+) -> Optional[RetainedClass]:
+    """
+    새 트리의 최상위 클래스 노드(새 소스 기준 위치)에 대응하는 이전 추출 결과
+
+    편집 구간과 겹치는 줄을 읽지 않았고 줄 번호도 그대로인 클래스만 재사용합니다.
+    편집보다 뒤에 있는 클래스는 줄 수가 바뀌지 않은 편집일 때만 재사용합니다 (symbolId 등에 줄 번호가 들어가므로).
+    """
+    if edit is None:
+        return retained.classes.get((node_type, start_byte, end_byte))
+    if end_row < edit.start_point[0]:
+        # 편집보다 앞 (편집이 시작되는 줄은 내용이 바뀌므로 그 앞 줄에서 끝나야 함)
+        return retained.classes.get((node_type, start_byte, end_byte))
+    if edit.row_delta != 0 or start_byte < edit.new_end_byte:
+        return None
+    shift = edit.new_end_byte - edit.old_end_byte
+    entry = retained.classes.get((node_type, start_byte - shift, end_byte - shift))
+    if entry is None or entry.first_row <= edit.old_end_point[0]:
+        return None
+    return entry
+
+
+def retained_tree_limit() -> int:
+    """
+    MCP_JAVA_INDEX_RETAINED_TREES 환경 변수 (기본값: 32)
+
+    증분 재파싱을 위해 구문 트리를 보관할 최근 파일 수입니다. 0이면 항상 처음부터 파싱합니다.
+    """
+    raw = os.environ.get("MCP_JAVA_INDEX_RETAINED_TREES", "").strip()
+    try:
+        return max(0, int(raw)) if raw else 32
+    except ValueError:
+        return 32
+
+
+class RetainedTrees:
+    """파일 경로 → 마지막으로 파싱한 소스/트리/클래스 추출 결과 (LRU)"""
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, RetainedTree] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, file_path: str) -> Optional[RetainedTree]:
+        """보관 중인 항목을 꺼냄 (Tree.edit()가 트리를 바꾸므로 꺼낸 항목은 다시 put()해야 재사용됨)"""
+        with self._lock:
+            return self._entries.pop(file_path, None)
+
+    def put(self, file_path: str, entry: RetainedTree) -> None:
+        limit = retained_tree_limit()
+        with self._lock:
+            self._entries.pop(file_path, None)
+            if limit <= 0:
+                return
+            self._entries[file_path] = entry
+            while len(self._entries) > limit:
+                self._entries.popitem(last=False)
+
+    def discard(self, file_path: str) -> None:
+        with self._lock:
+            self._entries.pop(file_path, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
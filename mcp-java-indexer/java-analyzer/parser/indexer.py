@@ -1,27 +1,34 @@
 from __future__ import annotations
 
+import bisect
 import hashlib
-import json
+import os
+import threading
+import time
+from contextlib import closing
 from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
 
 from tree_sitter import Language, Parser
 import tree_sitter_java
 
-from cache.cache_store import CacheStore, default_cache_store
+from cache.cache_store import CacheStore, default_cache_store, file_stat, validation_mode
 from parser.ast_utils import (
-    extract_modifiers,
     first_identifier,
     first_named_child,
     first_named_descendant,
-    modifier_anchor_line,
     node_text,
     normalize_whitespace,
     split_top_level_commas,
     strip_prefix_keyword,
 )
-from parser.javadoc import build_javadoc_dict
+from parser.compact import shared_param, shared_path, shared_strings, shared_text
+from parser.incremental import RetainedClass, RetainedTree, RetainedTrees, compute_edit, reusable_class
+from parser.javadoc import comment_text, javadoc_dict, preceding_comment
+from parser import discovery, parallel
+from parser.symbol_table import excluded_flags, refresh_interval_seconds, symbol_table_for
 
 
 CLASS_NODE_KINDS = {
@@ -36,31 +43,83 @@ CLASS_NODE_KINDS = {
 @dataclass
 class ParseContext:
     source_bytes: bytes
-    lines: list[str]
     package_name: str
-    options: dict
+    javadoc_texts: dict[str, str]
+    # Javadoc 판단에 쓴 가장 위쪽 줄 번호 (증분 재파싱 때 클래스 재사용 여부 판단용)
+    first_line_read: int = 0
 
 
+# 정규 인덱스의 캐시 키. 정규 인덱스 스키마가 바뀌면 버전을 올린다
+CANONICAL_CACHE_KEY = "canonical-v6"
+
+# 개요(outline) 인덱스의 캐시 키. ultra 모드가 쓰는 항목만 담으므로 정규 인덱스와 따로 저장한다
+OUTLINE_CACHE_KEY = "outline-v4"
+
+# 현재 인덱서가 사용하는 캐시 키 전체 (GC는 이 외의 키를 이전 버전/옵션 조합의 잔재로 보고 삭제)
+LIVE_CACHE_KEYS = frozenset({CANONICAL_CACHE_KEY, OUTLINE_CACHE_KEY})
+
+_DEFAULT_VIEW = {
+    "includePrivate": True,
+    "includeFields": True,
+    "includeInnerClasses": True,
+    "includeConstructors": True,
+    "maxJavadocPreviewChars": 0,
+}
+
+# Javadoc이 없는 심볼이 함께 쓰는 javadoc dict (읽기 전용)
+_NO_JAVADOC = javadoc_dict((False, None, None))
+
+# 클래스 dict에서 멤버 목록을 담는 키 (symbolIndex 경로와 심볼 순회 순서)
+_MEMBER_KEYS = ("fields", "constructors", "methods", "innerClasses")
+
+# find_symbols가 캐시를 일괄 조회할 때 한 번에 묶는 파일 수
+_FIND_BATCH_SIZE = 256
+
 _JAVA_LANGUAGE = Language(tree_sitter_java.language())
-_PARSER = Parser(_JAVA_LANGUAGE)
+# tree-sitter Parser는 여러 스레드에서 동시에 쓸 수 없으므로 스레드마다 따로 둔다
+# (MCP 도구 호출을 처리하는 워커 스레드와 파일 감시기의 재인덱싱 스레드가 함께 파싱함)
+_PARSERS = threading.local()
+
+# 증분 재파싱용으로 최근 파싱한 파일의 구문 트리 보관
+_RETAINED_TREES = RetainedTrees()
+
+
+def _parser() -> Parser:
+    """현재 스레드의 tree-sitter Parser"""
+    parser = getattr(_PARSERS, "parser", None)
+    if parser is None:
+        parser = _PARSERS.parser = Parser(_JAVA_LANGUAGE)
+    return parser
 
 
 def _compute_hash(source_bytes: bytes) -> str:
     return hashlib.sha1(source_bytes).hexdigest()
 
 
-def _options_cache_key(options: dict) -> str:
-    serialized = json.dumps(options, sort_keys=True, ensure_ascii=True)
-    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+def _javadoc_for(ctx: ParseContext, node) -> dict:
+    # 정규 인덱스는 preview 없이 저장하고, 원문은 javadocText 보조 테이블에 모아 둔다
+    comment, first_row = preceding_comment(node, ctx.source_bytes)
+    ctx.first_line_read = min(ctx.first_line_read, first_row + 1)
+    if comment is None:
+        return _NO_JAVADOC
+    start_line = comment.start_point[0] + 1
+    end_line = comment.end_point[0] + 1
+    ctx.javadoc_texts[f"{start_line}:{end_line}"] = comment_text(ctx.source_bytes, comment)
+    return javadoc_dict((True, start_line, end_line))
 
 
 def _read_file_bytes(file_path: str) -> bytes:
     return Path(file_path).read_bytes()
 
 
-def _read_file_lines(source_bytes: bytes) -> list[str]:
-    text = source_bytes.decode("utf-8", errors="replace")
-    return text.splitlines()
+def _line_count(source_bytes: bytes) -> int:
+    """
+    "\n" 기준 줄 수 (마지막 줄 끝의 "\n"은 빈 줄을 만들지 않음)
+
+    tree-sitter의 행 번호(startLine/endLine)와 readers의 줄 오프셋 인덱스가 모두 "\n"만 줄바꿈으로 보므로
+    lineCount도 같은 기준으로 셉니다 ("\r", "\x0c", U+2028 등은 줄을 나누지 않음).
+    """
+    return source_bytes.count(b"\n") + (0 if not source_bytes or source_bytes.endswith(b"\n") else 1)
 
 
 def _package_name(root, source_bytes: bytes) -> str:
@@ -82,45 +141,6 @@ def _build_qualified_name(package: str, outers: list[str], name: str) -> str:
     return ".".join(parts)
 
 
-def _extract_extends(node, source_bytes: bytes, kind: str) -> Optional[str]:
-    for child in node.named_children:
-        if child.type == "superclass":
-            text = node_text(source_bytes, child)
-            text = strip_prefix_keyword(text, "extends")
-            text = normalize_whitespace(text)
-            return text or None
-    if kind == "interface":
-        for child in node.named_children:
-            if child.type == "extends_interfaces":
-                text = node_text(source_bytes, child)
-                text = strip_prefix_keyword(text, "extends")
-                text = normalize_whitespace(text)
-                if not text:
-                    return None
-                parts = split_top_level_commas(text)
-                return ", ".join(parts) if parts else None
-    return None
-
-
-def _extract_implements(node, source_bytes: bytes, kind: str) -> list[str]:
-    for child in node.named_children:
-        if child.type in ("interfaces", "implements_interfaces"):
-            text = node_text(source_bytes, child)
-            text = strip_prefix_keyword(text, "implements")
-            text = normalize_whitespace(text)
-            if not text:
-                return []
-            return split_top_level_commas(text)
-        if child.type == "super_interfaces" and kind != "interface":
-            text = node_text(source_bytes, child)
-            text = strip_prefix_keyword(text, "implements")
-            text = normalize_whitespace(text)
-            if not text:
-                return []
-            return split_top_level_commas(text)
-    return []
-
-
 def _extract_annotations_from_signature(signature_text: str) -> list[str]:
     """
     signatureText에서 어노테이션 추출
@@ -172,72 +192,156 @@ def _extract_annotations_from_signature(signature_text: str) -> list[str]:
     return annotations
 
 
-def _extract_annotations(node, source_bytes: bytes) -> list[str]:
-    """
-    AST에서 어노테이션 노드 추출
+# 시그니처를 자르는 기준이 되는 본문 노드 (이 노드 앞까지가 시그니처)
+_SIGNATURE_BODY_TYPES = frozenset({"block", "constructor_body", "method_body", "class_body", "interface_body"})
+_RETURN_TYPE_NODE_TYPES = frozenset({"type", "void_type", "integral_type", "floating_point_type", "boolean_type"})
+_PARAMETER_NODE_TYPES = frozenset({"formal_parameter", "spread_parameter", "receiver_parameter", "inferred_parameter"})
+_INTERFACE_NODE_TYPES = frozenset({"interfaces", "implements_interfaces", "super_interfaces"})
 
-    Args:
-        node: AST 노드 (클래스, 메서드, 필드 등)
-        source_bytes: 소스 코드 바이트
 
-    Returns:
-        어노테이션 문자열 리스트 (예: ["@Service", "@Transactional"])
+class _Declaration:
     """
-    annotations = []
+    선언 노드(클래스/필드/생성자/메서드)의 자식을 한 번만 훑어 모은 헤더 정보
 
-    # 모든 children과 named_children 탐색
-    for child in node.children:
-        if child.type == "marker_annotation":
-            # @Service, @Deprecated 등 (파라미터 없음)
-            name_node = child.child_by_field_name("name")
-            if name_node:
-                anno_name = "@" + node_text(source_bytes, name_node)
-                if anno_name not in annotations:
-                    annotations.append(anno_name)
-            else:
-                # name 필드가 없는 경우 전체 텍스트 사용
-                text = node_text(source_bytes, child).strip()
+    modifiers, 어노테이션, 시그니처와 이후 추출에 필요한 자식 노드를 한 번에 구합니다.
+    헤더(선언 시작 ~ 본문 시작) 바이트는 한 번만 디코딩하고, ASCII이면 자식 노드의 텍스트를
+    노드마다 다시 디코딩하지 않고 헤더 문자열에서 잘라 씁니다. 시그니처와 어노테이션 문자열은 처음 쓸 때 만듭니다.
+    """
+
+    __slots__ = (
+        "node",
+        "source_bytes",
+        "modifiers",
+        "type_parameters",
+        "return_type",
+        "formal_parameters",
+        "throws",
+        "superclass",
+        "extends_interfaces",
+        "interfaces",
+        "declarators",
+        "_header",
+        "_header_start",
+        "_header_end",
+        "_ascii",
+        "_signature",
+        "_annotation_sources",
+        "_annotations",
+    )
+
+    def __init__(self, node, source_bytes: bytes) -> None:
+        self.node = node
+        self.source_bytes = source_bytes
+        self.type_parameters = None
+        self.return_type = None
+        self.formal_parameters = None
+        self.throws = None
+        self.superclass = None
+        self.extends_interfaces = None
+        self.interfaces: list = []
+        self.declarators: list = []
+        self._signature: Optional[str] = None
+        self._annotations: Optional[list[str]] = None
+
+        modifiers_node = None
+        # 어노테이션이 나오는 노드 (선언에 직접 붙은 어노테이션, modifiers) — 원래 순서 유지
+        annotation_sources: list = []
+        body = None
+        for child in node.named_children:
+            child_type = child.type
+            if child_type == "modifiers":
+                if modifiers_node is None:
+                    modifiers_node = child
+                annotation_sources.append(child)
+            elif child_type == "marker_annotation" or child_type == "annotation":
+                annotation_sources.append(child)
+            elif child_type == "variable_declarator":
+                self.declarators.append(child)
+            elif child_type in _SIGNATURE_BODY_TYPES:
+                if body is None:
+                    body = child
+            elif child_type == "formal_parameters":
+                if self.formal_parameters is None:
+                    self.formal_parameters = child
+            elif child_type == "type_parameters":
+                if self.type_parameters is None:
+                    self.type_parameters = child
+            elif child_type == "throws":
+                if self.throws is None:
+                    self.throws = child
+            elif child_type == "superclass":
+                if self.superclass is None:
+                    self.superclass = child
+            elif child_type == "extends_interfaces":
+                if self.extends_interfaces is None:
+                    self.extends_interfaces = child
+            elif child_type in _INTERFACE_NODE_TYPES:
+                self.interfaces.append(child)
+            if child_type in _RETURN_TYPE_NODE_TYPES and self.return_type is None:
+                self.return_type = child
+
+        self._header_start = node.start_byte
+        self._header_end = body.start_byte if body is not None else node.end_byte
+        header_bytes = source_bytes[self._header_start : self._header_end]
+        self._header = header_bytes.decode("utf-8", errors="replace")
+        self._ascii = header_bytes.isascii()
+
+        modifiers: list[str] = []
+        if modifiers_node is not None:
+            for child in modifiers_node.children:
+                text = self.text(child).strip()
+                if text and not text.startswith("@"):
+                    modifiers.append(text)
+        self.modifiers = shared_strings(modifiers)
+        self._annotation_sources = annotation_sources
+
+    def slice(self, start_byte: int, end_byte: int) -> str:
+        if self._ascii and self._header_start <= start_byte and end_byte <= self._header_end:
+            return self._header[start_byte - self._header_start : end_byte - self._header_start]
+        return self.source_bytes[start_byte:end_byte].decode("utf-8", errors="replace")
+
+    def text(self, node) -> str:
+        return self.slice(node.start_byte, node.end_byte)
+
+    @property
+    def signature(self) -> str:
+        if self._signature is None:
+            self._signature = normalize_whitespace(self._header.rstrip("{;"))
+        return self._signature
+
+    @property
+    def annotations(self) -> list[str]:
+        if self._annotations is None:
+            self._annotations = self._collect_annotations(self._annotation_sources)
+        return self._annotations
+
+    def _collect_annotations(self, sources: list) -> list[str]:
+        annotations: list[str] = []
+        for source in sources:
+            items = source.children if source.type == "modifiers" else (source,)
+            for item in items:
+                if item.type == "marker_annotation":
+                    # @Service, @Deprecated 등 (파라미터 없음)
+                    name_node = item.child_by_field_name("name")
+                    text = "@" + self.text(name_node) if name_node else self.text(item).strip()
+                elif item.type == "annotation":
+                    # @RequestMapping("/api") 등: 멀티라인 어노테이션을 한 줄로
+                    text = normalize_whitespace(self.text(item).strip())
+                else:
+                    continue
                 if text and text not in annotations:
                     annotations.append(text)
-        elif child.type == "annotation":
-            # @RequestMapping("/api"), @MyAnno(value="x") 등 (파라미터 있음)
-            # 전체 어노테이션 텍스트 추출
-            full_text = node_text(source_bytes, child).strip()
-            # 멀티라인 어노테이션을 한 줄로
-            full_text = normalize_whitespace(full_text)
-            if full_text and full_text not in annotations:
-                annotations.append(full_text)
-        elif child.type == "modifiers":
-            # modifiers 노드 안에 어노테이션이 있을 수 있음
-            for mod_child in child.children:
-                if mod_child.type == "marker_annotation":
-                    name_node = mod_child.child_by_field_name("name")
-                    if name_node:
-                        anno_name = "@" + node_text(source_bytes, name_node)
-                        if anno_name not in annotations:
-                            annotations.append(anno_name)
-                    else:
-                        text = node_text(source_bytes, mod_child).strip()
-                        if text and text not in annotations:
-                            annotations.append(text)
-                elif mod_child.type == "annotation":
-                    full_text = node_text(source_bytes, mod_child).strip()
-                    full_text = normalize_whitespace(full_text)
-                    if full_text and full_text not in annotations:
-                        annotations.append(full_text)
-
-    # AST에서 추출 실패 시, signature에서 추출 시도
-    if not annotations:
-        # signature_text는 호출자가 생성하므로 여기서는 빈 리스트 반환
-        pass
+        return shared_strings(annotations)
 
-    return annotations
+    def annotations_or_from_signature(self) -> list[str]:
+        """AST에서 찾은 어노테이션, 없으면 signatureText에서 추출"""
+        return self.annotations if self.annotations else _extract_annotations_from_signature(self.signature)
 
 
-def _type_text(node, source_bytes: bytes) -> str:
+def _type_text(node, decl: _Declaration) -> str:
     if node is None:
         return ""
-    return normalize_whitespace(node_text(source_bytes, node))
+    return shared_text(normalize_whitespace(decl.text(node)))
 
 
 def _find_body_node(node):
@@ -250,64 +354,62 @@ def _find_body_node(node):
     return None
 
 
-def _signature_text(node, source_bytes: bytes) -> str:
-    body = None
-    for child in node.named_children:
-        if child.type in ("block", "constructor_body", "method_body", "class_body", "interface_body"):
-            body = child
-            break
-    if body is not None:
-        snippet = source_bytes[node.start_byte : body.start_byte]
-    else:
-        snippet = source_bytes[node.start_byte : node.end_byte]
-    text = snippet.decode("utf-8", errors="replace")
-    text = text.rstrip("{;")
-    return normalize_whitespace(text)
+def _comma_list(node, decl: _Declaration, keyword: str) -> list[str]:
+    text = normalize_whitespace(strip_prefix_keyword(decl.text(node), keyword))
+    if not text:
+        return shared_strings([])
+    return shared_strings(split_top_level_commas(text))
 
 
-def _throws_list(node, source_bytes: bytes) -> list[str]:
-    for child in node.named_children:
-        if child.type == "throws":
-            text = node_text(source_bytes, child)
-            text = strip_prefix_keyword(text, "throws")
-            text = normalize_whitespace(text)
-            if not text:
-                return []
-            return split_top_level_commas(text)
-    return []
+def _class_extends(decl: _Declaration, kind: str) -> Optional[str]:
+    if decl.superclass is not None:
+        text = normalize_whitespace(strip_prefix_keyword(decl.text(decl.superclass), "extends"))
+        return text or None
+    if kind == "interface" and decl.extends_interfaces is not None:
+        parts = _comma_list(decl.extends_interfaces, decl, "extends")
+        return ", ".join(parts) if parts else None
+    return None
+
 
+def _class_implements(decl: _Declaration, kind: str) -> list[str]:
+    for child in decl.interfaces:
+        if child.type != "super_interfaces" or kind != "interface":
+            return _comma_list(child, decl, "implements")
+    return shared_strings([])
 
-def _find_formal_parameters(node):
-    return first_named_descendant(node, "formal_parameters")
 
+def _throws_list(decl: _Declaration) -> list[str]:
+    if decl.throws is None:
+        return shared_strings([])
+    return _comma_list(decl.throws, decl, "throws")
 
-def _param_type_and_name(param_node, source_bytes: bytes) -> Optional[dict]:
+
+def _param_type_and_name(param_node, decl: _Declaration) -> Optional[dict]:
     name_node = param_node.child_by_field_name("name")
     if name_node is None:
         name_node = first_identifier(param_node)
     if name_node is None:
         return None
-    name = node_text(source_bytes, name_node)
+    name = decl.text(name_node)
     type_node = param_node.child_by_field_name("type")
-    type_text = ""
     if type_node is not None:
-        type_text = _type_text(type_node, source_bytes)
+        type_text = _type_text(type_node, decl)
     else:
-        raw = source_bytes[param_node.start_byte : name_node.start_byte].decode(
-            "utf-8", errors="replace"
-        )
-        type_text = normalize_whitespace(raw)
-    return {"name": name, "typeText": type_text}
+        type_text = shared_text(normalize_whitespace(decl.slice(param_node.start_byte, name_node.start_byte)))
+    return shared_param(name, type_text)
 
 
-def _parse_parameters(node, source_bytes: bytes) -> list[dict]:
-    params_node = _find_formal_parameters(node)
+def _parse_parameters(decl: _Declaration) -> list[dict]:
+    params_node = decl.formal_parameters
+    if params_node is None:
+        # 직접 자식이 아닌 경우 (compact 생성자 등)에는 하위 노드에서 찾는다
+        params_node = first_named_descendant(decl.node, "formal_parameters")
     if params_node is None:
         return []
     params: list[dict] = []
     for child in params_node.named_children:
-        if child.type in ("formal_parameter", "spread_parameter", "receiver_parameter", "inferred_parameter"):
-            param = _param_type_and_name(child, source_bytes)
+        if child.type in _PARAMETER_NODE_TYPES:
+            param = _param_type_and_name(child, decl)
             if param:
                 params.append(param)
     return params
@@ -326,48 +428,37 @@ def _parse_field_declaration(
     ctx: ParseContext,
     qualified_name: str,
 ) -> list[dict]:
-    options = ctx.options
-    modifiers = extract_modifiers(ctx.source_bytes, node)
-    if not options.get("includePrivate", True) and "private" in modifiers:
-        return []
+    decl = _Declaration(node, ctx.source_bytes)
 
-    type_node = node.child_by_field_name("type")
-    type_text = _type_text(type_node, ctx.source_bytes)
+    type_text = _type_text(node.child_by_field_name("type"), decl)
 
-    # AST에서 어노테이션 추출 시도
-    annotations = _extract_annotations(node, ctx.source_bytes)
+    javadoc = _javadoc_for(ctx, node)
 
-    anchor_line = modifier_anchor_line(node) or (node.start_point[0] + 1)
-    javadoc = build_javadoc_dict(ctx.lines, anchor_line, options.get("maxJavadocPreviewChars", 0))
+    # 한 선언의 변수들(int a, b;)은 modifiers/어노테이션/시그니처를 공유하므로 한 번만 구한다
+    annotations = decl.annotations_or_from_signature() if decl.declarators else []
 
     fields: list[dict] = []
-    for child in node.named_children:
-        if child.type != "variable_declarator":
-            continue
+    for child in decl.declarators:
         name_node = child.child_by_field_name("name") or first_identifier(child)
         if name_node is None:
             continue
-        name = node_text(ctx.source_bytes, name_node)
+        name = shared_text(decl.text(name_node))
         start_line = child.start_point[0] + 1
         end_line = child.end_point[0] + 1
         symbol_id = _build_symbol_id("Field", qualified_name, name, start_line, end_line)
 
-        # signatureText 생성
-        sig_text = _signature_text(node, ctx.source_bytes)
-
-        # AST에서 추출 실패 시 signatureText에서 추출
-        field_annotations = annotations if annotations else _extract_annotations_from_signature(sig_text)
-
         fields.append(
             {
                 "symbolId": symbol_id,
                 "kind": "field",
                 "name": name,
                 "typeText": type_text,
-                "modifiers": modifiers,
-                "annotations": field_annotations,
+                "modifiers": decl.modifiers,
+                "annotations": annotations,
                 "startLine": start_line,
                 "endLine": end_line,
+                "startByte": node.start_byte,
+                "endByte": node.end_byte,
                 "javadoc": javadoc,
             }
         )
@@ -375,105 +466,75 @@ def _parse_field_declaration(
 
 
 def _parse_constructor_declaration(node, ctx: ParseContext, qualified_name: str) -> Optional[dict]:
-    options = ctx.options
-    modifiers = extract_modifiers(ctx.source_bytes, node)
-    if not options.get("includePrivate", True) and "private" in modifiers:
-        return None
+    decl = _Declaration(node, ctx.source_bytes)
 
     name_node = node.child_by_field_name("name") or first_identifier(node)
-    name = node_text(ctx.source_bytes, name_node) if name_node else qualified_name.split(".")[-1]
-    params = _parse_parameters(node, ctx.source_bytes)
-    throws_list = _throws_list(node, ctx.source_bytes)
+    name = shared_text(decl.text(name_node) if name_node else qualified_name.split(".")[-1])
+    params = _parse_parameters(decl)
+    throws_list = _throws_list(decl)
 
     start_line = node.start_point[0] + 1
     end_line = node.end_point[0] + 1
     detail = f"{name}({','.join(p['typeText'] for p in params)})"
     symbol_id = _build_symbol_id("Ctor", qualified_name, detail, start_line, end_line)
 
-    anchor_line = modifier_anchor_line(node) or start_line
-    javadoc = build_javadoc_dict(ctx.lines, anchor_line, options.get("maxJavadocPreviewChars", 0))
-
-    # signatureText 생성
-    sig_text = _signature_text(node, ctx.source_bytes)
-
-    # AST에서 어노테이션 추출 시도, 실패 시 signatureText에서 추출
-    annotations = _extract_annotations(node, ctx.source_bytes)
-    if not annotations:
-        annotations = _extract_annotations_from_signature(sig_text)
+    javadoc = _javadoc_for(ctx, node)
 
     return {
         "symbolId": symbol_id,
         "kind": "constructor",
         "name": name,
-        "modifiers": modifiers,
-        "annotations": annotations,
+        "modifiers": decl.modifiers,
+        "annotations": decl.annotations_or_from_signature(),
         "params": params,
         "throws": throws_list,
         "startLine": start_line,
         "endLine": end_line,
+        "startByte": node.start_byte,
+        "endByte": node.end_byte,
         "javadoc": javadoc,
-        "signatureText": sig_text,
+        "signatureText": decl.signature,
     }
 
 
 def _parse_method_declaration(node, ctx: ParseContext, qualified_name: str) -> Optional[dict]:
-    options = ctx.options
-    modifiers = extract_modifiers(ctx.source_bytes, node)
-    if not options.get("includePrivate", True) and "private" in modifiers:
-        return None
-
     name_node = node.child_by_field_name("name") or first_identifier(node)
     if name_node is None:
         return None
-    name = node_text(ctx.source_bytes, name_node)
+    decl = _Declaration(node, ctx.source_bytes)
+    name = shared_text(decl.text(name_node))
 
-    type_params_node = first_named_child(node, ["type_parameters"])
-    type_params_text = _type_text(type_params_node, ctx.source_bytes) if type_params_node else None
+    type_params_text = _type_text(decl.type_parameters, decl) if decl.type_parameters else None
 
-    return_type_node = node.child_by_field_name("type")
-    if return_type_node is None:
-        return_type_node = first_named_child(node, [
-            "type",
-            "void_type",
-            "integral_type",
-            "floating_point_type",
-            "boolean_type",
-        ])
-    return_type = _type_text(return_type_node, ctx.source_bytes) or "void"
+    return_type_node = node.child_by_field_name("type") or decl.return_type
+    return_type = _type_text(return_type_node, decl) or "void"
 
-    params = _parse_parameters(node, ctx.source_bytes)
-    throws_list = _throws_list(node, ctx.source_bytes)
+    params = _parse_parameters(decl)
+    throws_list = _throws_list(decl)
 
     start_line = node.start_point[0] + 1
     end_line = node.end_point[0] + 1
     detail = f"{name}({','.join(p['typeText'] for p in params)}):{return_type}"
     symbol_id = _build_symbol_id("Method", qualified_name, detail, start_line, end_line)
 
-    anchor_line = modifier_anchor_line(node) or start_line
-    javadoc = build_javadoc_dict(ctx.lines, anchor_line, options.get("maxJavadocPreviewChars", 0))
-
-    # signatureText 생성
-    sig_text = _signature_text(node, ctx.source_bytes)
-
-    # AST에서 어노테이션 추출 시도, 실패 시 signatureText에서 추출
-    annotations = _extract_annotations(node, ctx.source_bytes)
-    if not annotations:
-        annotations = _extract_annotations_from_signature(sig_text)
+    javadoc = _javadoc_for(ctx, node)
 
     return {
         "symbolId": symbol_id,
         "kind": "method",
         "name": name,
         "returnTypeText": return_type,
-        "modifiers": modifiers,
-        "annotations": annotations,
+        "modifiers": decl.modifiers,
+        "annotations": decl.annotations_or_from_signature(),
         "typeParamsText": type_params_text,
         "params": params,
         "throws": throws_list,
         "startLine": start_line,
         "endLine": end_line,
+        "startByte": node.start_byte,
+        "endByte": node.end_byte,
         "javadoc": javadoc,
-        "signatureText": sig_text,
+        "signatureText": decl.signature,
     }
 
 
@@ -484,7 +545,7 @@ def _parse_class_body(body_node, ctx: ParseContext, qualified_name: str, outer_n
     inner_classes: list[dict] = []
 
     def handle_member(member) -> None:
-        if member.type == "field_declaration" and ctx.options.get("includeFields", True):
+        if member.type == "field_declaration":
             fields.extend(_parse_field_declaration(member, ctx, qualified_name))
             return
         if member.type == "method_declaration":
@@ -492,9 +553,7 @@ def _parse_class_body(body_node, ctx: ParseContext, qualified_name: str, outer_n
             if method:
                 methods.append(method)
             return
-        if member.type in ("constructor_declaration", "compact_constructor_declaration") and ctx.options.get(
-            "includeConstructors", True
-        ):
+        if member.type in ("constructor_declaration", "compact_constructor_declaration"):
             ctor = _parse_constructor_declaration(member, ctx, qualified_name)
             if ctor:
                 constructors.append(ctor)
@@ -503,7 +562,7 @@ def _parse_class_body(body_node, ctx: ParseContext, qualified_name: str, outer_n
             for nested in member.named_children:
                 handle_member(nested)
             return
-        if member.type in CLASS_NODE_KINDS and ctx.options.get("includeInnerClasses", True):
+        if member.type in CLASS_NODE_KINDS:
             class_obj = _parse_class_declaration(member, ctx, outer_names)
             if class_obj:
                 inner_classes.append(class_obj)
@@ -527,19 +586,15 @@ def _parse_class_declaration(node, ctx: ParseContext, outer_names: list[str]) ->
     name_node = node.child_by_field_name("name") or first_identifier(node)
     if name_node is None:
         return None
-    name = node_text(ctx.source_bytes, name_node)
-
-    modifiers = extract_modifiers(ctx.source_bytes, node)
-    if not ctx.options.get("includePrivate", True) and "private" in modifiers:
-        return None
+    decl = _Declaration(node, ctx.source_bytes)
+    name = shared_text(decl.text(name_node))
 
     qualified_name = _build_qualified_name(ctx.package_name, outer_names, name)
 
     start_line = node.start_point[0] + 1
     end_line = node.end_point[0] + 1
 
-    anchor_line = modifier_anchor_line(node) or start_line
-    javadoc = build_javadoc_dict(ctx.lines, anchor_line, ctx.options.get("maxJavadocPreviewChars", 0))
+    javadoc = _javadoc_for(ctx, node)
 
     body_node = _find_body_node(node)
     body_data = {
@@ -553,27 +608,21 @@ def _parse_class_declaration(node, ctx: ParseContext, outer_names: list[str]) ->
 
     symbol_id = _class_symbol_id(kind, qualified_name, start_line, end_line)
 
-    # signatureText 생성
-    sig_text = _signature_text(node, ctx.source_bytes)
-
-    # AST에서 어노테이션 추출 시도, 실패 시 signatureText에서 추출
-    annotations = _extract_annotations(node, ctx.source_bytes)
-    if not annotations:
-        annotations = _extract_annotations_from_signature(sig_text)
-
     return {
         "symbolId": symbol_id,
         "kind": kind,
         "name": name,
         "qualifiedName": qualified_name,
-        "modifiers": modifiers,
-        "annotations": annotations,
-        "extends": _extract_extends(node, ctx.source_bytes, kind),
-        "implements": _extract_implements(node, ctx.source_bytes, kind),
+        "modifiers": decl.modifiers,
+        "annotations": decl.annotations_or_from_signature(),
+        "extends": _class_extends(decl, kind),
+        "implements": _class_implements(decl, kind),
         "startLine": start_line,
         "endLine": end_line,
+        "startByte": node.start_byte,
+        "endByte": node.end_byte,
         "javadoc": javadoc,
-        "signatureText": sig_text,
+        "signatureText": decl.signature,
         "fields": body_data["fields"],
         "constructors": body_data["constructors"],
         "methods": body_data["methods"],
@@ -581,82 +630,691 @@ def _parse_class_declaration(node, ctx: ParseContext, outer_names: list[str]) ->
     }
 
 
-def _collect_errors(node) -> list[dict]:
+def _error_entry(node, source_bytes: bytes, message: str) -> dict:
+    line, byte_column = node.start_point
+    # 열 번호는 바이트가 아니라 문자 기준 (한글 등 다중 바이트 문자가 있어도 편집기 열과 맞도록)
+    line_start = node.start_byte - byte_column
+    column = len(source_bytes[line_start:node.start_byte].decode("utf-8", errors="replace"))
+    return {
+        "level": "error",
+        "message": message,
+        "line": line + 1,
+        "column": column + 1,
+    }
+
+
+def _collect_errors(root, source_bytes: bytes) -> list[dict]:
+    """
+    구문 트리의 ERROR / MISSING 노드 목록 (소스 순서)
+
+    오류 없이 파싱된 파일은 root.has_error만 보고 바로 끝냅니다. 오류가 있으면 명시적 스택으로
+    반복 순회하되 has_error가 거짓인 서브트리는 쌓지 않으므로, 깊게 중첩된 생성 코드에서도
+    재귀 한도에 걸리지 않고 오류 주변 노드만 방문합니다.
+    (TreeCursor는 형제마다 Python 호출이 한 번씩 늘어 children 목록보다 3배 이상 느렸다)
+    """
     errors: list[dict] = []
+    if not root.has_error:
+        return errors
+
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.is_missing:
+            errors.append(_error_entry(node, source_bytes, f"Missing {node.type}"))
+            continue
+        if node.type == "ERROR":
+            errors.append(_error_entry(node, source_bytes, "Parse error"))
+        # ERROR 노드 안쪽에도 ERROR/MISSING이 더 있을 수 있으므로 has_error인 자식은 모두 쌓는다.
+        # 뒤에서부터 쌓아야 소스 순서대로 꺼내진다
+        stack.extend(child for child in reversed(node.children) if child.has_error)
+    return errors
 
-    def walk(n):
-        if n.type == "ERROR":
-            errors.append(
-                {
-                    "level": "error",
-                    "message": "Parse error",
-                    "line": n.start_point[0] + 1,
-                }
+
+def _read_error_result(file_path: str, exc: Exception) -> dict:
+    return {
+        "filePath": file_path,
+        "language": "java",
+        "hash": "",
+        "lineCount": 0,
+        "classes": [],
+        "errors": [
+            {
+                "level": "error",
+                "message": f"Failed to read file: {exc}",
+                "line": None,
+            }
+        ],
+    }
+
+
+def _parse_tree(file_path: str, source_bytes: bytes):
+    """
+    source_bytes의 구문 트리와, 재사용할 수 있는 이전 추출 결과 조회 함수
+
+    같은 파일을 최근에 파싱했다면 바뀐 구간을 계산해 이전 트리에 Tree.edit()를 적용하고 그 트리를 넘겨 증분 파싱합니다.
+    구문 오류가 있으면 오류 복구 결과가 이전 트리에 따라 달라질 수 있으므로, 캐시 내용이 편집 이력과 무관하도록
+    처음부터 다시 파싱합니다 (이 경우에도 편집 구간 밖의 클래스 추출 결과는 재사용).
+    """
+    retained = _RETAINED_TREES.take(file_path)
+    if retained is None:
+        return _parser().parse(source_bytes), None
+
+    edit = compute_edit(retained.source_bytes, source_bytes)
+    if edit is None:
+        tree = retained.tree
+    else:
+        edit.apply(retained.tree)
+        tree = _parser().parse(source_bytes, retained.tree)
+        if tree.root_node.has_error:
+            tree = _parser().parse(source_bytes)
+
+    def lookup(node) -> Optional[RetainedClass]:
+        if node.has_error:
+            return None
+        entry = reusable_class(
+            retained, edit, node.type, node.start_byte, node.end_byte, node.start_point[0], node.end_point[0]
+        )
+        # 편집 구간 밖이어도 앞쪽에서 연 블록 주석이 Javadoc을 삼키는 등 바로 앞 형제 노드가 바뀔 수 있다
+        if entry is not None and preceding_comment(node, source_bytes)[1] != entry.first_row:
+            return None
+        return entry
+
+    return tree, (retained.package_name, lookup)
+
+
+def _top_level_classes(root) -> list:
+    return [child for child in root.named_children if child.type in CLASS_NODE_KINDS]
+
+
+def _shift_bytes(class_obj: dict, shift: int) -> dict:
+    """클래스와 모든 멤버의 startByte/endByte를 shift만큼 옮긴 사본 (나머지 값은 공유)"""
+
+    def moved(symbol: dict) -> dict:
+        return {**symbol, "startByte": symbol["startByte"] + shift, "endByte": symbol["endByte"] + shift}
+
+    copy = moved(class_obj)
+    for key in ("fields", "constructors", "methods"):
+        copy[key] = [moved(member) for member in class_obj[key]]
+    copy["innerClasses"] = [_shift_bytes(inner, shift) for inner in class_obj["innerClasses"]]
+    return copy
+
+
+def _index_source(file_path: str, source_bytes: bytes, content_hash: str) -> dict:
+    tree, previous = _parse_tree(file_path, source_bytes)
+    root = tree.root_node
+
+    package = _package_name(root, source_bytes)
+    ctx = ParseContext(source_bytes=source_bytes, package_name=package, javadoc_texts={})
+
+    lookup = None
+    if previous is not None and previous[0] == package:
+        lookup = previous[1]
+
+    classes: list[dict] = []
+    javadoc_texts: dict[str, str] = {}
+    retained_classes: dict[tuple[str, int, int], RetainedClass] = {}
+    for child in _top_level_classes(root):
+        entry = lookup(child) if lookup is not None else None
+        if entry is None:
+            # 클래스마다 Javadoc 원문과 읽은 줄 범위를 따로 모아 두어야 다음 편집 때 클래스 단위로 재사용할 수 있다
+            ctx.javadoc_texts = {}
+            ctx.first_line_read = child.start_point[0] + 1
+            class_obj = _parse_class_declaration(child, ctx, [])
+            if class_obj is None:
+                javadoc_texts.update(ctx.javadoc_texts)
+                continue
+            entry = RetainedClass(
+                node_type=child.type,
+                start_byte=child.start_byte,
+                end_byte=child.end_byte,
+                first_row=ctx.first_line_read - 1,
+                last_row=child.end_point[0],
+                data=class_obj,
+                javadoc_texts=ctx.javadoc_texts,
             )
-        for child in n.children:
-            walk(child)
+        else:
+            # 줄 수가 그대로인 편집이어도 앞쪽 바이트 수가 바뀌면 오프셋이 밀린다.
+            # 이전 결과 dict는 다른 캐시 항목과 공유되므로 고치지 않고 밀린 사본을 만든다
+            shift = child.start_byte - entry.start_byte
+            if shift:
+                entry.data = _shift_bytes(entry.data, shift)
+            entry.start_byte, entry.end_byte = child.start_byte, child.end_byte
+        classes.append(entry.data)
+        javadoc_texts.update(entry.javadoc_texts)
+        if not child.has_error:
+            retained_classes[(child.type, child.start_byte, child.end_byte)] = entry
+
+    errors = _collect_errors(root, source_bytes)
+    symbol_index, line_index = _build_symbol_maps(classes)
+
+    _RETAINED_TREES.put(
+        file_path,
+        RetainedTree(source_bytes=source_bytes, tree=tree, package_name=package, classes=retained_classes),
+    )
 
-    walk(node)
-    return errors
+    return {
+        "filePath": file_path,
+        "language": "java",
+        "hash": content_hash,
+        "lineCount": _line_count(source_bytes),
+        "classes": classes,
+        "errors": errors,
+        "javadocText": javadoc_texts,
+        "symbolIndex": symbol_index,
+        "lineIndex": line_index,
+    }
 
 
-def index_java_file(file_path: str, options: Optional[dict] = None, cache_store: Optional[CacheStore] = None) -> dict:
-    opts = options or {}
+def _outline_fields(node, ctx: ParseContext) -> list[dict]:
+    decl = _Declaration(node, ctx.source_bytes)
+    type_text = _type_text(node.child_by_field_name("type"), decl)
+    fields: list[dict] = []
+    for child in decl.declarators:
+        name_node = child.child_by_field_name("name") or first_identifier(child)
+        if name_node is not None:
+            fields.append(
+                {"kind": "field", "name": shared_text(decl.text(name_node)), "typeText": type_text, "modifiers": decl.modifiers}
+            )
+    return fields
+
+
+def _outline_method(node, ctx: ParseContext) -> Optional[dict]:
+    name_node = node.child_by_field_name("name") or first_identifier(node)
+    if name_node is None:
+        return None
+    decl = _Declaration(node, ctx.source_bytes)
+    start_line = node.start_point[0] + 1
+    return {
+        "kind": "method",
+        "name": shared_text(decl.text(name_node)),
+        "modifiers": decl.modifiers,
+        "params": _parse_parameters(decl),
+        "startLine": start_line,
+        "endLine": node.end_point[0] + 1,
+        "javadoc": _javadoc_for(ctx, node),
+    }
+
+
+def _outline_class(node, ctx: ParseContext) -> Optional[dict]:
+    kind = CLASS_NODE_KINDS.get(node.type)
+    name_node = node.child_by_field_name("name") or first_identifier(node)
+    if kind is None or name_node is None:
+        return None
+    decl = _Declaration(node, ctx.source_bytes)
+    name = shared_text(decl.text(name_node))
+    qualified_name = _build_qualified_name(ctx.package_name, [], name)
+    start_line = node.start_point[0] + 1
+
+    fields: list[dict] = []
+    methods: list[dict] = []
+
+    def handle_member(member) -> None:
+        if member.type == "field_declaration":
+            fields.extend(_outline_fields(member, ctx))
+        elif member.type == "method_declaration":
+            method = _outline_method(member, ctx)
+            if method:
+                methods.append(method)
+        elif member.type == "enum_body_declarations":
+            for nested in member.named_children:
+                handle_member(nested)
+
+    body_node = _find_body_node(node)
+    if body_node is not None:
+        for child in body_node.named_children:
+            handle_member(child)
+
+    return {
+        "kind": kind,
+        "name": name,
+        "qualifiedName": qualified_name,
+        "modifiers": decl.modifiers,
+        "annotations": decl.annotations_or_from_signature(),
+        "startLine": start_line,
+        "endLine": node.end_point[0] + 1,
+        "javadoc": _javadoc_for(ctx, node),
+        "fields": fields,
+        "constructors": [],
+        "methods": methods,
+        "innerClasses": [],
+    }
+
+
+def _outline_source(file_path: str, source_bytes: bytes, content_hash: str) -> dict:
+    """
+    ultra 모드용 개요 인덱스 (정규 인덱스의 부분 집합)
+
+    format_ultra_compact()가 쓰는 최상위 클래스의 이름/어노테이션/modifiers/범위, 필드 타입/이름,
+    메서드 이름/파라미터/범위만 추출합니다. 생성자와 내부 클래스는 빈 목록이고, 필드에는 범위와 Javadoc이 없으며,
+    시그니처/symbolId/반환 타입/throws와 Javadoc 원문은 만들지 않고 증분 재파싱용 트리도 보관하지 않습니다.
+    """
+    root = _parser().parse(source_bytes).root_node
+    ctx = ParseContext(
+        source_bytes=source_bytes,
+        package_name=_package_name(root, source_bytes),
+        javadoc_texts={},
+    )
+    classes: list[dict] = []
+    for child in _top_level_classes(root):
+        class_obj = _outline_class(child, ctx)
+        if class_obj is not None:
+            classes.append(class_obj)
+    return {
+        "filePath": file_path,
+        "language": "java",
+        "hash": content_hash,
+        "lineCount": _line_count(source_bytes),
+        "classes": classes,
+        "errors": _collect_errors(root, source_bytes),
+    }
+
+
+def load_outline_index(file_path: str, cache_store: Optional[CacheStore] = None) -> dict:
+    """
+    ultra 모드용 인덱스 반환
+
+    정규 인덱스가 이미 캐시에 있으면 그것을 그대로 쓰고, 없으면 개요 인덱스(_outline_source())를
+    만들어 별도 캐시 항목(OUTLINE_CACHE_KEY)에 저장합니다. 큰 파일의 첫 개요 조회에서
+    전체 추출과 큰 캐시 항목 저장을 피하기 위한 경로입니다.
+    """
     cache = cache_store or default_cache_store()
-    options_key = _options_cache_key(opts)
+    keys = (CANONICAL_CACHE_KEY, OUTLINE_CACHE_KEY)
+
+    stat = file_stat(file_path) if validation_mode() == "stat" else None
+    if stat is not None:
+        for key in keys:
+            cached = cache.load_by_stat(file_path, stat, key)
+            if cached is not None:
+                return cached
 
     try:
         source_bytes = _read_file_bytes(file_path)
     except Exception as exc:
-        return {
-            "filePath": file_path,
-            "language": "java",
-            "hash": "",
-            "lineCount": 0,
-            "classes": [],
-            "errors": [
-                {
-                    "level": "error",
-                    "message": f"Failed to read file: {exc}",
-                    "line": None,
-                }
-            ],
-        }
+        return _read_error_result(file_path, exc)
 
     content_hash = _compute_hash(source_bytes)
-    cached = cache.load(file_path, content_hash, options_key)
+    for key in keys:
+        cached = cache.load(file_path, content_hash, key)
+        if cached is not None:
+            if stat is not None:
+                cache.save(file_path, cached, key, stat)
+            return cached
+
+    result = _outline_source(file_path, source_bytes, content_hash)
+    cache.save(file_path, result, OUTLINE_CACHE_KEY, stat)
+    return result
+
+
+def load_canonical_index(file_path: str, cache_store: Optional[CacheStore] = None) -> dict:
+    """
+    옵션과 무관한 정규 인덱스 반환 (콘텐츠당 파싱 1회, 캐시 항목 1개)
+
+    모든 심볼(private, 필드, 생성자, 내부 클래스)을 포함하고 Javadoc preview는 비어 있으며,
+    Javadoc 원문은 "javadocText" ({"시작 줄:끝 줄": 원문}) 보조 테이블에 들어 있습니다.
+    클라이언트에 돌려줄 때는 index_java_file()처럼 apply_view()로 옵션을 적용해야 합니다.
+    """
+    cache = cache_store or default_cache_store()
+
+    # stat은 파일을 읽기 전에 구해야 읽는 도중 수정된 경우에도 다음 조회에서 불일치로 잡힌다
+    stat = file_stat(file_path) if validation_mode() == "stat" else None
+    if stat is not None:
+        cached = cache.load_by_stat(file_path, stat, CANONICAL_CACHE_KEY)
+        if cached is not None:
+            return cached
+
+    return _load_by_content(file_path, stat, cache)
+
+
+def _load_by_content(file_path: str, stat: Optional[tuple], cache: CacheStore) -> dict:
+    """stat 조회가 실패한 뒤의 경로: 원본을 읽어 해시로 캐시를 조회하고, 없으면 파싱해서 저장"""
+    try:
+        source_bytes = _read_file_bytes(file_path)
+    except Exception as exc:
+        return _read_error_result(file_path, exc)
+
+    content_hash = _compute_hash(source_bytes)
+    cached = cache.load(file_path, content_hash, CANONICAL_CACHE_KEY)
     if cached is not None:
+        if stat is not None:
+            # 내용은 같고 stat만 바뀐 경우 (touch, checkout 등): 다음 조회부터 stat으로 통과하도록 갱신
+            cache.save(file_path, cached, CANONICAL_CACHE_KEY, stat)
         return cached
 
-    tree = _PARSER.parse(source_bytes)
-    root = tree.root_node
+    result = _index_source(file_path, source_bytes, content_hash)
+    cache.save(file_path, result, CANONICAL_CACHE_KEY, stat)
+    return result
 
-    lines = _read_file_lines(source_bytes)
-    package = _package_name(root, source_bytes)
-    ctx = ParseContext(source_bytes=source_bytes, lines=lines, package_name=package, options=opts)
 
-    classes: list[dict] = []
-    for child in root.named_children:
-        if child.type in CLASS_NODE_KINDS:
-            class_obj = _parse_class_declaration(child, ctx, [])
-            if class_obj:
-                classes.append(class_obj)
+def _view_symbol(symbol: dict, javadoc_texts: dict, preview_chars: int) -> dict:
+    javadoc = symbol.get("javadoc") or {}
+    if preview_chars <= 0 or not javadoc.get("present"):
+        return symbol
+    viewed = dict(symbol)
+    viewed["javadoc"] = dict(javadoc)
+    text = javadoc_texts.get(f"{javadoc['startLine']}:{javadoc['endLine']}", "")
+    viewed["javadoc"]["preview"] = text[:preview_chars]
+    return viewed
 
-    errors = _collect_errors(root)
 
-    result = {
-        "filePath": file_path,
-        "language": "java",
-        "hash": content_hash,
-        "lineCount": len(lines),
+def _view_class(cls: dict, view: dict, javadoc_texts: dict) -> Optional[dict]:
+    include_private = view["includePrivate"]
+    preview_chars = view["maxJavadocPreviewChars"]
+    if not include_private and "private" in cls["modifiers"]:
+        return None
+
+    def members(key: str, enabled: bool) -> list[dict]:
+        if not enabled:
+            return []
+        return [
+            _view_symbol(member, javadoc_texts, preview_chars)
+            for member in cls[key]
+            if include_private or "private" not in member["modifiers"]
+        ]
+
+    viewed = _view_symbol(cls, javadoc_texts, preview_chars)
+    if viewed is cls:
+        viewed = dict(cls)
+    viewed["fields"] = members("fields", view["includeFields"])
+    viewed["constructors"] = members("constructors", view["includeConstructors"])
+    viewed["methods"] = members("methods", True)
+    inner_classes: list[dict] = []
+    if view["includeInnerClasses"]:
+        for inner in cls["innerClasses"]:
+            inner_view = _view_class(inner, view, javadoc_texts)
+            if inner_view is not None:
+                inner_classes.append(inner_view)
+    viewed["innerClasses"] = inner_classes
+    return viewed
+
+
+def apply_view(canonical: dict, options: dict) -> dict:
+    """
+    정규 인덱스에 인덱싱 옵션(includePrivate/includeFields/includeInnerClasses/
+    includeConstructors/maxJavadocPreviewChars)을 적용한 결과 반환
+
+    기본 옵션이면 클래스 트리를 복사하지 않고 그대로 공유합니다.
+    """
+    view = {
+        "includePrivate": options.get("includePrivate", True),
+        "includeFields": options.get("includeFields", True),
+        "includeInnerClasses": options.get("includeInnerClasses", True),
+        "includeConstructors": options.get("includeConstructors", True),
+        "maxJavadocPreviewChars": int(options.get("maxJavadocPreviewChars", 0) or 0),
+    }
+    classes = canonical["classes"]
+    if view != _DEFAULT_VIEW:
+        javadoc_texts = canonical.get("javadocText") or {}
+        classes = []
+        for cls in canonical["classes"]:
+            class_view = _view_class(cls, view, javadoc_texts)
+            if class_view is not None:
+                classes.append(class_view)
+    return {
+        "filePath": canonical["filePath"],
+        "language": canonical["language"],
+        "hash": canonical["hash"],
+        "lineCount": canonical["lineCount"],
         "classes": classes,
-        "errors": errors,
+        "errors": canonical["errors"],
     }
 
-    cache.save(file_path, result, options_key)
+
+def index_java_file(file_path: str, options: Optional[dict] = None, cache_store: Optional[CacheStore] = None) -> dict:
+    return apply_view(load_canonical_index(file_path, cache_store), options or {})
+
+
+def index_java_outline(
+    file_path: str, options: Optional[dict] = None, cache_store: Optional[CacheStore] = None
+) -> dict:
+    """index_java_file()의 ultra 모드용 버전 (format_ultra_compact()가 쓰는 항목만 보장)"""
+    return apply_view(load_outline_index(file_path, cache_store), options or {})
+
+
+def _load_chunk(items: list[tuple[str, Optional[tuple]]]) -> list[dict]:
+    # 워커 프로세스에서 실행: 워커마다 자기 tree-sitter Parser(_parser())와 디스크 캐시를 사용
+    store = parallel.worker_store()
+    return [_load_by_content(file_path, stat, store) for file_path, stat in items]
+
+
+def _iter_parallel(
+    file_paths: list[str],
+    stats: dict[str, tuple],
+    cache: CacheStore,
+    workers: int,
+) -> Iterator[dict]:
+    # 워커는 디스크 캐시에 직접 저장하므로, 현재 프로세스는 메모리 캐시에만 결과를 올린다
+    disk = getattr(cache, "backend", cache)
+    items = [(file_path, stats.get(file_path)) for file_path in file_paths]
+
+    def fallback(chunk):
+        return [_load_by_content(file_path, stat, disk) for file_path, stat in chunk]
+
+    for (file_path, stat), data in zip(items, parallel.map_chunks(_load_chunk, items, workers, disk, fallback)):
+        cache.remember(file_path, data, CANONICAL_CACHE_KEY, stat)
+        yield data
+
+
+def _iter_canonical(
+    file_paths: list[str],
+    cache: CacheStore,
+    workers: int = 1,
+) -> Iterator[tuple[str, dict]]:
+    stats: dict[str, tuple] = {}
+    if validation_mode() == "stat":
+        for file_path in file_paths:
+            stat = file_stat(file_path)
+            if stat is not None:
+                stats[file_path] = stat
+    cached = cache.load_many_by_stat(stats, CANONICAL_CACHE_KEY) if stats else {}
+
+    misses = [file_path for file_path in file_paths if file_path not in cached]
+    if workers > 1 and len(misses) >= parallel.PARALLEL_MIN_ITEMS:
+        # 콜드 스캔: 읽기/해시/파싱/저장을 워커 프로세스에 나눠 맡기고 입력 순서대로 합친다
+        resolved = _iter_parallel(misses, stats, cache, workers)
+        for file_path in file_paths:
+            data = cached.get(file_path)
+            yield file_path, data if data is not None else next(resolved)
+        return
+
+    sources: dict[str, tuple[bytes, str]] = {}
+    failures: dict[str, dict] = {}
+    for file_path in misses:
+        try:
+            source_bytes = _read_file_bytes(file_path)
+        except Exception as exc:
+            failures[file_path] = _read_error_result(file_path, exc)
+            continue
+        sources[file_path] = (source_bytes, _compute_hash(source_bytes))
+
+    if sources:
+        by_hash = cache.load_many({path: item[1] for path, item in sources.items()}, CANONICAL_CACHE_KEY)
+        for file_path, data in by_hash.items():
+            if file_path in stats:
+                cache.save(file_path, data, CANONICAL_CACHE_KEY, stats[file_path])
+        cached.update(by_hash)
+
+    for file_path in file_paths:
+        if file_path in failures:
+            yield file_path, failures[file_path]
+            continue
+        data = cached.get(file_path)
+        if data is None:
+            # 캐시 미스는 소비자가 실제로 요청할 때만 파싱 (조기 종료 시 불필요한 파싱 방지)
+            source_bytes, content_hash = sources[file_path]
+            data = _index_source(file_path, source_bytes, content_hash)
+            cache.save(file_path, data, CANONICAL_CACHE_KEY, stats.get(file_path))
+            cached[file_path] = data
+        yield file_path, data
+
+
+def index_java_files(
+    file_paths: list[str],
+    options: Optional[dict] = None,
+    cache_store: Optional[CacheStore] = None,
+    workers: Optional[int] = 1,
+) -> list[dict]:
+    """
+    여러 Java 파일을 인덱싱 (입력 순서대로 결과 반환)
+
+    stat 검증 모드에서는 먼저 stat만으로 캐시를 일괄 조회(load_many_by_stat)하고,
+    stat이 바뀐 파일만 읽어서 해시로 다시 조회(load_many)한 뒤 캐시 미스인 파일만 파싱합니다.
+    workers가 2 이상이고 캐시 미스가 충분히 많으면 미스 파일을 워커 프로세스에서 병렬로 파싱합니다
+    (None이면 MCP_JAVA_INDEX_WORKERS 또는 CPU 코어 수).
+    """
+    cache = cache_store or default_cache_store()
+    opts = options or {}
+    worker_count = parallel.resolve_workers(workers)
+    return [apply_view(data, opts) for _, data in _iter_canonical(file_paths, cache, worker_count)]
+
+
+def iter_java_files(root_dir: str, options: Optional[dict] = None) -> Iterator[str]:
+    """
+    루트 디렉토리 아래의 .java 파일 경로 (parser/discovery.py)
+
+    빌드 출력/VCS 디렉토리, .gitignore, options의 include/exclude/useGitignore에 맞는 디렉토리는 내려가지 않습니다.
+    """
+    return discovery.iter_java_files(root_dir, discovery.discovery_rules(options))
+
+
+class DirectorySummary:
+    """index_directory 결과의 파일/클래스/오류 집계 (스트리밍 출력의 마지막 줄에도 사용)"""
+
+    def __init__(self, root_dir: str, workers: int) -> None:
+        self.root_dir = root_dir
+        self.workers = workers
+        self.file_count = 0
+        self.class_count = 0
+        self.error_files: list[str] = []
+
+    def add(self, file_path: str, data: dict) -> None:
+        self.file_count += 1
+        self.class_count += len(data.get("classes", []))
+        if data.get("errors"):
+            self.error_files.append(file_path)
+
+    def result(self, elapsed_seconds: float) -> dict:
+        return {
+            "rootDir": self.root_dir,
+            "fileCount": self.file_count,
+            "classCount": self.class_count,
+            "errorFileCount": len(self.error_files),
+            "errorFiles": self.error_files,
+            "workers": self.workers,
+            "elapsedMs": round(elapsed_seconds * 1000, 1),
+        }
+
+
+def iter_index_directory(
+    root_dir: str,
+    cache_store: Optional[CacheStore] = None,
+    workers: Optional[int] = None,
+    options: Optional[dict] = None,
+) -> Iterator[tuple[str, dict]]:
+    """
+    디렉토리 아래의 Java 파일을 경로 순으로 인덱싱하면서 (경로, 정규 인덱스)를 하나씩 내보내는 생성기
+
+    캐시 조회와 파싱을 묶음 단위로 하므로 첫 파일의 결과는 트리 크기와 관계없이 바로 나옵니다.
+    탐색 범위는 options의 include/exclude/useGitignore를 따릅니다 (iter_java_files).
+    """
+    cache = cache_store or default_cache_store()
+    worker_count = parallel.resolve_workers(workers)
+    yield from _iter_canonical_batched(sorted(iter_java_files(root_dir, options)), cache, worker_count)
+
+
+def index_directory(
+    root_dir: str,
+    options: Optional[dict] = None,
+    cache_store: Optional[CacheStore] = None,
+    workers: Optional[int] = None,
+    include_files: bool = False,
+) -> dict:
+    """
+    디렉토리 아래의 모든 Java 파일을 인덱싱 (캐시 예열용 일괄 API)
+
+    파일은 경로 순으로 정렬해서 처리하므로 워커 수와 관계없이 결과 순서가 같습니다.
+    파일별 결과를 처리되는 대로 받으려면 iter_index_directory()를 사용합니다.
+
+    Args:
+        root_dir: 루트 디렉토리
+        options: 인덱싱 옵션 (include_files일 때 결과에 적용)과 탐색 옵션 (include/exclude/useGitignore)
+        cache_store: 캐시 저장소
+        workers: 워커 프로세스 수 (None이면 MCP_JAVA_INDEX_WORKERS 또는 CPU 코어 수)
+        include_files: True면 파일별 인덱싱 결과를 "files"에 포함
+
+    Returns:
+        파일/클래스 수, 파싱 오류가 있는 파일 수, 사용한 워커 수, 소요 시간
+    """
+    started = time.perf_counter()
+    worker_count = parallel.resolve_workers(workers)
+
+    summary = DirectorySummary(root_dir, worker_count)
+    files: list[dict] = []
+    for file_path, data in iter_index_directory(root_dir, cache_store, worker_count, options):
+        summary.add(file_path, data)
+        if include_files:
+            files.append(apply_view(data, options or {}))
+
+    result = summary.result(time.perf_counter() - started)
+    if include_files:
+        result["files"] = files
     return result
 
 
+def _build_symbol_maps(classes: list[dict]) -> tuple[dict[str, list], list[list]]:
+    """
+    정규 인덱스에 함께 저장하는 조회용 보조 테이블
+
+    - symbolIndex: symbolId → 클래스 트리 안의 경로 ([최상위 클래스 번호, 멤버 키, 번호, ...]).
+      같은 symbolId가 여러 번 나오면 _walk_symbols() 순서상 첫 심볼을 가리킨다
+    - lineIndex: [시작 줄, 끝 줄, 바깥 심볼의 lineIndex 위치(-1이면 없음), symbolId]를
+      (시작 줄, -끝 줄) 순으로 정렬한 목록. 줄 번호로 심볼을 찾을 때 bisect로 쓴다
+    """
+    symbol_index: dict[str, list] = {}
+    spans: list[tuple[int, int, int, str]] = []
+
+    def add(symbol: dict, path: list) -> None:
+        symbol_id = symbol.get("symbolId")
+        if symbol_id is None:
+            return
+        if symbol_id not in symbol_index:
+            symbol_index[symbol_id] = shared_path(path)
+        spans.append((symbol["startLine"], -symbol["endLine"], len(spans), symbol_id))
+
+    def walk_class(cls: dict, path: list) -> None:
+        add(cls, path)
+        for key in _MEMBER_KEYS:
+            for idx, member in enumerate(cls.get(key, [])):
+                if key == "innerClasses":
+                    walk_class(member, path + [key, idx])
+                else:
+                    add(member, path + [key, idx])
+
+    for idx, cls in enumerate(classes):
+        walk_class(cls, [idx])
+
+    # 정렬된 구간을 스택으로 훑어 각 구간을 감싸는 가장 안쪽 구간을 찾는다
+    spans.sort()
+    line_index: list[list] = []
+    stack: list[int] = []
+    for start, neg_end, _, symbol_id in spans:
+        end = -neg_end
+        while stack and line_index[stack[-1]][1] < end:
+            stack.pop()
+        line_index.append([start, end, stack[-1] if stack else -1, symbol_id])
+        stack.append(len(line_index) - 1)
+    return symbol_index, line_index
+
+
+def _resolve_symbol_path(index_data: dict, path: list) -> Optional[dict]:
+    try:
+        node = index_data["classes"][path[0]]
+        for pos in range(1, len(path), 2):
+            node = node[path[pos]][path[pos + 1]]
+    except (IndexError, KeyError, TypeError):
+        return None
+    return node
+
+
 def _walk_symbols(index_data: dict) -> list[dict]:
     return [item["symbol"] for item in _walk_symbols_with_class(index_data)]
 
@@ -683,12 +1341,41 @@ def _walk_symbols_with_class(index_data: dict) -> list[dict]:
 
 
 def find_symbol_by_id(index_data: dict, symbol_id: str) -> Optional[dict]:
+    """
+    symbolId로 심볼 찾기
+
+    정규 인덱스(load_canonical_index())면 symbolIndex로 바로 찾고, 보조 테이블이 없는 인덱스
+    (옵션이 적용된 결과 등)는 트리를 순회합니다.
+    """
+    symbol_index = index_data.get("symbolIndex")
+    if symbol_index is not None:
+        path = symbol_index.get(symbol_id)
+        if path is None:
+            return None
+        symbol = _resolve_symbol_path(index_data, path)
+        if symbol is not None and symbol.get("symbolId") == symbol_id:
+            return symbol
     for symbol in _walk_symbols(index_data):
         if symbol.get("symbolId") == symbol_id:
             return symbol
     return None
 
 
+def find_symbol_at_line(index_data: dict, line: int) -> Optional[dict]:
+    """line(1부터)을 포함하는 가장 안쪽 심볼 (정규 인덱스의 lineIndex 사용, 없으면 None)"""
+    line_index = index_data.get("lineIndex")
+    if not line_index:
+        return None
+    # 시작 줄이 line 이하인 마지막 구간부터 바깥 구간으로 올라가며 line을 포함하는 것을 찾는다
+    pos = bisect.bisect_right(line_index, line, key=itemgetter(0)) - 1
+    while pos >= 0:
+        start, end, parent, symbol_id = line_index[pos]
+        if start <= line <= end:
+            return find_symbol_by_id(index_data, symbol_id)
+        pos = parent
+    return None
+
+
 def find_symbols_in_file(index_data: dict, query: str, options: dict) -> list[dict]:
     match_kind = options.get("matchKind", "any")
     case_sensitive = options.get("caseSensitive", False)
@@ -716,49 +1403,159 @@ def find_symbols_in_file(index_data: dict, query: str, options: dict) -> list[di
     return results
 
 
-def find_symbols(root_dir: str, query: str, options: Optional[dict] = None) -> dict:
+def _iter_canonical_batched(file_paths: list[str], cache: CacheStore, workers: int) -> Iterator[tuple[str, dict]]:
+    # 대규모 루트에서 정규 인덱스를 한꺼번에 메모리에 올리지 않도록 배치 단위로 로드
+    batch_size = max(_FIND_BATCH_SIZE, workers * 64) if workers > 1 else _FIND_BATCH_SIZE
+    for start in range(0, len(file_paths), batch_size):
+        yield from _iter_canonical(file_paths[start : start + batch_size], cache, workers)
+
+
+def refresh_symbol_table(
+    root_dir: str,
+    cache_store: Optional[CacheStore] = None,
+    workers: Optional[int] = None,
+    max_age: float = 0.0,
+    should_stop: Optional[Callable[[], bool]] = None,
+    options: Optional[dict] = None,
+) -> int:
+    """
+    루트의 심볼 테이블을 추가/변경/삭제된 파일만 다시 로드해 갱신하고 바뀐 파일 수 반환
+
+    순위 검색이 검색 전에 호출하며, 파일 감시기가 검색 요청 전에 캐시와 테이블을 미리 데울 때도 사용합니다.
+    심볼 테이블은 탐색 규칙(options의 include/exclude/useGitignore)별로 따로 둡니다.
+    """
+    cache = cache_store or default_cache_store()
+    workers = parallel.resolve_workers(workers)
+    rules = discovery.discovery_rules(options)
+    table = symbol_table_for(root_dir, cache, rules.key())
+    return table.refresh(
+        discovery.iter_java_files(root_dir, rules),
+        lambda paths: _iter_canonical_batched(paths, cache, workers),
+        max_age=max_age,
+        should_stop=should_stop,
+    )
+
+
+def update_symbol_table_paths(
+    root_dir: str,
+    changed_paths: Iterable[str],
+    cache_store: Optional[CacheStore] = None,
+    workers: Optional[int] = None,
+    options: Optional[dict] = None,
+) -> int:
+    """
+    바뀐 경로(파일 또는 디렉토리)만 루트의 심볼 테이블에 반영하고 바뀐 파일 수 반환
+
+    파일 감시기가 배치마다 호출합니다. 루트 전체를 훑지 않고 경로가 가리키는 파일과 디렉토리 아래만
+    탐색 규칙(parser/discovery.py)으로 확인합니다. 경로에 루트 자신이 있으면 refresh_symbol_table()로 전체를 갱신합니다.
+    """
+    cache = cache_store or default_cache_store()
+    workers = parallel.resolve_workers(workers)
+    rules = discovery.discovery_rules(options)
+    base = str(Path(root_dir))
+    absolute_root = os.path.abspath(root_dir)
+    present: list[str] = []
+    removed: list[str] = []
+    for changed in changed_paths:
+        relative = os.path.relpath(os.path.abspath(changed), absolute_root)
+        if relative == os.curdir:
+            return refresh_symbol_table(root_dir, cache, workers, options=options)
+        if relative.split(os.sep, 1)[0] == os.pardir:
+            continue
+        # 테이블의 경로는 iter_java_files(root_dir)와 같은 표기 (root_dir 기준)
+        path = os.path.join(base, relative)
+        if os.path.isdir(path):
+            for _, files in discovery.iter_directories(root_dir, rules, start=path):
+                present.extend(files)
+            removed.append(path)
+        elif discovery.is_java_file_included(root_dir, path, rules):
+            present.append(path)
+        else:
+            removed.append(path)
+    table = symbol_table_for(root_dir, cache, rules.key())
+    return table.update_paths(present, removed, lambda paths: _iter_canonical_batched(paths, cache, workers))
+
+
+def iter_find_symbols(
+    root_dir: str,
+    query: str,
+    options: Optional[dict] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[dict]:
+    """
+    루트 디렉토리 아래에서 이름에 query가 포함된 심볼을 찾는 대로 하나씩 내보내는 생성기
+
+    루트별 영속 심볼 테이블(parser/symbol_table.py)을 파일 탐색 순서대로 갱신하면서 매치를 바로 내보내므로
+    첫 결과까지의 시간이 트리 크기와 관계없고, maxResults개를 내보내거나 소비자가 멈추면(close)
+    남은 파일은 읽지도 파싱하지도 않습니다. should_stop()이 참이 되면 (예: 클라이언트 취소) 다음 파일에서 멈춥니다.
+    갱신 주기(MCP_JAVA_INDEX_SYMBOL_REFRESH_SEC) 안의 검색은 파일을 다시 훑지 않고 테이블로 바로 답합니다.
+    rank 옵션은 전체 후보의 점수를 비교해야 하므로 테이블을 끝까지 갱신한 뒤 상위 maxResults개를 내보냅니다.
+    include/exclude/useGitignore 옵션으로 탐색 범위를 정합니다 (parser/discovery.py).
+    옵션과 결과 항목은 find_symbols()와 같습니다.
+    """
     opts = options or {}
     cache = default_cache_store()
     max_results = int(opts.get("maxResults", 50))
+    if max_results <= 0:
+        return
+    workers = parallel.resolve_workers(opts.get("workers"))
     index_options = {
         "includePrivate": opts.get("includePrivate", True),
         "includeFields": opts.get("includeFields", True),
         "includeInnerClasses": opts.get("includeInnerClasses", True),
         "includeConstructors": opts.get("includeConstructors", True),
-        "maxJavadocPreviewChars": opts.get("maxJavadocPreviewChars", 0),
-        "stableIds": opts.get("stableIds", True),
     }
+    search_options = {
+        "match_kind": opts.get("matchKind", "any"),
+        "case_sensitive": opts.get("caseSensitive", False),
+        "excluded": excluded_flags(index_options),
+    }
+    rules = discovery.discovery_rules(opts)
+    table = symbol_table_for(root_dir, cache, rules.key())
 
-    root = Path(root_dir)
-    results: list[dict] = []
-    for path in root.rglob("*.java"):
-        if len(results) >= max_results:
-            break
-        index_data = index_java_file(str(path), index_options, cache)
-        matches = find_symbols_in_file(index_data, query, opts)
-        for match in matches:
-            symbol = match["symbol"]
-            class_name = match.get("classQualifiedName")
-            if symbol.get("kind") == "class":
-                qualified = symbol.get("qualifiedName")
-            elif class_name and symbol.get("name"):
-                qualified = f"{class_name}#{symbol.get('name')}"
-            else:
-                qualified = symbol.get("qualifiedName") or symbol.get("name")
-            results.append(
-                {
-                    "filePath": index_data.get("filePath", str(path)),
-                    "symbolId": symbol.get("symbolId"),
-                    "kind": symbol.get("kind"),
-                    "qualifiedName": qualified or "",
-                    "startLine": symbol.get("startLine"),
-                    "endLine": symbol.get("endLine"),
-                    "signatureText": symbol.get("signatureText"),
-                }
-            )
-            if len(results) >= max_results:
-                break
+    if opts.get("rank"):
+        refresh_symbol_table(
+            root_dir, cache, workers, max_age=refresh_interval_seconds(), should_stop=should_stop, options=opts
+        )
+        if should_stop is not None and should_stop():
+            return
+        yield from table.search_ranked(query, max_results=max_results, **search_options)
+        return
+
+    # 스트리밍 검색은 파일을 작은 묶음부터 로드하므로 _iter_canonical_batched로 다시 나누지 않는다
+    matches = table.iter_search(
+        discovery.iter_java_files(root_dir, rules),
+        lambda paths: _iter_canonical(paths, cache, workers),
+        query,
+        include_qualified=bool(opts.get("matchQualifiedName", False)),
+        max_age=refresh_interval_seconds(),
+        should_stop=should_stop,
+        **search_options,
+    )
+    with closing(matches):
+        for count, result in enumerate(matches, 1):
+            yield result
+            if count >= max_results:
+                return
+
+
+def find_symbols(
+    root_dir: str,
+    query: str,
+    options: Optional[dict] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> dict:
+    """
+    루트 디렉토리 아래에서 이름에 query가 포함된 심볼 검색
 
+    iter_find_symbols()의 결과를 최대 maxResults개 모아서 반환합니다. 따뜻한 테이블에서는 파일 인덱스를 다시 로드하지 않습니다.
+    matchQualifiedName 옵션을 켜면 이름 외에 qualifiedName("패키지.클래스#멤버")도 검색합니다.
+    rank 옵션을 켜면 포함 여부 대신 exact > prefix > camelCase > substring > fuzzy 순위로 상위 maxResults개를
+    반환하고, 각 결과에 "match" (매치 등급)를 추가합니다. 이때 matchQualifiedName은 사용하지 않습니다.
+    should_stop()이 참이 되면 그때까지 찾은 결과만 반환합니다.
+    """
+    with closing(iter_find_symbols(root_dir, query, options, should_stop)) as matches:
+        results = list(matches)
     return {
         "rootDir": root_dir,
         "query": query,
@@ -3,43 +3,42 @@ from __future__ import annotations
 from typing import Optional
 
 
-def find_javadoc(lines: list[str], anchor_line: int) -> tuple[bool, Optional[int], Optional[int]]:
-    if anchor_line <= 1:
-        return False, None, None
-    idx = anchor_line - 2
-
-    while idx >= 0 and lines[idx].strip() == "":
-        idx -= 1
-    if idx < 0:
-        return False, None, None
-
-    line = lines[idx]
-    if "*/" not in line:
-        return False, None, None
-
-    end_line = idx + 1
-    start_line: Optional[int] = None
-    j = idx
-    while j >= 0:
-        if "/**" in lines[j]:
-            start_line = j + 1
-            break
-        if "/*" in lines[j] and "/**" not in lines[j]:
-            return False, None, None
-        j -= 1
-
-    if start_line is None:
-        return False, None, None
-
-    return True, start_line, end_line
-
-
-def build_javadoc_dict(
-    lines: list[str],
-    anchor_line: int,
-    max_preview_chars: int,
-) -> dict:
-    present, start_line, end_line = find_javadoc(lines, anchor_line)
+def preceding_comment(node, source_bytes: bytes) -> tuple[Optional[object], int]:
+    """
+    선언 노드 바로 앞의 Javadoc 주석 노드와, 판단에 쓴 가장 위쪽 행 번호(0부터)
+
+    tree-sitter는 주석을 선언과 같은 부모의 형제 노드로 두므로, 선언 앞에 공백만 두고 붙은
+    `/**` 블록 주석이 Javadoc입니다. 주석이 선언과 같은 행에서 끝나면 Javadoc으로 보지 않습니다.
+    앞에 노드가 없으면(파일 첫 선언) 행 0까지 읽은 것으로 봅니다.
+    """
+    prev = node.prev_sibling
+    if prev is None:
+        return None, 0
+    if prev.type != "block_comment":
+        return None, prev.end_point[0]
+    start_row = prev.start_point[0]
+    if prev.end_point[0] >= node.start_point[0] or source_bytes[prev.start_byte : prev.start_byte + 3] != b"/**":
+        return None, start_row
+    return prev, start_row
+
+
+def comment_text(source_bytes: bytes, comment) -> str:
+    """주석이 걸친 행 전체 텍스트 (줄바꿈은 "\n"으로 통일)"""
+    start = source_bytes.rfind(b"\n", 0, comment.start_byte) + 1
+    end = source_bytes.find(b"\n", comment.end_byte)
+    if end < 0:
+        end = len(source_bytes)
+    return "\n".join(source_bytes[start:end].decode("utf-8", errors="replace").splitlines())
+
+
+def javadoc_dict(found: tuple[bool, Optional[int], Optional[int]]) -> dict:
+    """
+    (있는지, 시작 줄, 끝 줄)로 Javadoc 메타데이터 dict 생성
+
+    preview는 항상 None입니다. 정규 인덱스는 원문을 javadocText 보조 테이블에 두고,
+    요청된 길이의 preview는 뷰를 적용할 때(indexer.apply_view) 그 원문에서 채웁니다.
+    """
+    present, start_line, end_line = found
     if not present:
         return {
             "present": False,
@@ -51,15 +50,10 @@ def build_javadoc_dict(
 
     assert start_line is not None
     assert end_line is not None
-    line_count = end_line - start_line + 1
-    preview = None
-    if max_preview_chars and max_preview_chars > 0:
-        raw = "\n".join(lines[start_line - 1 : end_line])
-        preview = raw[:max_preview_chars]
     return {
         "present": True,
         "startLine": start_line,
         "endLine": end_line,
-        "lineCount": line_count,
-        "preview": preview,
+        "lineCount": end_line - start_line + 1,
+        "preview": None,
     }
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterator, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+# 캐시 미스가 이보다 적으면 프로세스 간 전송 비용이 더 크므로 현재 프로세스에서 파싱
+PARALLEL_MIN_ITEMS = 32
+
+# 워커에 한 번에 넘기는 최대 파일 수. 작을수록 부하가 고르게 나뉘고 클수록 전송 횟수가 준다
+_MAX_CHUNK_SIZE = 16
+
+_POOL_LOCK = threading.Lock()
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_KEY: Optional[tuple] = None
+
+# 워커 프로세스 전역 상태 (initializer가 설정)
+_WORKER_STORE = None
+
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """
+    병렬 인덱싱 워커 수
+
+    인자 > MCP_JAVA_INDEX_WORKERS 환경 변수 > CPU 코어 수 순서로 정하며, 0 이하는 CPU 코어 수입니다.
+    1이면 현재 프로세스에서 순차 처리합니다.
+    """
+    if workers is None:
+        raw = os.environ.get("MCP_JAVA_INDEX_WORKERS", "").strip()
+        try:
+            workers = int(raw) if raw else 0
+        except ValueError:
+            workers = 0
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, workers)
+
+
+def _init_worker(store) -> None:
+    global _WORKER_STORE
+    _WORKER_STORE = store
+
+
+def worker_store():
+    """워커 프로세스에서 사용할 디스크 캐시 (initializer로 전달됨)"""
+    return _WORKER_STORE
+
+
+def _store_key(store) -> tuple:
+    serializer = getattr(store, "serializer", None)
+    return (type(store).__name__, str(store.cache_dir), getattr(serializer, "name", None))
+
+
+def _get_pool(workers: int, store) -> ProcessPoolExecutor:
+    # 워커 시작 비용(인터프리터 + tree-sitter 로드)을 한 번만 내도록 같은 설정이면 풀을 재사용
+    global _POOL, _POOL_KEY
+    key = (workers, _store_key(store))
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL_KEY == key:
+            return _POOL
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+        # fork는 스레드(백그라운드 GC 등)를 가진 서버 프로세스에서 안전하지 않으므로 spawn 사용
+        _POOL = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(store,),
+        )
+        _POOL_KEY = key
+        return _POOL
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _POOL, _POOL_KEY
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+            _POOL_KEY = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool() -> None:
+    """재사용 중인 워커 풀 종료"""
+    global _POOL, _POOL_KEY
+    with _POOL_LOCK:
+        pool, _POOL, _POOL_KEY = _POOL, None, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _chunked(items: Sequence[T], size: int) -> list[Sequence[T]]:
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def map_chunks(
+    chunk_fn: Callable[[Sequence[T]], list[R]],
+    items: Sequence[T],
+    workers: int,
+    store,
+    fallback: Callable[[Sequence[T]], list[R]],
+) -> Iterator[R]:
+    """
+    items를 청크로 나눠 워커 프로세스에서 chunk_fn을 실행하고, 입력 순서대로 결과를 하나씩 반환
+
+    완료 순서와 관계없이 입력 순서를 유지하므로 워커 수가 달라도 결과 순서가 같습니다.
+    소비자가 중간에 멈추면 아직 시작하지 않은 청크는 취소됩니다.
+    워커 프로세스가 비정상 종료되면 풀을 버리고 남은 항목은 fallback으로 현재 프로세스에서 처리합니다.
+
+    Args:
+        chunk_fn: 워커에서 실행할 모듈 수준 함수 (pickle 가능해야 함)
+        items: 처리할 항목 (pickle 가능해야 함)
+        workers: 워커 프로세스 수
+        store: 워커에 전달할 디스크 캐시 (worker_store()로 조회)
+        fallback: chunk_fn과 같은 동작을 현재 프로세스에서 수행하는 함수
+    """
+    chunk_size = max(1, min(_MAX_CHUNK_SIZE, -(-len(items) // (workers * 4))))
+    chunks = _chunked(items, chunk_size)
+    pool = _get_pool(workers, store)
+    futures = [pool.submit(chunk_fn, chunk) for chunk in chunks]
+    done = 0
+    try:
+        for future in futures:
+            try:
+                results = future.result()
+            except BrokenProcessPool:
+                _discard_pool(pool)
+                break
+            done += 1
+            yield from results
+    finally:
+        for future in futures[done:]:
+            future.cancel()
+
+    for chunk in chunks[done:]:
+        yield from fallback(chunk)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
+
+# 매치 등급 (작을수록 좋음)
+EXACT = 0
+PREFIX = 1
+CAMEL_HUMP = 2
+SUBSTRING = 3
+FUZZY = 4
+
+MATCH_TYPES = {
+    EXACT: "exact",
+    PREFIX: "prefix",
+    CAMEL_HUMP: "camelCase",
+    SUBSTRING: "substring",
+    FUZZY: "fuzzy",
+}
+
+# 소문자/숫자 뒤 대문자, 연속 대문자 뒤 대문자+소문자, 숫자 묶음, 밑줄/$ 기준으로 단어(hump)를 나눈다
+_HUMP_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+
+@lru_cache(maxsize=65536)
+def split_humps(name: str) -> tuple[str, ...]:
+    """camelCase/PascalCase/SNAKE_CASE 이름을 단어 단위로 분리 (예: selectDetailByMailUser → select, Detail, By, Mail, User)"""
+    return tuple(_HUMP_RE.findall(name))
+
+
+@lru_cache(maxsize=262144)
+def _lower_humps(name: str) -> tuple[str, ...]:
+    return tuple(hump.lower() for hump in split_humps(name))
+
+
+def hump_start(humps: tuple[str, ...], query: str) -> Optional[int]:
+    """
+    query를 순서대로 각 hump의 접두사 조각으로 나눠 맞출 수 있으면 첫 조각이 맞는 가장 앞쪽 hump 번호, 아니면 None
+
+    다음 글자는 같은 hump 안에서 바로 이어지거나, 뒤쪽 hump의 첫 글자여야 합니다.
+    예: "SDBMU", "sdbmu", "selDetBMU", "DetailMail" 모두 selectDetailByMailUser와 맞습니다.
+    뒤쪽 hump부터 "query[i:]를 이 hump 이후에서 시작할 수 있는지"를 채우므로 O(이름 길이 × 쿼리 길이)입니다
+    (역추적하는 정규식은 반복되는 이름/쿼리에서 지수 시간이 걸림).
+    """
+    size = len(query)
+    if size == 0:
+        return None
+    # later[i]: 지금 보는 hump보다 뒤의 hump에서 query[i:]를 시작할 수 있는지 (남은 쿼리가 없으면 참)
+    later = [False] * size + [True]
+    first = None
+    for index in range(len(humps) - 1, -1, -1):
+        hump = humps[index]
+        starts = []
+        for start in range(size):
+            length = 0
+            while length < len(hump) and start + length < size and hump[length] == query[start + length]:
+                length += 1
+                if later[start + length]:
+                    starts.append(start)
+                    break
+        for start in starts:
+            later[start] = True
+        if starts and starts[0] == 0:
+            first = index
+    return first
+
+
+def _subsequence_pattern(query: str) -> str:
+    # "a.*?b.*?c" 대신 "a[^b]*b[^c]*c"를 쓰면 역추적 없이 시작 위치마다 한 번만 훑는다.
+    # 줄바꿈은 건너뛰지 않으므로 줄바꿈으로 이어 붙인 이름 목록에서도 한 이름 안에서만 매치된다
+    if not query:
+        return ""
+    parts = [re.escape(query[0])]
+    for char in query[1:]:
+        escaped = re.escape(char)
+        parts.append(f"[^{escaped}\\n]*{escaped}")
+    return "".join(parts)
+
+
+class QueryScorer:
+    """
+    한 쿼리에 대한 이름 점수 계산기
+
+    등급: exact > prefix > camelCase hump > substring > fuzzy subsequence.
+    모든 등급은 "쿼리 글자가 이름에 순서대로 나온다"를 만족하므로, 먼저 정규식으로 그 조건만 빠르게 걸러낸 뒤
+    남은 이름에만 점수를 매깁니다. fuzzy 구간 계산도 정규식으로 처리하고, hump 검사는 hump_start()로 합니다.
+    """
+
+    def __init__(self, query: str, case_sensitive: bool = False) -> None:
+        self.query = query
+        self.case_sensitive = case_sensitive
+        self.query_cmp = query if case_sensitive else query.lower()
+        flags = (0 if case_sensitive else re.IGNORECASE) | re.DOTALL
+        self._subsequence = re.compile(_subsequence_pattern(query), flags)
+        # TermIndex.scan()용: 대소문자 무시 검색은 소문자로 바꾼 이름 목록을 IGNORECASE 없이 훑는다
+        self.scan_pattern = re.compile(_subsequence_pattern(self.query_cmp))
+
+    def prefilter(self, names: Iterable[str]) -> Iterator[str]:
+        return filter(self._subsequence.search, names)
+
+    def score(self, name: str) -> Optional[tuple[int, int]]:
+        """(등급, 등급 내 보조 점수) 또는 None. 둘 다 작을수록 좋음"""
+        if not self.query:
+            return (PREFIX, 0)
+        text = name if self.case_sensitive else name.lower()
+        query = self.query_cmp
+        if text == query:
+            # 대소문자까지 같으면 더 위로
+            return (EXACT, 0 if name == self.query else 1)
+        if text.startswith(query):
+            return (PREFIX, 0 if name.startswith(self.query) else 1)
+        humps = split_humps(name) if self.case_sensitive else _lower_humps(name)
+        first = hump_start(humps, query)
+        if first is not None:
+            # 앞쪽 hump부터 맞을수록 위로 (건너뛴 앞쪽 hump 수)
+            return (CAMEL_HUMP, first)
+        position = text.find(query)
+        if position != -1:
+            return (SUBSTRING, position)
+        fuzzy = self._subsequence.search(name)
+        if fuzzy is not None:
+            # 쿼리 글자 사이에 끼어 있는 글자 수 (왼쪽부터 찾은 매치 기준)
+            return (FUZZY, fuzzy.end() - fuzzy.start() - len(query))
+        return None
@@ -1,42 +1,247 @@
 from __future__ import annotations
 
-from pathlib import Path
+import hashlib
+import mmap
+import os
+import re
+import threading
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Optional
 
-from cache.cache_store import CacheStore, default_cache_store
-from parser.indexer import find_symbol_by_id, index_java_file
+from cache.cache_store import CacheStore, FileStat, default_cache_store, file_stat, trusted_stat, validation_mode
+from parser.indexer import find_symbol_by_id, load_canonical_index
 
+# 줄 오프셋 인덱스를 보관할 최근 파일 수
+_LINE_INDEX_LIMIT = 64
 
-def _read_lines(file_path: str) -> list[str]:
-    text = Path(file_path).read_text(encoding="utf-8", errors="replace")
-    return text.splitlines()
+_NEWLINE = re.compile(b"\n")
 
+# 크기가 같은 파일의 내용이 그대로인지 보는 표본: 이 크기 이하는 전체, 넘으면 앞/뒤를 포함해 고르게 나눈 구간의 CRC
+_SAMPLE_WINDOWS = 16
+_SAMPLE_BYTES = 4096
+# 기존 줄 오프셋 중 바로 앞 바이트가 아직 "\n"인지 확인할 표본 수
+_SAMPLE_OFFSETS = 256
 
-def read_range(file_path: str, start_line: int, end_line: int, options: Optional[dict] = None) -> dict:
-    opts = options or {}
-    include_numbers = opts.get("includeLineNumbers", True)
-    max_chars = int(opts.get("maxChars", 20000))
 
-    lines = _read_lines(file_path)
-    line_count = len(lines)
+@dataclass
+class LineIndex:
+    """
+    파일의 줄 시작 바이트 오프셋 (줄 번호는 indexer와 같이 "\n" 기준, 1부터)
+
+    마지막 줄 끝의 "\n"은 빈 줄을 만들지 않습니다 (줄 수는 indexer._line_count()와 같음).
+    """
+
+    stat: FileStat
+    size: int
+    fingerprint: int
+    offsets: array
+
+    @property
+    def line_count(self) -> int:
+        return len(self.offsets)
+
+    def span(self, start_line: int, end_line: int) -> tuple[int, int]:
+        """start_line~end_line(포함)의 바이트 구간 [시작, 끝)"""
+        end = self.offsets[end_line] if end_line < len(self.offsets) else self.size
+        return self.offsets[start_line - 1], end
+
+    def line_at(self, offset: int) -> int:
+        """바이트 오프셋이 속한 줄 번호 (1부터)"""
+        return bisect_right(self.offsets, offset)
+
+
+def _line_offsets(data, size: int) -> array:
+    offsets = array("I" if size < 1 << 32 else "Q")
+    if size == 0:
+        return offsets
+    offsets.append(0)
+    # mmap을 복사하지 않고 훑는다 (줄마다 bytes 조각을 만드는 split보다 빠름)
+    offsets.extend(match.end() for match in _NEWLINE.finditer(data))
+    if offsets[-1] == size:
+        offsets.pop()
+    return offsets
+
+
+def _fingerprint(data, size: int) -> int:
+    if size <= _SAMPLE_WINDOWS * _SAMPLE_BYTES:
+        return zlib.crc32(data)
+    step = (size - _SAMPLE_BYTES) // (_SAMPLE_WINDOWS - 1)
+    crc = 0
+    for idx in range(_SAMPLE_WINDOWS):
+        start = idx * step
+        crc = zlib.crc32(data[start : start + _SAMPLE_BYTES], crc)
+    return crc
+
+
+def _newlines_hold(data, offsets: array) -> bool:
+    step = max(1, len(offsets) // _SAMPLE_OFFSETS)
+    return all(data[offset - 1] == 0x0A for offset in offsets[step::step])
+
+
+class LineIndexes:
+    """
+    파일 경로 → 줄 오프셋 인덱스 (LRU)
+
+    stat(크기, mtime_ns, inode)이 같으면 (racy 구간이 아닐 때) 파일을 훑지 않고 재사용합니다.
+    stat이 다르거나 racy 구간이면 크기가 같을 때만 가벼운 표본 확인(앞/뒤와 고르게 나눈 구간의 CRC,
+    기존 오프셋 일부의 "\n" 위치)으로 내용이 그대로인지 보고 (touch, 체크아웃으로 다시 쓴 파일) 오프셋을 그대로 씁니다.
+    파일 전체를 해시하지 않으며, 나머지 경우는 오프셋을 다시 만듭니다.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, LineIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_path: str, stat: FileStat, data) -> LineIndex:
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is not None:
+                self._entries.move_to_end(file_path)
+        if entry is not None and entry.stat == stat and trusted_stat(stat) is not None:
+            return entry
+
+        size = stat[0]
+        fingerprint = _fingerprint(data, size)
+        if (
+            entry is not None
+            and entry.size == size
+            and entry.fingerprint == fingerprint
+            and _newlines_hold(data, entry.offsets)
+        ):
+            entry = LineIndex(stat, size, fingerprint, entry.offsets)
+        else:
+            entry = LineIndex(stat, size, fingerprint, _line_offsets(data, size))
+        with self._lock:
+            self._entries[file_path] = entry
+            self._entries.move_to_end(file_path)
+            while len(self._entries) > _LINE_INDEX_LIMIT:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_LINE_INDEXES = LineIndexes()
+
 
-    if start_line < 1 or end_line < start_line or end_line > line_count:
-        raise ValueError("Invalid line range")
+class _MappedFile:
+    """
+    mmap으로 연 파일과 줄 오프셋 인덱스 (_MappedFile.open()으로 열고 with 블록이 끝나면 닫힘)
 
+    여러 범위를 읽어도 파일은 한 번만 열고, 요청한 줄의 바이트 구간만 잘라 디코딩합니다.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self._handle = None
+        self._data = None
+        self.stat: Optional[FileStat] = None
+        self.index: Optional[LineIndex] = None
+
+    @classmethod
+    def open(cls, file_path: str) -> "_MappedFile":
+        mapped = cls(file_path)
+        mapped._handle = open(file_path, "rb")
+        try:
+            st = os.fstat(mapped._handle.fileno())
+            stat = mapped.stat = (st.st_size, st.st_mtime_ns, st.st_ino)
+            if st.st_size == 0:
+                mapped._data = b""
+            else:
+                mapped._data = mmap.mmap(mapped._handle.fileno(), 0, access=mmap.ACCESS_READ)
+            mapped.index = _LINE_INDEXES.get(file_path, stat, mapped._data)
+        except BaseException:
+            mapped.close()
+            raise
+        return mapped
+
+    def matches(self, stat: Optional[FileStat], content_hash: str) -> bool:
+        """
+        열린 파일 내용의 해시가 content_hash인지
+
+        stat은 content_hash의 인덱스를 확인하기 전에 구한 파일 stat입니다. 지금 연 파일의 stat이 그와 같고
+        racy 구간 밖이면 내용이 그대로이므로 해시를 계산하지 않고, 아니면 파일 전체의 해시를 비교합니다.
+        """
+        if stat is not None and self.stat == stat and trusted_stat(stat) is not None:
+            return True
+        return hashlib.sha1(self._data).hexdigest() == content_hash
+
+    def __enter__(self) -> "_MappedFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = None
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    @property
+    def line_count(self) -> int:
+        return self.index.line_count
+
+    def valid(self, start_line: int, end_line: int) -> bool:
+        return 1 <= start_line <= end_line <= self.line_count
+
+    @property
+    def data(self):
+        """파일 내용 (mmap, 빈 파일은 b"")"""
+        return self._data
+
+    def lines(self, start_line: int, end_line: int, max_bytes: int) -> list[str]:
+        """start_line~end_line의 줄 목록 (구간이 max_bytes를 넘으면 앞부분만)"""
+        begin, end = self.index.span(start_line, end_line)
+        text = self._data[begin : min(end, begin + max_bytes)].decode("utf-8", errors="replace")
+        lines = text.split("\n")
+        if end <= begin + max_bytes and text.endswith("\n"):
+            lines.pop()
+        return [line[:-1] if line.endswith("\r") else line for line in lines]
+
+
+def _max_bytes(max_chars: int) -> int:
+    # 출력에 세는 글자(줄 끝 포함)마다 UTF-8로 4바이트를 넘지 않으므로 이만큼 읽으면 잘림 판단에 충분하다
+    return 4 * (max(max_chars, 0) + 1)
+
+
+def _format_lines(
+    lines: list[str], start_line: int, include_numbers: bool, budget: int, max_chars: int
+) -> tuple[list[str], int, bool]:
+    """(출력 줄, 사용한 글자 수, 잘렸는지): budget을 넘는 줄에서 멈추고 잘림 표시를 붙인다"""
     output_lines: list[str] = []
     total_chars = 0
-
-    for idx in range(start_line - 1, end_line):
-        line_text = lines[idx]
+    for idx, line_text in enumerate(lines, start_line):
         if include_numbers:
-            line_text = f"{idx + 1}: {line_text}"
+            line_text = f"{idx}: {line_text}"
         projected = total_chars + len(line_text) + 1
-        if projected > max_chars:
+        if projected > budget:
             output_lines.append(f"... [truncated at {max_chars} chars]")
-            break
+            return output_lines, total_chars, True
         output_lines.append(line_text)
         total_chars = projected
+    return output_lines, total_chars, False
+
+
+def read_range(file_path: str, start_line: int, end_line: int, options: Optional[dict] = None) -> dict:
+    opts = options or {}
+    include_numbers = opts.get("includeLineNumbers", True)
+    max_chars = int(opts.get("maxChars", 20000))
+
+    with _MappedFile.open(file_path) as mapped:
+        if not mapped.valid(start_line, end_line):
+            raise ValueError("Invalid line range")
+        lines = mapped.lines(start_line, end_line, _max_bytes(max_chars))
 
+    output_lines, _, _ = _format_lines(lines, start_line, include_numbers, max_chars, max_chars)
     return {
         "filePath": file_path,
         "startLine": start_line,
@@ -45,6 +250,100 @@ def read_range(file_path: str, start_line: int, end_line: int, options: Optional
     }
 
 
+def _merge_ranges(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """겹치거나 맞닿은 줄 범위를 합친 목록 (시작 줄 순)"""
+    merged: list[tuple[int, int]] = []
+    for start_line, end_line in sorted(ranges):
+        if merged and start_line <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end_line))
+        else:
+            merged.append((start_line, end_line))
+    return merged
+
+
+def read_ranges(requests: list[dict], options: Optional[dict] = None) -> dict:
+    """
+    여러 파일의 여러 줄 범위를 한 번에 읽기
+
+    요청을 파일별로 묶고(처음 나온 순서), 파일마다 겹치거나 맞닿은 범위를 합친 뒤 파일을 한 번만 엽니다.
+    maxChars는 배치 전체의 예산으로, 넘으면 그 범위를 잘라 표시하고 남은 범위는 읽지 않고 skipped에 넣습니다.
+    잘못된 범위나 읽을 수 없는 파일은 배치 전체를 실패시키지 않고 errors에 요청별로 넣습니다.
+
+    Args:
+        requests: [{"filePath", "startLine", "endLine"}, ...]
+        options: includeLineNumbers (기본값: True), maxChars (기본값: 20000)
+
+    Returns:
+        files: [{"filePath", "lineCount", "ranges": [{"startLine", "endLine", "content"}]}],
+        errors, skipped, totalChars, truncated
+    """
+    opts = options or {}
+    include_numbers = opts.get("includeLineNumbers", True)
+    max_chars = int(opts.get("maxChars", 20000))
+
+    groups: dict[str, list[tuple[int, int]]] = {}
+    errors: list[dict] = []
+    for request in requests:
+        file_path = request.get("filePath")
+        start_line = request.get("startLine")
+        end_line = request.get("endLine")
+        if not isinstance(file_path, str) or not isinstance(start_line, int) or not isinstance(end_line, int):
+            errors.append({"filePath": file_path, "startLine": start_line, "endLine": end_line, "error": "Invalid request"})
+            continue
+        groups.setdefault(file_path, []).append((start_line, end_line))
+
+    files: list[dict] = []
+    skipped: list[dict] = []
+    remaining = max_chars
+    truncated = False
+    for file_path, ranges in groups.items():
+        if truncated:
+            skipped.extend(
+                {"filePath": file_path, "startLine": start_line, "endLine": end_line}
+                for start_line, end_line in _merge_ranges(ranges)
+            )
+            continue
+        try:
+            mapped = _MappedFile.open(file_path)
+        except OSError as exc:
+            errors.extend(
+                {"filePath": file_path, "startLine": start_line, "endLine": end_line, "error": str(exc)}
+                for start_line, end_line in ranges
+            )
+            continue
+
+        results = []
+        with mapped:
+            valid = []
+            for start_line, end_line in ranges:
+                if mapped.valid(start_line, end_line):
+                    valid.append((start_line, end_line))
+                else:
+                    errors.append(
+                        {"filePath": file_path, "startLine": start_line, "endLine": end_line, "error": "Invalid line range"}
+                    )
+            for start_line, end_line in _merge_ranges(valid):
+                if truncated:
+                    skipped.append({"filePath": file_path, "startLine": start_line, "endLine": end_line})
+                    continue
+                lines = mapped.lines(start_line, end_line, _max_bytes(remaining))
+                output_lines, used, truncated = _format_lines(
+                    lines, start_line, include_numbers, remaining, max_chars
+                )
+                remaining -= used
+                results.append({"startLine": start_line, "endLine": end_line, "content": "\n".join(output_lines)})
+        if results:
+            files.append({"filePath": file_path, "lineCount": mapped.line_count, "ranges": results})
+
+    return {
+        "files": files,
+        "errors": errors,
+        "skipped": skipped,
+        "totalChars": max_chars - remaining,
+        "truncated": truncated,
+    }
+
+
 def read_javadoc(
     file_path: str,
     symbol_id: str,
@@ -56,7 +355,8 @@ def read_javadoc(
     include_numbers = opts.get("includeLineNumbers", True)
     max_chars = int(opts.get("maxChars", 8000))
 
-    index_data = index_java_file(file_path, options={}, cache_store=cache)
+    # 정규 인덱스의 symbolIndex로 트리를 훑지 않고 찾는다
+    index_data = load_canonical_index(file_path, cache)
     symbol = find_symbol_by_id(index_data, symbol_id)
     if not symbol:
         return {
@@ -110,3 +410,161 @@ def read_javadoc(
         "lineCount": end_line - start_line + 1,
         "content": content,
     }
+
+
+def _skip_blank(data: bytes, pos: int, end: int) -> int:
+    """공백과 주석을 건너뛴 위치"""
+    while pos < end:
+        if data[pos : pos + 1].isspace():
+            pos += 1
+        elif data[pos : pos + 2] == b"//":
+            newline = data.find(b"\n", pos, end)
+            pos = end if newline < 0 else newline + 1
+        elif data[pos : pos + 2] == b"/*":
+            close = data.find(b"*/", pos + 2, end)
+            pos = end if close < 0 else close + 2
+        else:
+            break
+    return pos
+
+
+def _skip_literal(data: bytes, pos: int, end: int) -> int:
+    """pos의 문자열/문자 리터럴(텍스트 블록 포함) 바로 뒤 위치"""
+    if data[pos : pos + 3] == b'"""':
+        close = data.find(b'"""', pos + 3, end)
+        return end if close < 0 else close + 3
+    quote = data[pos]
+    pos += 1
+    while pos < end:
+        byte = data[pos]
+        if byte == 0x5C:
+            pos += 2
+            continue
+        if byte == quote:
+            return pos + 1
+        if byte == 0x0A:
+            return pos
+        pos += 1
+    return end
+
+
+def _skip_arguments(data: bytes, pos: int, end: int) -> int:
+    """pos의 "("와 짝이 맞는 ")" 바로 뒤 위치"""
+    depth = 0
+    while pos < end:
+        byte = data[pos]
+        if byte == 0x28:
+            depth += 1
+        elif byte == 0x29:
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        elif byte in (0x22, 0x27):
+            pos = _skip_literal(data, pos, end)
+            continue
+        pos += 1
+    return end
+
+
+def _skip_annotations(data: bytes, pos: int, end: int) -> int:
+    """선언 앞쪽의 어노테이션(@Name, @a.b.Name(...))과 사이의 공백/주석을 건너뛴 위치"""
+    while True:
+        cursor = _skip_blank(data, pos, end)
+        if data[cursor : cursor + 1] != b"@":
+            return cursor
+        name_end = _skip_blank(data, cursor + 1, end)
+        name_start = name_end
+        while name_end < end and (data[name_end : name_end + 1].isalnum() or data[name_end] in b"_$." or data[name_end] >= 0x80):
+            name_end += 1
+        if data[name_start:name_end] == b"interface":
+            # @interface 선언의 키워드는 어노테이션이 아니다
+            return cursor
+        cursor = _skip_blank(data, name_end, end)
+        if data[cursor : cursor + 1] == b"(":
+            cursor = _skip_arguments(data, cursor, end)
+        pos = cursor
+
+
+def _symbol_result(file_path: str, symbol_id: str, content_hash: Optional[str], stale: bool = False) -> dict:
+    return {
+        "filePath": file_path,
+        "symbolId": symbol_id,
+        "found": False,
+        "stale": stale,
+        "hash": content_hash,
+        "startLine": None,
+        "endLine": None,
+        "startByte": None,
+        "endByte": None,
+        "content": "",
+        "truncated": False,
+    }
+
+
+def read_symbol(
+    file_path: str,
+    symbol_id: str,
+    options: Optional[dict] = None,
+    cache_store: Optional[CacheStore] = None,
+) -> dict:
+    """
+    symbolId의 선언 원문 (정규 인덱스의 startByte/endByte로 파일 바이트를 바로 자름)
+
+    정규 인덱스의 hash와 지금 읽은 파일의 내용이 같을 때만 자르므로, 인덱스를 읽은 뒤 파일이 바뀌어
+    엉뚱한 줄을 돌려주는 일이 없습니다 (한 번 다시 읽어도 다르면 ValueError). 인덱스를 조회하기 전의 stat과
+    연 파일의 stat이 같으면(racy 구간 밖) 그대로 믿고, 아니면 내용 해시를 비교합니다.
+    options.expectedHash를 주면 현재 내용의 해시와 다를 때 찾지 않고 stale로 바로 실패합니다.
+    symbolId에는 줄 번호가 들어 있으므로 선언이 옮겨졌으면 찾지 못합니다 (found=False).
+    """
+    opts = options or {}
+    cache = cache_store or default_cache_store()
+    include_javadoc = opts.get("includeJavadoc", False)
+    include_annotations = opts.get("includeAnnotations", True)
+    max_chars = int(opts.get("maxChars", 20000))
+    expected_hash = opts.get("expectedHash")
+
+    for _ in range(2):
+        # 인덱스가 이 stat으로 확인됐고 연 파일의 stat도 같으면 내용 해시를 다시 계산하지 않는다
+        stat = file_stat(file_path) if validation_mode() == "stat" else None
+        index_data = load_canonical_index(file_path, cache)
+        content_hash = index_data["hash"]
+        if expected_hash and expected_hash != content_hash:
+            return _symbol_result(file_path, symbol_id, content_hash, stale=True)
+        symbol = find_symbol_by_id(index_data, symbol_id)
+        if symbol is None:
+            return _symbol_result(file_path, symbol_id, content_hash)
+
+        with _MappedFile.open(file_path) as mapped:
+            if not mapped.matches(stat, content_hash):
+                # 인덱스를 만든 뒤 파일이 바뀌었다: 새 내용으로 다시 인덱싱해 찾는다
+                continue
+            start, end = symbol["startByte"], symbol["endByte"]
+            javadoc = symbol.get("javadoc") or {}
+            if include_javadoc and javadoc.get("present") and javadoc.get("startLine"):
+                line_start = mapped.index.span(javadoc["startLine"], javadoc["startLine"])[0]
+                comment = mapped.data.find(b"/**", line_start, start)
+                if comment >= 0:
+                    start = comment
+            elif not include_annotations:
+                start = _skip_annotations(mapped.data, start, end)
+            raw = mapped.data[start : min(end, start + _max_bytes(max_chars))]
+            start_line, end_line = mapped.index.line_at(start), mapped.index.line_at(end - 1)
+
+        text = raw.decode("utf-8", errors="replace").replace("\r\n", "\n")
+        truncated = len(text) > max_chars
+        if truncated:
+            text = f"{text[:max_chars]}\n... [truncated at {max_chars} chars]"
+        return {
+            "filePath": file_path,
+            "symbolId": symbol_id,
+            "found": True,
+            "stale": False,
+            "hash": content_hash,
+            "startLine": start_line,
+            "endLine": end_line,
+            "startByte": start,
+            "endByte": end,
+            "content": text,
+            "truncated": truncated,
+        }
+    raise ValueError("File changed while reading symbol")
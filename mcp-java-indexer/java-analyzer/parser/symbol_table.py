@@ -0,0 +1,889 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+from bisect import insort
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from contextlib import closing, nullcontext
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Generator, Iterable, Iterator, Optional
+
+from cache.cache_store import atomic_write_bytes, file_stat, trusted_stat, validation_mode
+from cache.serializers import decode_any
+from parser.discovery import path_order_key
+from parser.ranking import MATCH_TYPES, QueryScorer
+from parser.trigram_index import TermIndex
+
+
+# 심볼 레코드: (이름, kind, 필터 플래그, symbolId, qualifiedName, startLine, endLine, signatureText)
+# 테이블 안에서는 FileSymbols의 열로 보관하고, 결과를 만들 때만 FileSymbols.record()로 튜플을 만든다
+Record = tuple
+
+# 레코드 필터 플래그: 인덱싱 옵션이 꺼져 있으면 해당 플래그가 있는 레코드는 검색에서 제외
+FLAG_PRIVATE = 1  # 자신 또는 바깥 클래스가 private (includePrivate)
+FLAG_FIELD = 2  # 필드 (includeFields)
+FLAG_CONSTRUCTOR = 4  # 생성자 (includeConstructors)
+FLAG_INNER = 8  # 내부 클래스 또는 그 멤버 (includeInnerClasses)
+
+# FileSymbols 내부 플래그: qualified 열에 바깥 클래스 이름만 있고 "#이름"은 결과를 만들 때 붙인다
+_FLAG_OWNER_QUALIFIED = 128
+_PUBLIC_FLAGS = FLAG_PRIVATE | FLAG_FIELD | FLAG_CONSTRUCTOR | FLAG_INNER
+
+# 줄 번호 열에서 None을 나타내는 값
+_NO_LINE = -1
+
+# 영속화 형식 버전. 레코드 구성이 바뀌면 올린다
+TABLE_VERSION = 3
+
+SYMBOLS_DIR_NAME = "symbols"
+
+# 변경 저널: 스냅샷 옆 "{스냅샷 이름}.journal"에 (길이 4바이트 + 직렬화된 레코드) 프레임을 이어 붙인다
+JOURNAL_SUFFIX = ".journal"
+_FRAME_HEADER = struct.Struct("<I")
+# 저널이 max(이 크기, 스냅샷 크기의 절반)을 넘으면 스냅샷으로 합친다
+_JOURNAL_COMPACT_MIN_BYTES = 1 << 20
+
+# 갱신/스트리밍 검색이 stat 확인과 로드를 묶는 파일 수 (처음 묶음부터 두 배씩 키운다)
+_FIRST_BATCH = 16
+_MAX_BATCH = 1024
+
+_TABLES_LOCK = threading.Lock()
+_TABLES: dict[tuple[str, str, str], "SymbolTable"] = {}
+
+
+def refresh_interval_seconds() -> float:
+    """
+    MCP_JAVA_INDEX_SYMBOL_REFRESH_SEC 환경 변수 (기본값: 2)
+
+    마지막 갱신 후 이 시간 안의 검색은 디렉토리를 다시 훑지 않고 메모리의 심볼 테이블로 바로 응답합니다.
+    0이면 검색할 때마다 파일 stat을 확인합니다.
+    """
+    raw = os.environ.get("MCP_JAVA_INDEX_SYMBOL_REFRESH_SEC", "").strip()
+    try:
+        return max(0.0, float(raw)) if raw else 2.0
+    except ValueError:
+        return 2.0
+
+
+def excluded_flags(view: dict) -> int:
+    """인덱싱 옵션(includePrivate 등)에서 제외해야 하는 레코드 플래그 계산"""
+    flags = 0
+    if not view.get("includePrivate", True):
+        flags |= FLAG_PRIVATE
+    if not view.get("includeFields", True):
+        flags |= FLAG_FIELD
+    if not view.get("includeConstructors", True):
+        flags |= FLAG_CONSTRUCTOR
+    if not view.get("includeInnerClasses", True):
+        flags |= FLAG_INNER
+    return flags
+
+
+class FileSymbols:
+    """
+    파일 하나의 심볼 레코드를 열(column) 단위로 보관
+
+    심볼마다 레코드 튜플과 줄 번호 int 객체를 만드는 대신 열마다 list/array 하나를 둡니다.
+    이름/kind는 sys.intern()으로 공유하고, 필터 플래그는 array("B"), 줄 번호는 array("i")에 둡니다.
+    멤버의 qualifiedName("클래스#이름")은 따로 만들지 않고 바깥 클래스의 qualifiedName 문자열을 가리키며,
+    결과를 만들 때 이름을 이어 붙입니다. record()는 기존 레코드 튜플과 같은 값을 돌려줍니다.
+    """
+
+    __slots__ = ("names", "kinds", "flags", "symbol_ids", "qualified", "start_lines", "end_lines", "signatures")
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.kinds: list[Optional[str]] = []
+        self.flags = array("B")
+        self.symbol_ids: list[Optional[str]] = []
+        self.qualified: list[str] = []
+        self.start_lines = array("i")
+        self.end_lines = array("i")
+        self.signatures: list[Optional[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def append(
+        self,
+        name: str,
+        kind: Optional[str],
+        flags: int,
+        symbol_id: Optional[str],
+        qualified: str,
+        start_line: Optional[int],
+        end_line: Optional[int],
+        signature: Optional[str],
+    ) -> None:
+        self.names.append(sys.intern(name))
+        self.kinds.append(sys.intern(kind) if kind is not None else None)
+        self.flags.append(flags)
+        self.symbol_ids.append(symbol_id)
+        self.qualified.append(qualified)
+        self.start_lines.append(_NO_LINE if start_line is None else start_line)
+        self.end_lines.append(_NO_LINE if end_line is None else end_line)
+        self.signatures.append(signature)
+
+    def qualified_name(self, seq: int) -> str:
+        if self.flags[seq] & _FLAG_OWNER_QUALIFIED:
+            return f"{self.qualified[seq]}#{self.names[seq]}"
+        return self.qualified[seq]
+
+    def record(self, seq: int) -> Record:
+        start_line = self.start_lines[seq]
+        end_line = self.end_lines[seq]
+        return (
+            self.names[seq],
+            self.kinds[seq],
+            self.flags[seq] & _PUBLIC_FLAGS,
+            self.symbol_ids[seq],
+            self.qualified_name(seq),
+            None if start_line == _NO_LINE else start_line,
+            None if end_line == _NO_LINE else end_line,
+            self.signatures[seq],
+        )
+
+    def result(self, file_path: str, seq: int) -> dict:
+        """검색 결과 dict (API 스키마, 레코드 튜플을 거치지 않고 열에서 바로 만든다)"""
+        qualified = self.qualified[seq]
+        if self.flags[seq] & _FLAG_OWNER_QUALIFIED:
+            qualified = f"{qualified}#{self.names[seq]}"
+        start_line = self.start_lines[seq]
+        end_line = self.end_lines[seq]
+        return {
+            "filePath": file_path,
+            "symbolId": self.symbol_ids[seq],
+            "kind": self.kinds[seq],
+            "qualifiedName": qualified,
+            "startLine": None if start_line == _NO_LINE else start_line,
+            "endLine": None if end_line == _NO_LINE else end_line,
+            "signatureText": self.signatures[seq],
+        }
+
+    def matching(
+        self,
+        query: str,
+        match_kind: str = "any",
+        case_sensitive: bool = False,
+        excluded: int = 0,
+        include_qualified: bool = False,
+    ) -> list[int]:
+        """query가 이름(include_qualified면 qualifiedName도)에 포함된 심볼 순번 (TermIndex.search와 같은 기준의 선형 비교)"""
+        needle = query if case_sensitive else query.lower()
+        seqs: list[int] = []
+        for seq, name in enumerate(self.names):
+            if match_kind != "any" and self.kinds[seq] != match_kind:
+                continue
+            if self.flags[seq] & excluded:
+                continue
+            if needle in (name if case_sensitive else name.lower()):
+                seqs.append(seq)
+            elif include_qualified:
+                qualified = self.qualified_name(seq)
+                if qualified and needle in (qualified if case_sensitive else qualified.lower()):
+                    seqs.append(seq)
+        return seqs
+
+    def columns(self) -> list[list]:
+        """영속화용 열 목록 (JSON으로도 저장할 수 있도록 array는 list로)"""
+        return [
+            self.names,
+            self.kinds,
+            list(self.flags),
+            self.symbol_ids,
+            self.qualified,
+            list(self.start_lines),
+            list(self.end_lines),
+            self.signatures,
+        ]
+
+    @classmethod
+    def from_columns(cls, columns: list[list]) -> "FileSymbols":
+        names, kinds, flags, symbol_ids, qualified, start_lines, end_lines, signatures = columns
+        symbols = cls()
+        symbols.names = [sys.intern(name) for name in names]
+        symbols.kinds = [sys.intern(kind) if kind is not None else None for kind in kinds]
+        symbols.flags = array("B", flags)
+        symbols.symbol_ids = list(symbol_ids)
+        symbols.qualified = list(qualified)
+        symbols.start_lines = array("i", start_lines)
+        symbols.end_lines = array("i", end_lines)
+        symbols.signatures = list(signatures)
+        return symbols
+
+
+def extract_symbols(canonical: dict) -> FileSymbols:
+    """
+    정규 인덱스에서 검색용 심볼 레코드 추출
+
+    순서는 find_symbols_in_file()과 같고, qualifiedName은 멤버의 경우 "클래스#이름"입니다
+    (클래스, 필드, 생성자, 메서드, 내부 클래스 순).
+    """
+    symbols = FileSymbols()
+
+    def add(symbol: dict, class_name: Optional[str], flags: int) -> None:
+        name = symbol.get("name") or symbol.get("qualifiedName") or ""
+        if not name:
+            return
+        kind = symbol.get("kind")
+        if kind == "class":
+            qualified = symbol.get("qualifiedName") or ""
+        elif class_name and symbol.get("name"):
+            # "클래스#이름"은 바깥 클래스 문자열을 공유하고 결과를 만들 때 붙인다
+            qualified = class_name
+            flags |= _FLAG_OWNER_QUALIFIED
+        else:
+            qualified = symbol.get("qualifiedName") or symbol.get("name") or ""
+        symbols.append(
+            name,
+            kind,
+            flags,
+            symbol.get("symbolId"),
+            qualified,
+            symbol.get("startLine"),
+            symbol.get("endLine"),
+            symbol.get("signatureText"),
+        )
+
+    def private_flag(symbol: dict) -> int:
+        return FLAG_PRIVATE if "private" in (symbol.get("modifiers") or []) else 0
+
+    def walk_class(cls: dict, inherited: int) -> None:
+        class_flags = inherited | private_flag(cls)
+        class_name = cls.get("qualifiedName")
+        add(cls, class_name, class_flags)
+        for field in cls.get("fields", []):
+            add(field, class_name, class_flags | FLAG_FIELD | private_flag(field))
+        for ctor in cls.get("constructors", []):
+            add(ctor, class_name, class_flags | FLAG_CONSTRUCTOR | private_flag(ctor))
+        for method in cls.get("methods", []):
+            add(method, class_name, class_flags | private_flag(method))
+        for inner in cls.get("innerClasses", []):
+            walk_class(inner, class_flags | FLAG_INNER)
+
+    for cls in canonical.get("classes", []):
+        walk_class(cls, 0)
+    return symbols
+
+
+class SymbolTable:
+    """
+    루트 디렉토리 단위의 영속 심볼 테이블 (이름 → 파일별 심볼 레코드)
+
+    처음 한 번 전체 파일의 정규 인덱스로 만들고, 이후에는 stat(또는 해시)이 바뀐 파일의 레코드만 교체합니다.
+    검색은 파일을 다시 읽지 않고 이름의 3-gram 게시 목록(TermIndex)으로 후보 이름을 좁힌 뒤 해당 레코드만 모읍니다.
+    qualifiedName 검색용 TermIndex는 처음 요청될 때 만들고 (대부분 고유 문자열이라 크기 때문) 저장하지 않습니다.
+    저장은 전체 스냅샷 + 변경 저널입니다. 갱신마다 바뀐 파일의 레코드만 저널에 덧붙이고,
+    저널이 커지면 스냅샷을 다시 써서 합칩니다 (스냅샷과 저널은 같은 토큰을 가져 짝이 안 맞는 저널은 무시).
+    결과 순서는 기존 find_symbols와 같은 디렉토리 탐색 순서 → 파일 내 심볼 순서입니다.
+    """
+
+    def __init__(self, root_dir: str, storage_path: Optional[Path], serializer=None, lock=None) -> None:
+        self.root_dir = root_dir
+        self.storage_path = storage_path
+        self.serializer = serializer
+        self._storage_lock = lock
+        self._lock = threading.RLock()
+        # 파일 경로 → [stat 또는 None, 콘텐츠 해시, FileSymbols]
+        self._files: dict[str, list] = {}
+        self._names = TermIndex()
+        self._qualified: Optional[TermIndex] = None
+        self._order: dict[str, int] = {}
+        self._refreshed_at: Optional[float] = None
+        # 끝까지 훑은 갱신 횟수 (늦게 끝난 갱신이 더 최신 파일 목록을 덮어쓰지 않도록)
+        self._generation = 0
+        self._loaded = False
+        # 마지막 저장 이후 레코드가 바뀌거나 지워진 파일, 탐색 순서 변경 여부
+        self._dirty: set[str] = set()
+        self._order_dirty = False
+        # 디스크의 스냅샷 크기와 이 테이블이 알고 있는 저널 크기 (None이면 다음 저장에서 스냅샷을 다시 쓴다)
+        self._base_size = 0
+        self._journal_size: Optional[int] = None
+
+    # ----- 영속화 -----
+
+    @property
+    def journal_path(self) -> Optional[Path]:
+        if self.storage_path is None:
+            return None
+        return self.storage_path.with_name(self.storage_path.name + JOURNAL_SUFFIX)
+
+    def _storage_guard(self):
+        return self._storage_lock() if self._storage_lock is not None else nullcontext()
+
+    def _load(self) -> None:
+        self._loaded = True
+        if self.storage_path is None or not self.storage_path.exists():
+            return
+        try:
+            data = self.storage_path.read_bytes()
+            payload = decode_any(data)
+        except Exception:
+            return
+        if not isinstance(payload, dict) or payload.get("version") != TABLE_VERSION:
+            return
+        if payload.get("root") != self.root_dir:
+            return
+        for file_path, (stat, content_hash, columns) in payload["files"].items():
+            self._set_file(
+                file_path, tuple(stat) if stat else None, content_hash, FileSymbols.from_columns(columns), index=False
+            )
+        self._names.import_postings(payload["trigrams"])
+        self._order = {file_path: idx for idx, file_path in enumerate(payload["order"])}
+        self._base_size = len(data)
+        token = payload.get("journal")
+        if token:
+            self._replay_journal(token)
+
+    def _replay_journal(self, token: str) -> None:
+        """스냅샷 토큰과 짝이 맞는 저널의 레코드를 순서대로 적용 (끝의 잘린 프레임은 버린다)"""
+        try:
+            data = self.journal_path.read_bytes()
+        except OSError:
+            return
+        valid: Optional[int] = None
+        frames = _iter_frames(data)
+        try:
+            valid, header = next(frames)
+            if not isinstance(header, dict) or header.get("version") != TABLE_VERSION or header.get("token") != token:
+                return
+            for end, record in frames:
+                self._apply_journal_record(record)
+                valid = end
+        except (StopIteration, ValueError):
+            # 헤더가 없으면 저널을 무시하고, 끝이 잘린 경우(쓰는 도중 종료 등)는 그 앞까지만 적용
+            if valid is None:
+                return
+        self._journal_size = valid
+
+    def _apply_journal_record(self, record: list) -> None:
+        op = record[0]
+        if op == "set":
+            _, file_path, stat, content_hash, columns = record
+            self._set_file(file_path, tuple(stat) if stat else None, content_hash, FileSymbols.from_columns(columns))
+        elif op == "drop":
+            self._drop_file(record[1])
+        elif op == "order":
+            self._order = {file_path: idx for idx, file_path in enumerate(record[1])}
+
+    def _save(self) -> None:
+        if self.storage_path is None or self.serializer is None:
+            self._dirty.clear()
+            self._order_dirty = False
+            return
+        frames = []
+        for file_path in sorted(self._dirty):
+            entry = self._files.get(file_path)
+            if entry is None:
+                record = ["drop", file_path]
+            else:
+                stat, content_hash, symbols = entry
+                record = ["set", file_path, list(stat) if stat else None, content_hash, symbols.columns()]
+            frames.append(_frame(self.serializer.encode(record)))
+        if self._order_dirty:
+            frames.append(_frame(self.serializer.encode(["order", self._ordered_paths()])))
+        self._dirty.clear()
+        self._order_dirty = False
+        if not frames:
+            return
+        data = b"".join(frames)
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._storage_guard():
+            if self._should_compact(len(data)):
+                self._compact()
+                return
+            with open(self.journal_path, "ab") as handle:
+                handle.write(data)
+            self._journal_size += len(data)
+
+    def _should_compact(self, pending: int) -> bool:
+        if self._journal_size is None:
+            return True
+        # 다른 프로세스가 저널을 덧붙이거나 합쳤으면 이 테이블의 상태로 스냅샷을 다시 쓴다
+        try:
+            on_disk = self.journal_path.stat().st_size
+        except OSError:
+            return True
+        if on_disk != self._journal_size:
+            return True
+        return self._journal_size + pending > max(_JOURNAL_COMPACT_MIN_BYTES, self._base_size // 2)
+
+    def _compact(self) -> None:
+        """전체 스냅샷을 새 토큰으로 다시 쓰고 저널을 헤더만 남긴 새 저널로 교체 (저장 잠금 안에서 호출)"""
+        token = os.urandom(8).hex()
+        payload = {
+            "version": TABLE_VERSION,
+            "root": self.root_dir,
+            "journal": token,
+            "order": self._ordered_paths(),
+            "files": {
+                file_path: [list(stat) if stat else None, content_hash, symbols.columns()]
+                for file_path, (stat, content_hash, symbols) in self._files.items()
+            },
+            "trigrams": self._names.export_postings(),
+        }
+        data = self.serializer.encode(payload)
+        header = _frame(self.serializer.encode({"version": TABLE_VERSION, "token": token}))
+        atomic_write_bytes(self.storage_path, data)
+        atomic_write_bytes(self.journal_path, header)
+        self._base_size = len(data)
+        self._journal_size = len(header)
+
+    def _ordered_paths(self) -> list[str]:
+        return sorted(self._order, key=self._order.__getitem__)
+
+    # ----- 증분 갱신 -----
+
+    def _drop_file(self, file_path: str) -> None:
+        entry = self._files.pop(file_path, None)
+        if entry is None:
+            return
+        symbols = entry[2]
+        self._names.remove_file(file_path, zip(symbols.names, symbols.kinds))
+        if self._qualified is not None:
+            self._qualified.remove_file(
+                file_path, ((symbols.qualified_name(seq), symbols.kinds[seq]) for seq in range(len(symbols)))
+            )
+
+    def _set_file(
+        self,
+        file_path: str,
+        stat: Optional[tuple],
+        content_hash: str,
+        symbols: FileSymbols,
+        index: bool = True,
+    ) -> None:
+        # TermIndex에는 심볼마다 (순번, FileSymbols)를 넣고 레코드는 검색 결과를 만들 때 꺼낸다
+        self._drop_file(file_path)
+        self._files[file_path] = [stat, content_hash, symbols]
+        for seq, (name, kind) in enumerate(zip(symbols.names, symbols.kinds)):
+            self._names.add(name, file_path, seq, symbols, kind, index)
+            if self._qualified is not None:
+                qualified = symbols.qualified_name(seq)
+                if qualified:
+                    self._qualified.add(qualified, file_path, seq, symbols, kind)
+
+    def _qualified_index(self) -> TermIndex:
+        if self._qualified is None:
+            qualified = TermIndex()
+            for file_path, (_, _, symbols) in self._files.items():
+                for seq, kind in enumerate(symbols.kinds):
+                    name = symbols.qualified_name(seq)
+                    if name:
+                        qualified.add(name, file_path, seq, symbols, kind)
+            self._qualified = qualified
+        return self._qualified
+
+    def invalidate(self) -> None:
+        """다음 검색에서 갱신 주기와 관계없이 stat을 다시 확인하도록 표시"""
+        with self._lock:
+            self._refreshed_at = None
+
+    def _walk(
+        self,
+        file_paths: Iterable[str],
+        load_canonical: Callable[[list[str]], Iterator[tuple[str, dict]]],
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> Generator[tuple[str, FileSymbols], None, int]:
+        """
+        파일을 탐색 순서대로 훑으며 (경로, 최신 FileSymbols)를 하나씩 내보내고, 바뀐 파일 수를 반환
+
+        stat이 그대로인 파일은 테이블의 레코드를 그대로 쓰고, 나머지는 묶음 단위로 load_canonical을 거쳐 다시 추출합니다.
+        묶음은 작게 시작해 두 배씩 키우므로 첫 파일은 트리 크기와 관계없이 바로 나옵니다.
+        끝까지 훑으면 사라진 파일을 지우고 탐색 순서를 갱신합니다. 소비자가 중간에 멈추거나(close)
+        should_stop()이 참이 되면 거기서 끝내고, 그때까지 바뀐 레코드만 저장합니다.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            generation = self._generation
+        stat_mode = validation_mode() == "stat"
+        paths = iter(file_paths)
+        seen: list[str] = []
+        changed = 0
+        batch_size = _FIRST_BATCH
+        try:
+            while True:
+                batch = list(islice(paths, batch_size))
+                if not batch:
+                    break
+                batch_size = min(batch_size * 2, _MAX_BATCH)
+
+                stats: dict[str, Optional[tuple]] = {}
+                current: dict[str, FileSymbols] = {}
+                candidates: list[str] = []
+                with self._lock:
+                    for file_path in batch:
+                        stat = file_stat(file_path) if stat_mode else None
+                        stats[file_path] = stat
+                        entry = self._files.get(file_path)
+                        if entry is not None and stat is not None and entry[0] is not None and entry[0] == stat:
+                            current[file_path] = entry[2]
+                        else:
+                            candidates.append(file_path)
+
+                loaded = iter(load_canonical(candidates)) if candidates else iter(())
+                for file_path in batch:
+                    if should_stop is not None and should_stop():
+                        return changed
+                    symbols = current.get(file_path)
+                    if symbols is None:
+                        _, canonical = next(loaded)
+                        with self._lock:
+                            symbols, updated = self._update_file(file_path, stats[file_path], canonical)
+                        changed += updated
+                    seen.append(file_path)
+                    yield file_path, symbols
+
+            with self._lock:
+                # 그사이 다른 갱신이 끝났으면 그쪽 파일 목록이 더 최신이므로 삭제/순서는 건드리지 않는다
+                if generation == self._generation:
+                    current_paths = set(seen)
+                    for file_path in [path for path in self._files if path not in current_paths]:
+                        self._drop_file(file_path)
+                        self._dirty.add(file_path)
+                        changed += 1
+                    order = {file_path: idx for idx, file_path in enumerate(seen)}
+                    if order != self._order:
+                        self._order = order
+                        self._order_dirty = True
+                        changed += 1
+                    self._generation += 1
+                    self._refreshed_at = time.monotonic()
+            return changed
+        finally:
+            if changed:
+                with self._lock:
+                    self._save()
+
+    def _update_file(self, file_path: str, stat: Optional[tuple], canonical: dict) -> tuple[FileSymbols, bool]:
+        entry = self._files.get(file_path)
+        content_hash = canonical.get("hash", "")
+        stat = trusted_stat(stat)
+        if entry is not None and content_hash and entry[1] == content_hash:
+            # 내용은 같고 stat만 바뀐 경우: 다음 확인부터 stat으로 통과하도록 갱신
+            if entry[0] != stat:
+                entry[0] = stat
+                self._dirty.add(file_path)
+                return entry[2], True
+            return entry[2], False
+        symbols = extract_symbols(canonical)
+        self._set_file(file_path, stat, content_hash, symbols)
+        self._dirty.add(file_path)
+        return symbols, True
+
+    def _is_fresh(self, max_age: float) -> bool:
+        return self._refreshed_at is not None and time.monotonic() - self._refreshed_at < max_age
+
+    def refresh(
+        self,
+        file_paths: Iterable[str],
+        load_canonical: Callable[[list[str]], Iterator[tuple[str, dict]]],
+        max_age: float = 0.0,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> int:
+        """
+        파일 목록과 비교해 추가/변경/삭제된 파일의 레코드만 갱신
+
+        Args:
+            file_paths: 현재 루트 아래의 Java 파일 (탐색 순서)
+            load_canonical: 경로 목록 → (경로, 정규 인덱스) 이터레이터 (캐시를 거쳐 로드)
+            max_age: 마지막 갱신 후 이 시간(초)이 지나지 않았으면 확인을 건너뜀
+            should_stop: 참을 반환하면 남은 파일을 훑지 않고 멈춤 (취소)
+
+        Returns:
+            레코드가 바뀐 파일 수
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if self._is_fresh(max_age):
+                return 0
+            walk = self._walk(file_paths, load_canonical, should_stop)
+            while True:
+                try:
+                    next(walk)
+                except StopIteration as done:
+                    return done.value
+
+    def update_paths(
+        self,
+        file_paths: Iterable[str],
+        removed: Iterable[str],
+        load_canonical: Callable[[list[str]], Iterator[tuple[str, dict]]],
+    ) -> int:
+        """
+        알려 준 파일만 갱신 (파일 감시기의 변경 경로용, 루트 전체를 훑지 않음)
+
+        file_paths는 stat이 바뀐 파일만 다시 로드하고, 처음 보는 파일은 탐색 순서 자리에 끼워 넣습니다.
+        removed의 파일과 removed 디렉토리 아래의 파일은 file_paths에 없으면 테이블에서 지웁니다.
+        파일 목록이 바뀌면 진행 중인 전체 갱신이 끝날 때 이 변경을 되돌리지 않도록 세대를 올립니다.
+
+        Returns:
+            레코드가 바뀐 파일 수
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+        stat_mode = validation_mode() == "stat"
+        requested = dict.fromkeys(file_paths)
+        changed = 0
+        try:
+            stats: dict[str, Optional[tuple]] = {}
+            with self._lock:
+                for file_path in requested:
+                    stat = file_stat(file_path) if stat_mode else None
+                    entry = self._files.get(file_path)
+                    if entry is not None and stat is not None and entry[0] is not None and entry[0] == stat:
+                        continue
+                    stats[file_path] = stat
+            loaded = list(load_canonical(list(stats))) if stats else []
+
+            with self._lock:
+                added = []
+                for file_path, canonical in loaded:
+                    _, updated = self._update_file(file_path, stats[file_path], canonical)
+                    changed += updated
+                    if file_path not in self._order:
+                        added.append(file_path)
+                dropped = set()
+                directories = []
+                for path in removed:
+                    if path in self._files or path in self._order:
+                        dropped.add(path)
+                    else:
+                        directories.append(path.rstrip(os.sep) + os.sep)
+                if directories:
+                    prefixes = tuple(directories)
+                    dropped.update(path for path in self._order if path.startswith(prefixes))
+                    dropped.update(path for path in self._files if path.startswith(prefixes))
+                dropped.difference_update(requested)
+                for file_path in dropped:
+                    self._drop_file(file_path)
+                    self._dirty.add(file_path)
+                changed += len(dropped)
+                if added or dropped:
+                    ordered = [file_path for file_path in self._ordered_paths() if file_path not in dropped]
+                    for file_path in added:
+                        insort(ordered, file_path, key=lambda path: path_order_key(self.root_dir, path))
+                    self._order = {file_path: idx for idx, file_path in enumerate(ordered)}
+                    self._order_dirty = True
+                    self._generation += 1
+            return changed
+        finally:
+            if changed:
+                with self._lock:
+                    self._save()
+
+    # ----- 검색 -----
+
+    def _hits(
+        self,
+        query: str,
+        match_kind: str,
+        case_sensitive: bool,
+        excluded: int,
+        include_qualified: bool,
+    ) -> dict[str, tuple[FileSymbols, list[int]]]:
+        # 파일 경로 → (FileSymbols, 매치된 순번 목록 (오름차순)), 호출자가 잠금을 잡고 있어야 한다
+        indexes = [self._names]
+        if include_qualified:
+            indexes.append(self._qualified_index())
+        hits: dict[str, tuple[FileSymbols, set[int]]] = {}
+        for term_index in indexes:
+            for file_path, seq, symbols in term_index.search(query, case_sensitive, match_kind):
+                if match_kind != "any" and symbols.kinds[seq] != match_kind:
+                    continue
+                if symbols.flags[seq] & excluded:
+                    continue
+                hit = hits.get(file_path)
+                if hit is None:
+                    hit = hits[file_path] = (symbols, set())
+                hit[1].add(seq)
+        return {file_path: (symbols, sorted(seqs)) for file_path, (symbols, seqs) in hits.items()}
+
+    def search(
+        self,
+        query: str,
+        match_kind: str = "any",
+        case_sensitive: bool = False,
+        excluded: int = 0,
+        max_results: int = 50,
+        include_qualified: bool = False,
+    ) -> list[dict]:
+        """
+        이름(include_qualified면 qualifiedName도)에 query가 포함된 심볼을 탐색 순서대로 최대 max_results개 반환
+
+        매치를 파일별로 모은 뒤 파일을 탐색 순서로 정렬하고, 앞쪽 파일부터 max_results개가 찰 때까지만 결과를 만듭니다.
+        """
+        if max_results <= 0:
+            return []
+        with self._lock:
+            order = self._order
+            hits = self._hits(query, match_kind, case_sensitive, excluded, include_qualified)
+        return list(islice(self._ordered_results(hits, order), max_results))
+
+    @staticmethod
+    def _ordered_results(hits: dict[str, tuple[FileSymbols, list[int]]], order: dict[str, int]) -> Iterator[dict]:
+        for file_path in sorted((path for path in hits if path in order), key=order.__getitem__):
+            symbols, seqs = hits[file_path]
+            for seq in seqs:
+                yield symbols.result(file_path, seq)
+
+    def iter_search(
+        self,
+        file_paths: Iterable[str],
+        load_canonical: Callable[[list[str]], Iterator[tuple[str, dict]]],
+        query: str,
+        match_kind: str = "any",
+        case_sensitive: bool = False,
+        excluded: int = 0,
+        include_qualified: bool = False,
+        max_age: float = 0.0,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[dict]:
+        """
+        search()의 생성기 버전: 파일을 탐색 순서대로 훑으면서 매치를 찾는 대로 내보냄
+
+        갱신 주기(max_age) 안이면 테이블만으로 답합니다. 아니면 _walk()로 파일을 훑으면서 바뀌지 않은 파일은
+        3-gram 검색 결과를, 다시 로드한 파일은 FileSymbols.matching()을 써서 매치를 바로 내보내므로
+        첫 결과까지의 시간이 트리 크기와 관계없습니다. 소비자가 멈추면(close) 남은 파일은 훑지 않습니다.
+        결과와 순서는 refresh() 후 search()와 같습니다.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            fresh = self._is_fresh(max_age)
+            order = self._order
+            hits = self._hits(query, match_kind, case_sensitive, excluded, include_qualified)
+        if fresh:
+            yield from self._ordered_results(hits, order)
+            return
+
+        with closing(self._walk(file_paths, load_canonical, should_stop)) as walk:
+            for file_path, symbols in walk:
+                hit = hits.get(file_path)
+                if hit is not None and hit[0] is symbols:
+                    seqs = hit[1]
+                else:
+                    seqs = symbols.matching(query, match_kind, case_sensitive, excluded, include_qualified)
+                for seq in seqs:
+                    yield symbols.result(file_path, seq)
+
+    def search_ranked(
+        self,
+        query: str,
+        match_kind: str = "any",
+        case_sensitive: bool = False,
+        excluded: int = 0,
+        max_results: int = 50,
+    ) -> list[dict]:
+        """
+        이름이 query와 맞는 심볼을 점수순으로 최대 max_results개 반환 (parser/ranking.py)
+
+        후보 이름은 모든 이름을 이어 붙인 문자열에 대한 정규식 부분 수열 검색으로 먼저 거르고, 점수를 매긴 심볼을 생성기로 흘려
+        heapq.nsmallest(크기 max_results의 힙)로 상위 k개만 유지하므로 전체 매치를 리스트로 만들지 않습니다.
+        같은 점수는 이름 길이 → 이름 → 파일 경로 → 파일 내 순서로 정렬해 탐색 순서와 무관하게 결정적입니다.
+        """
+        if max_results <= 0:
+            return []
+        scorer = QueryScorer(query, case_sensitive)
+        with self._lock:
+            names = self._names
+
+            def scored() -> Iterator[tuple]:
+                for term in names.scan(scorer.scan_pattern, case_sensitive):
+                    if match_kind != "any" and match_kind not in names.kinds[term]:
+                        continue
+                    score = scorer.score(term)
+                    if score is None:
+                        continue
+                    for file_path, entries in names.by_term[term].items():
+                        if file_path not in self._order:
+                            continue
+                        for seq, symbols in entries:
+                            if match_kind != "any" and symbols.kinds[seq] != match_kind:
+                                continue
+                            if symbols.flags[seq] & excluded:
+                                continue
+                            yield (score, len(term), term, file_path, seq, symbols)
+
+            top = heapq.nsmallest(max_results, scored(), key=lambda hit: hit[:5])
+
+        results = []
+        for score, _, _, file_path, seq, symbols in top:
+            result = symbols.result(file_path, seq)
+            result["match"] = MATCH_TYPES[score[0]]
+            results.append(result)
+        return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rootDir": self.root_dir,
+                "files": len(self._files),
+                "names": len(self._names),
+                "trigrams": len(self._names.postings),
+                "symbols": sum(len(entry[2]) for entry in self._files.values()),
+            }
+
+
+def _frame(record: bytes) -> bytes:
+    return _FRAME_HEADER.pack(len(record)) + record
+
+
+def _iter_frames(data: bytes) -> Iterator[tuple[int, object]]:
+    """저널 프레임을 (프레임 끝 오프셋, 레코드)로 순회 (잘리거나 깨진 프레임에서 ValueError)"""
+    view = memoryview(data)
+    offset = 0
+    while offset < len(data):
+        if offset + _FRAME_HEADER.size > len(data):
+            raise ValueError("Truncated journal frame")
+        (size,) = _FRAME_HEADER.unpack_from(data, offset)
+        start = offset + _FRAME_HEADER.size
+        if start + size > len(data):
+            raise ValueError("Truncated journal frame")
+        try:
+            record = decode_any(bytes(view[start : start + size]))
+        except Exception as exc:
+            raise ValueError("Corrupt journal frame") from exc
+        offset = start + size
+        yield offset, record
+
+
+def symbol_table_for(root_dir: str, cache, scope: str = "") -> SymbolTable:
+    """
+    (루트 디렉토리, 캐시 디렉토리, 탐색 규칙)별 심볼 테이블 (프로세스 안에서 재사용)
+
+    테이블은 캐시 디렉토리의 symbols/ 아래에 캐시와 같은 직렬화 형식으로 저장됩니다.
+    상대 경로 루트는 결과 경로도 상대 경로이므로 작업 디렉토리까지 키에 포함합니다.
+    scope는 탐색 규칙 키(DiscoveryRules.key())로, 규칙마다 파일 목록이 다르므로 테이블을 나눕니다.
+    """
+    absolute = os.path.abspath(root_dir)
+    key = (absolute, root_dir, str(cache.cache_dir), scope)
+    with _TABLES_LOCK:
+        table = _TABLES.get(key)
+        if table is None:
+            disk = getattr(cache, "backend", cache)
+            serializer = getattr(disk, "serializer", None)
+            identity = f"{absolute}\0{root_dir}" + (f"\0{scope}" if scope else "")
+            digest = hashlib.sha1(identity.encode("utf-8", errors="replace")).hexdigest()
+            extension = serializer.extension if serializer is not None else ".bin"
+            storage_path = Path(cache.cache_dir) / SYMBOLS_DIR_NAME / f"{digest}{extension}"
+            table = SymbolTable(root_dir, storage_path, serializer, getattr(cache, "lock", None))
+            _TABLES[key] = table
+        return table
+
+
+def invalidate_symbol_tables() -> None:
+    """모든 심볼 테이블이 다음 검색에서 파일을 다시 확인하도록 표시 (파일 감시 등에서 사용)"""
+    with _TABLES_LOCK:
+        tables = list(_TABLES.values())
+    for table in tables:
+        table.invalidate()
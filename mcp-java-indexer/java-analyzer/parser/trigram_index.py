@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from typing import Iterable, Iterator, Optional
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[idx : idx + 3] for idx in range(len(text) - 2)}
+
+
+class TermIndex:
+    """
+    검색어(term) → 파일별 심볼 레코드, 그리고 소문자 3-gram → term 게시 목록(posting list)
+
+    부분 문자열 검색은 쿼리의 3-gram 게시 목록을 작은 것부터 교집합한 뒤 남은 후보만 실제로 비교합니다.
+    게시 목록은 소문자 기준이므로 대소문자 구분 검색에서도 후보 집합(상위 집합)으로 쓰고 비교만 구분해서 합니다.
+    term별 kind 개수를 함께 두어 matchKind에 맞는 심볼이 없는 term은 레코드를 보기 전에 건너뜁니다.
+    3글자 미만 쿼리는 게시 목록으로 좁힐 수 없으므로 모든 term을 비교합니다.
+    """
+
+    def __init__(self) -> None:
+        # term → {파일 경로: [(파일 내 순번, 레코드)]}
+        # (심볼 테이블은 레코드 대신 파일의 FileSymbols를 넣고 순번으로 열에서 꺼낸다)
+        self.by_term: dict[str, dict[str, list[tuple[int, object]]]] = {}
+        self.lower: dict[str, str] = {}
+        self.kinds: dict[str, dict[str, int]] = {}
+        self.postings: dict[str, set[str]] = {}
+        # scan()용 줄바꿈으로 이어 붙인 term 목록 (대소문자 구분 여부별, term이 바뀌면 다시 만든다)
+        self._joined: dict[bool, tuple[str, list[str], list[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.by_term)
+
+    def add(
+        self,
+        term: str,
+        file_path: str,
+        seq: int,
+        record: object,
+        kind: Optional[str],
+        index: bool = True,
+    ) -> None:
+        by_path = self.by_term.get(term)
+        if by_path is None:
+            self._joined.clear()
+            by_path = self.by_term[term] = {}
+            lowered = self.lower[term] = term.lower()
+            self.kinds[term] = {}
+            if not index:
+                lowered = ""
+            for gram in trigrams(lowered):
+                posting = self.postings.get(gram)
+                if posting is None:
+                    self.postings[gram] = {term}
+                else:
+                    posting.add(term)
+        by_path.setdefault(file_path, []).append((seq, record))
+        kinds = self.kinds[term]
+        kinds[kind] = kinds.get(kind, 0) + 1
+
+    def remove_file(self, file_path: str, terms: Iterable[tuple[str, Optional[str]]]) -> None:
+        """file_path의 레코드를 (term, kind) 목록 기준으로 제거 (같은 term이 여러 번 나와도 됨)"""
+        for term, kind in terms:
+            by_path = self.by_term.get(term)
+            if by_path is None:
+                continue
+            by_path.pop(file_path, None)
+            kinds = self.kinds[term]
+            remaining = kinds.get(kind, 0) - 1
+            if remaining > 0:
+                kinds[kind] = remaining
+            else:
+                kinds.pop(kind, None)
+            if not by_path:
+                self._drop_term(term)
+
+    def _drop_term(self, term: str) -> None:
+        self._joined.clear()
+        del self.by_term[term]
+        del self.kinds[term]
+        for gram in trigrams(self.lower.pop(term)):
+            posting = self.postings.get(gram)
+            if posting is None:
+                continue
+            posting.discard(term)
+            if not posting:
+                del self.postings[gram]
+
+    def candidate_terms(self, query_lower: str) -> Iterable[str]:
+        grams = trigrams(query_lower)
+        if not grams:
+            return self.by_term.keys()
+        postings = []
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if not posting:
+                return ()
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return candidates
+
+    def search(self, query: str, case_sensitive: bool, match_kind: str) -> Iterator[tuple[str, int, object]]:
+        """query를 포함하는 term의 레코드를 (파일 경로, 순번, 레코드)로 반환 (순서 없음)"""
+        query_lower = query.lower()
+        for term in self.candidate_terms(query_lower):
+            if match_kind != "any" and match_kind not in self.kinds[term]:
+                continue
+            if case_sensitive:
+                if query not in term:
+                    continue
+            elif query_lower not in self.lower[term]:
+                continue
+            for file_path, entries in self.by_term[term].items():
+                for seq, record in entries:
+                    yield file_path, seq, record
+
+    def _joined_terms(self, case_sensitive: bool) -> tuple[str, list[str], list[int]]:
+        joined = self._joined.get(case_sensitive)
+        if joined is None:
+            terms = list(self.by_term)
+            texts = terms if case_sensitive else [self.lower[term] for term in terms]
+            starts: list[int] = []
+            offset = 0
+            for text in texts:
+                starts.append(offset)
+                offset += len(text) + 1
+            joined = ("\n".join(texts), terms, starts)
+            self._joined[case_sensitive] = joined
+        return joined
+
+    def scan(self, pattern: re.Pattern, case_sensitive: bool) -> Iterator[str]:
+        """
+        pattern이 매치되는 term을 정규식 한 번의 연속 검색으로 찾음
+
+        3-gram으로 좁힐 수 없는 검색(부분 수열 등)에서 term마다 파이썬 호출을 하지 않도록
+        모든 term을 줄바꿈으로 이어 붙인 문자열을 훑습니다. pattern은 줄바꿈을 넘어가면 안 됩니다.
+        대소문자 무시 검색이면 pattern은 소문자 term과 비교됩니다.
+        """
+        text, terms, starts = self._joined_terms(case_sensitive)
+        position = 0
+        while True:
+            match = pattern.search(text, position)
+            if match is None:
+                return
+            idx = bisect_right(starts, match.start()) - 1
+            yield terms[idx]
+            # 같은 term에서 여러 번 매치되지 않도록 다음 term으로 건너뛴다
+            if idx + 1 >= len(starts):
+                return
+            position = starts[idx + 1]
+
+    def export_postings(self) -> dict[str, list[str]]:
+        return {gram: list(posting) for gram, posting in self.postings.items()}
+
+    def import_postings(self, postings: dict[str, list[str]]) -> None:
+        """영속화된 게시 목록 복원 (term은 add(..., index=False)로 이미 등록된 상태여야 함)"""
+        self.postings = {gram: set(terms) for gram, terms in postings.items()}
@@ -0,0 +1,80 @@
+import os
+import time
+
+import pytest
+
+from cache.cache_store import CacheStore, SqliteCacheStore
+from cache.gc import GcPolicy, collect_garbage
+from parser.indexer import CANONICAL_CACHE_KEY, LIVE_CACHE_KEYS, load_canonical_index
+
+
+@pytest.fixture(params=[CacheStore, SqliteCacheStore], ids=["files", "sqlite"])
+def store(request, tmp_path):
+    return request.param(tmp_path / "cache-root")
+
+
+def _java_file(tmp_path, name: str) -> str:
+    path = tmp_path / name
+    path.write_text(f"class {name[:-5]} {{ void run() {{}} }}\n", encoding="utf-8")
+    return str(path)
+
+
+def _entry_paths(store) -> set:
+    return {entry.file_path for entry in store.iter_entries()}
+
+
+def test_gc_removes_orphans_and_obsolete_option_keys(store, tmp_path):
+    kept = _java_file(tmp_path, "Kept.java")
+    deleted = _java_file(tmp_path, "Deleted.java")
+    load_canonical_index(kept, store)
+    load_canonical_index(deleted, store)
+    store.save(kept, {"hash": "old", "filePath": kept}, "legacy-options-hash")
+    os.remove(deleted)
+
+    report = collect_garbage(store, GcPolicy(live_options_keys=LIVE_CACHE_KEYS))
+
+    assert report["removed"]["orphan"] == 1
+    assert report["removed"]["obsolete"] == 1
+    assert report["reclaimedBytes"] > 0
+    assert [(e.file_path, e.options_key) for e in store.iter_entries()] == [(kept, CANONICAL_CACHE_KEY)]
+
+
+def test_gc_keeps_relative_path_entries_from_another_cwd(store, tmp_path, monkeypatch):
+    project = tmp_path / "project"
+    project.mkdir()
+    _java_file(project, "Relative.java")
+    monkeypatch.chdir(project)
+    load_canonical_index("Relative.java", store)
+
+    # 다른 디렉토리에서 실행해도 인덱싱 당시 기준 경로를 알 수 없으므로 지우지 않는다
+    monkeypatch.chdir(tmp_path)
+    report = collect_garbage(store, GcPolicy())
+
+    assert report["removed"]["orphan"] == 0
+    assert _entry_paths(store) == {"Relative.java"}
+
+
+def test_gc_enforces_size_budget_by_least_recent_access(store, tmp_path):
+    paths = [_java_file(tmp_path, f"File{idx}.java") for idx in range(4)]
+    for path in paths:
+        load_canonical_index(path, store)
+        time.sleep(0.01)
+    entry_size = max(entry.size_bytes for entry in store.iter_entries())
+
+    report = collect_garbage(store, GcPolicy(max_bytes=entry_size * 2))
+
+    assert report["removed"]["overBudget"] == 2
+    assert report["remainingBytes"] <= entry_size * 2
+    assert _entry_paths(store) == set(paths[2:])
+
+
+def test_gc_expires_entries_and_supports_dry_run(store, tmp_path):
+    path = _java_file(tmp_path, "Old.java")
+    load_canonical_index(path, store)
+
+    preview = collect_garbage(store, GcPolicy(max_age_days=-1), dry_run=True)
+    assert preview["removed"]["expired"] == 1
+    assert _entry_paths(store) == {path}
+
+    collect_garbage(store, GcPolicy(max_age_days=-1))
+    assert _entry_paths(store) == set()
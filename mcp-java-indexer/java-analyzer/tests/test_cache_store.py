@@ -0,0 +1,226 @@
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from cache import serializers
+from cache.cache_store import CacheStore, MemoryCacheStore, SqliteCacheStore, file_stat
+from cache.gc import GcPolicy, collect_garbage
+from cache.serializers import MAGIC, JsonSerializer, MarshalSerializer, SerializationError, decode_any
+from parser import indexer
+from parser.indexer import CANONICAL_CACHE_KEY, index_java_file, index_java_files, load_canonical_index
+
+from tests.conftest import fixture_path
+
+
+@pytest.fixture(params=[CacheStore, SqliteCacheStore], ids=["json", "sqlite"])
+def store(request, tmp_path):
+    return request.param(tmp_path)
+
+
+def test_save_and_load_roundtrip(store):
+    data = {"filePath": "A.java", "hash": "abc", "classes": [{"name": "한글"}]}
+    store.save("A.java", data, "opts")
+    assert store.load("A.java", "abc", "opts") == data
+    assert store.load("A.java", "other-hash", "opts") is None
+    assert store.load("A.java", "abc", "other-opts") is None
+    assert store.load("B.java", "abc", "opts") is None
+
+
+@pytest.mark.parametrize("serializer", [JsonSerializer(), MarshalSerializer()], ids=["json", "marshal"])
+def test_serializer_roundtrip(serializer):
+    data = {"hash": "h", "javadocText": {"1:3": "/** 한글 문서 */"}, "errors": [], "lineCount": 3, "x": None}
+    payload = serializer.encode(data)
+    assert serializer.decode(payload) == data
+    assert decode_any(payload) == data
+
+
+def test_marshal_payload_carries_version_header():
+    payload = MarshalSerializer().encode({"hash": "h"})
+    assert payload.startswith(MAGIC)
+    stale = payload[: len(MAGIC)] + bytes([payload[len(MAGIC)] + 1]) + payload[len(MAGIC) + 1 :]
+    with pytest.raises(SerializationError):
+        decode_any(stale)
+
+
+def test_marshal_payload_from_other_python_is_miss(tmp_path, monkeypatch):
+    store = CacheStore(tmp_path, MarshalSerializer())
+    store.save("A.java", {"hash": "h"})
+    assert store.load("A.java", "h") == {"hash": "h"}
+
+    # marshal.version이 같아도 다른 파이썬 버전이 쓴 항목은 캐시 미스
+    monkeypatch.setattr(serializers, "_PYTHON_VERSION", bytes((sys.version_info[0], sys.version_info[1] + 1)))
+    assert store.load("A.java", "h") is None
+    with pytest.raises(SerializationError):
+        decode_any(store._cache_path("A.java", None).read_bytes())
+
+
+def test_store_treats_unreadable_payload_as_miss(tmp_path):
+    store = CacheStore(tmp_path, MarshalSerializer())
+    store.save("A.java", {"hash": "h"})
+    cache_file = store._cache_path("A.java", None)
+    cache_file.write_bytes(cache_file.read_bytes()[:8])
+    assert store.load("A.java", "h") is None
+
+
+def test_load_many_filters_stale_entries(store):
+    store.save("A.java", {"hash": "a1"}, "opts")
+    store.save("B.java", {"hash": "b1"}, "opts")
+    found = store.load_many({"A.java": "a1", "B.java": "b2", "C.java": "c1"}, "opts")
+    assert set(found) == {"A.java"}
+
+
+def test_sqlite_keeps_single_database_file(tmp_path):
+    store = SqliteCacheStore(tmp_path)
+    for idx in range(20):
+        store.save(f"F{idx}.java", {"hash": str(idx)})
+    names = {p.name for p in store.cache_dir.iterdir()}
+    assert not any(name.endswith(".json") for name in names)
+    assert SqliteCacheStore.DB_FILE_NAME in names
+
+
+def test_index_java_files_matches_single_file_index(store):
+    paths = [fixture_path(name).as_posix() for name in ("SimpleClass.java", "JavadocOnly.java")]
+    bulk = index_java_files(paths, {}, store)
+    # 두 번째 호출은 캐시에서 일괄 로드
+    assert index_java_files(paths, {}, store) == bulk
+    assert [index_java_file(path, {}, store) for path in paths] == bulk
+
+
+def _write_java(path, body: str, age_seconds: int = 60) -> str:
+    path.write_text(body, encoding="utf-8")
+    stamp = time.time() - age_seconds
+    os.utime(path, (stamp, stamp))
+    return str(path)
+
+
+def test_stat_hit_skips_reading_source(store, tmp_path, monkeypatch):
+    file_path = _write_java(tmp_path / "Stat.java", "class Stat { void a() {} }\n")
+    first = index_java_file(file_path, {}, store)
+
+    def fail_read(_path):
+        raise AssertionError("source must not be read on a stat hit")
+
+    monkeypatch.setattr(indexer, "_read_file_bytes", fail_read)
+    assert index_java_file(file_path, {}, store) == first
+    assert index_java_files([file_path], {}, store) == [first]
+
+
+def test_stat_change_falls_back_to_hash(store, tmp_path):
+    file_path = _write_java(tmp_path / "Stat.java", "class Stat { void a() {} }\n")
+    index_java_file(file_path, {}, store)
+    _write_java(tmp_path / "Stat.java", "class Stat { void b() {} }\n", age_seconds=30)
+    methods = index_java_file(file_path, {}, store)["classes"][0]["methods"]
+    assert [m["name"] for m in methods] == ["b"]
+
+
+def test_recently_modified_file_is_not_trusted_by_stat(store, tmp_path):
+    file_path = _write_java(tmp_path / "Fresh.java", "class Fresh {}\n", age_seconds=0)
+    data = load_canonical_index(file_path, store)
+    assert store.load_by_stat(file_path, file_stat(file_path), CANONICAL_CACHE_KEY) is None
+    assert store.load(file_path, data["hash"], CANONICAL_CACHE_KEY) == data
+
+
+def test_memory_cache_serves_hits_without_backend(tmp_path, monkeypatch):
+    backend = CacheStore(tmp_path)
+    memory = MemoryCacheStore(backend, max_bytes=10 * 1024 * 1024)
+    file_path = _write_java(tmp_path / "Mem.java", "class Mem { void a() {} }\n")
+    first = load_canonical_index(file_path, memory)
+
+    def fail_load(*_args, **_kwargs):
+        raise AssertionError("memory hit must not reach the disk backend")
+
+    monkeypatch.setattr(backend, "load", fail_load)
+    monkeypatch.setattr(backend, "load_by_stat", fail_load)
+    assert load_canonical_index(file_path, memory) is first
+    assert memory.stats()["hits"] >= 1
+
+
+def test_memory_cache_evicts_least_recently_used(tmp_path):
+    memory = MemoryCacheStore(CacheStore(tmp_path), max_bytes=4000)
+    payload = {"hash": "h", "classes": ["x" * 1000]}
+    memory.save("A.java", dict(payload))
+    memory.save("B.java", dict(payload))
+    assert memory.load("A.java", "h") is not None
+    memory.save("C.java", dict(payload))
+
+    stats = memory.stats()
+    assert stats["evictions"] == 1
+    assert stats["currentBytes"] <= stats["maxBytes"]
+    # B가 가장 오래 사용되지 않았으므로 제거되고, 이후 조회는 디스크에서 다시 채워진다
+    assert memory.load("B.java", "h") == payload
+    assert memory.stats()["misses"] >= 1
+
+
+def test_option_combinations_share_one_canonical_entry(store, monkeypatch):
+    path = fixture_path("JavadocOnly.java").as_posix()
+    parses = []
+    original = indexer._index_source
+
+    def counting_index_source(*args):
+        parses.append(args[0])
+        return original(*args)
+
+    monkeypatch.setattr(indexer, "_index_source", counting_index_source)
+    default_view = index_java_file(path, {}, store)
+    preview_view = index_java_file(path, {"maxJavadocPreviewChars": 10, "includePrivate": False}, store)
+    no_members = index_java_file(path, {"includeFields": False, "includeConstructors": False}, store)
+
+    assert parses == [path]
+    assert "javadocText" not in default_view
+    method = preview_view["classes"][0]["methods"][0]
+    assert method["javadoc"]["preview"].startswith("  /**")
+    assert len(method["javadoc"]["preview"]) == 10
+    assert default_view["classes"][0]["methods"][0]["javadoc"]["preview"] is None
+    assert no_members["classes"][0]["fields"] == []
+
+
+_STRESS_KEYS = [f"Shared{idx}.java" for idx in range(4)]
+
+
+def _stress_writer(store_cls, root: str, writer_id: int, rounds: int) -> int:
+    store = store_cls(Path(root))
+    torn = 0
+    for round_idx in range(rounds):
+        for key in _STRESS_KEYS:
+            # 한 번의 write 호출로 끝나지 않을 만큼 큰 항목
+            blob = f"{writer_id}:{round_idx}:" * 20000
+            store.save(key, {"hash": "shared", "blob": blob, "writer": writer_id, "round": round_idx})
+            data = store.load(key, "shared")
+            if data is None or data["blob"] != f"{data['writer']}:{data['round']}:" * 20000:
+                torn += 1
+    return torn
+
+
+@pytest.mark.parametrize("store_cls", [CacheStore, SqliteCacheStore], ids=["files", "sqlite"])
+def test_concurrent_writer_processes_never_see_torn_entries(store_cls, tmp_path):
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(8) as pool:
+        torn = pool.starmap(_stress_writer, [(store_cls, str(tmp_path), writer, 15) for writer in range(8)])
+
+    assert sum(torn) == 0
+    store = store_cls(tmp_path)
+    assert all(store.load(key, "shared") is not None for key in _STRESS_KEYS)
+    assert sorted(entry.options_key for entry in store.iter_entries()) == [""] * len(_STRESS_KEYS)
+    if store_cls is CacheStore:
+        assert not [name for name in os.listdir(store.cache_dir) if name.endswith(".tmp")]
+
+
+def test_gc_removes_stale_temp_files_only(tmp_path):
+    store = CacheStore(tmp_path)
+    store.save("A.java", {"hash": "h"})
+    stale = store.cache_dir / ".abc.bin.1.deadbeef.tmp"
+    fresh = store.cache_dir / ".abc.bin.2.cafebabe.tmp"
+    stale.write_bytes(b"partial")
+    fresh.write_bytes(b"in progress")
+    old = time.time() - 3600
+    os.utime(stale, (old, old))
+
+    report = collect_garbage(store, GcPolicy(remove_orphans=False))
+
+    assert report["removed"]["invalid"] == 1
+    assert not stale.exists() and fresh.exists()
+    assert store.load("A.java", "h") == {"hash": "h"}
@@ -0,0 +1,61 @@
+import json
+import marshal
+
+from cache.cache_store import _estimate_size
+from parser.indexer import _index_source
+from parser.symbol_table import FileSymbols, extract_symbols
+
+
+SOURCE = b"""package com.example;
+
+public class Shared {
+  private int first;
+  private int second;
+  public void run(String name, int count) {}
+  public void stop(String name, int count) {}
+  public static class Inner { public void run(String name, int count) {} }
+}
+"""
+
+
+def _index() -> dict:
+    return _index_source("Shared.java", SOURCE, "h")
+
+
+def test_equal_small_values_are_shared_between_symbols():
+    cls = _index()["classes"][0]
+    first, second = cls["fields"]
+    run, stop = cls["methods"]
+    assert first["modifiers"] is second["modifiers"]
+    assert run["params"][0] is stop["params"][0]
+    assert run["modifiers"] is stop["modifiers"] is cls["modifiers"]
+    assert first["javadoc"] is run["javadoc"]
+    assert cls["innerClasses"][0]["methods"][0]["params"] == run["params"]
+
+
+def test_sharing_survives_marshal_and_matches_unshared_schema():
+    index = _index()
+    loaded = marshal.loads(marshal.dumps(index))
+    assert loaded == json.loads(json.dumps(index))
+    first, second = loaded["classes"][0]["fields"]
+    assert first["modifiers"] is second["modifiers"]
+    # 메모리 캐시 한도 계산은 공유된 객체를 한 번만 센다
+    assert _estimate_size(loaded) < _estimate_size(json.loads(json.dumps(index)))
+
+
+def test_file_symbols_round_trip_columns():
+    symbols = extract_symbols(_index())
+    records = [symbols.record(seq) for seq in range(len(symbols))]
+    assert [record[4] for record in records] == [
+        "com.example.Shared",
+        "com.example.Shared#first",
+        "com.example.Shared#second",
+        "com.example.Shared#run",
+        "com.example.Shared#stop",
+        "com.example.Shared.Inner",
+        "com.example.Shared.Inner#run",
+    ]
+    assert records[1][2] == 3  # FLAG_PRIVATE | FLAG_FIELD (내부 플래그는 레코드에 나오지 않는다)
+
+    restored = FileSymbols.from_columns(json.loads(json.dumps(symbols.columns())))
+    assert [restored.record(seq) for seq in range(len(restored))] == records
@@ -0,0 +1,161 @@
+import os
+import time
+
+import pytest
+
+from parser import discovery
+from parser.discovery import DiscoveryRules, IgnoreRules, discovery_rules, iter_java_files
+
+
+@pytest.fixture(autouse=True)
+def _fresh_listing_cache():
+    discovery.clear_listing_cache()
+    yield
+    discovery.clear_listing_cache()
+
+
+def _touch(root, relative: str, body: str = "class A {}\n") -> None:
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body, encoding="utf-8")
+
+
+def _found(root, rules=None) -> list[str]:
+    return [os.path.relpath(path, root).replace(os.sep, "/") for path in iter_java_files(str(root), rules)]
+
+
+def _age(root, seconds: int = 60) -> None:
+    # 디렉토리 목록 캐시는 racy 구간(방금 바뀐 mtime)을 지난 디렉토리만 보관한다
+    stamp = time.time() - seconds
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, (stamp, stamp))
+
+
+def test_prunes_default_directories(tmp_path):
+    _touch(tmp_path, "src/A.java")
+    _touch(tmp_path, ".git/B.java")
+    _touch(tmp_path, "node_modules/pkg/C.java")
+    _touch(tmp_path, ".gradle/D.java")
+    _touch(tmp_path, ".mcp-java-index-cache/E.java")
+    _touch(tmp_path, "src/notes.txt", "x")
+
+    assert _found(tmp_path) == ["src/A.java"]
+
+
+def test_prunes_build_output_only_next_to_build_file(tmp_path):
+    _touch(tmp_path, "pom.xml", "<project/>")
+    _touch(tmp_path, "target/generated/G.java")
+    _touch(tmp_path, "build/B.java")
+    # 빌드 파일이 없는 디렉토리의 build는 패키지 이름일 수 있다
+    _touch(tmp_path, "src/com/example/build/Builder.java")
+
+    assert _found(tmp_path) == ["src/com/example/build/Builder.java"]
+
+
+def test_order_matches_sorted_rglob(tmp_path):
+    for relative in ("b/B.java", "a/Z.java", "a/c/C.java", "A.java", "a/A.java"):
+        _touch(tmp_path, relative)
+
+    found = _found(tmp_path)
+    expected = sorted(str(path.relative_to(tmp_path).as_posix()) for path in tmp_path.rglob("*.java"))
+    assert sorted(found) == expected
+    # 디렉토리의 파일을 먼저, 하위 디렉토리는 이름순
+    assert found == ["A.java", "a/A.java", "a/Z.java", "a/c/C.java", "b/B.java"]
+
+
+def test_gitignore_rules(tmp_path):
+    _touch(tmp_path, ".gitignore", "generated/\n*Test.java\n!KeepTest.java\n/Top.java\n")
+    _touch(tmp_path, "generated/G.java")
+    _touch(tmp_path, "src/generated/H.java")
+    _touch(tmp_path, "src/FooTest.java")
+    _touch(tmp_path, "src/KeepTest.java")
+    _touch(tmp_path, "Top.java")
+    _touch(tmp_path, "src/Top.java")
+    _touch(tmp_path, "src/sub/.gitignore", "Local.java\n")
+    _touch(tmp_path, "src/sub/Local.java")
+    _touch(tmp_path, "src/Local.java")
+
+    assert _found(tmp_path) == ["src/KeepTest.java", "src/Local.java", "src/Top.java"]
+    assert len(_found(tmp_path, DiscoveryRules(use_gitignore=False))) == 8
+
+
+def test_gitignore_of_enclosing_repository(tmp_path):
+    (tmp_path / ".git" / "info").mkdir(parents=True)
+    (tmp_path / ".git" / "info" / "exclude").write_text("Scratch.java\n", encoding="utf-8")
+    _touch(tmp_path, ".gitignore", "project/gen/\n")
+    _touch(tmp_path, "project/gen/G.java")
+    _touch(tmp_path, "project/src/A.java")
+    _touch(tmp_path, "project/src/Scratch.java")
+
+    assert _found(tmp_path / "project") == ["src/A.java"]
+
+
+def test_info_exclude_of_repository_root(tmp_path):
+    (tmp_path / ".git" / "info").mkdir(parents=True)
+    (tmp_path / ".git" / "info" / "exclude").write_text("Scratch.java\ngen/\n", encoding="utf-8")
+    _touch(tmp_path, ".gitignore", "!Keep/Scratch.java\n")
+    _touch(tmp_path, "gen/G.java")
+    _touch(tmp_path, "src/A.java")
+    _touch(tmp_path, "src/Scratch.java")
+    _touch(tmp_path, "Keep/Scratch.java")
+
+    # 인덱싱 루트가 저장소 루트여도 .git/info/exclude를 적용하고, .gitignore가 그보다 우선한다
+    assert _found(tmp_path) == ["Keep/Scratch.java", "src/A.java"]
+
+
+def test_include_and_exclude_globs(tmp_path):
+    _touch(tmp_path, "core/src/A.java")
+    _touch(tmp_path, "core/src/legacy/Old.java")
+    _touch(tmp_path, "web/src/W.java")
+
+    assert _found(tmp_path, DiscoveryRules(include=("core",))) == ["core/src/A.java", "core/src/legacy/Old.java"]
+    assert _found(tmp_path, DiscoveryRules(exclude=("legacy/",))) == ["core/src/A.java", "web/src/W.java"]
+    assert _found(tmp_path, DiscoveryRules(include=("**/W.java", "core/src/*.java"))) == [
+        "core/src/A.java",
+        "web/src/W.java",
+    ]
+
+
+def test_discovery_rules_from_env_and_options(monkeypatch):
+    monkeypatch.setenv("MCP_JAVA_INDEX_EXCLUDE", "gen/, legacy/")
+    monkeypatch.setenv("MCP_JAVA_INDEX_GITIGNORE", "0")
+    rules = discovery_rules({"exclude": ["tmp/"], "include": "src"})
+
+    assert rules == DiscoveryRules(include=("src",), exclude=("gen/", "legacy/", "tmp/"), use_gitignore=False)
+    assert discovery_rules({"useGitignore": True}).use_gitignore
+    monkeypatch.delenv("MCP_JAVA_INDEX_EXCLUDE")
+    monkeypatch.delenv("MCP_JAVA_INDEX_GITIGNORE")
+    assert discovery_rules().key() == ""
+
+
+def test_ignore_rules_matching():
+    rules = IgnoreRules(["# comment", "", "*.java", "!Keep.java", "docs/**/draft/", r"\#hash.java"])
+
+    assert rules.match("a/B.java", False) is True
+    assert rules.match("a/Keep.java", False) is False
+    assert rules.match("docs/x/y/draft", True) is True
+    assert rules.match("docs/x/y/draft", False) is None
+    assert rules.match("README", False) is None
+
+
+def test_listing_cache_skips_unchanged_directories(tmp_path, monkeypatch):
+    _touch(tmp_path, "a/A.java")
+    _touch(tmp_path, "b/B.java")
+    _age(tmp_path)
+    assert _found(tmp_path) == ["a/A.java", "b/B.java"]
+
+    scanned = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path):
+        scanned.append(os.path.relpath(path, tmp_path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(discovery.os, "scandir", counting_scandir)
+    assert _found(tmp_path) == ["a/A.java", "b/B.java"]
+    assert scanned == []
+
+    # 바뀐 디렉토리만 다시 읽는다
+    _touch(tmp_path, "b/C.java")
+    assert _found(tmp_path) == ["a/A.java", "b/B.java", "b/C.java"]
+    assert scanned == ["b"]
@@ -0,0 +1,112 @@
+import pytest
+
+from parser import indexer
+from parser.incremental import compute_edit
+
+
+SOURCE = b"""package com.example;
+
+/** \xec\xb2\xab \xeb\xb2\x88\xec\xa7\xb8 */
+public class First {
+  /** \xec\xa1\xb0\xed\x9a\x8c */
+  public int find(int id) { return id; }
+}
+
+/**
+ * \xeb\x91\x90 \xeb\xb2\x88\xec\xa7\xb8
+ */
+class Second {
+  private String name;
+  void run() { int value = 1; }
+}
+
+interface Third {
+  void call();
+}
+"""
+
+
+@pytest.fixture(autouse=True)
+def _clear_retained():
+    indexer._RETAINED_TREES.clear()
+    yield
+    indexer._RETAINED_TREES.clear()
+
+
+def _fresh(source: bytes) -> dict:
+    indexer._RETAINED_TREES.clear()
+    result = indexer._index_source("Edited.java", source, "h")
+    indexer._RETAINED_TREES.clear()
+    return result
+
+
+def _incremental(before: bytes, after: bytes) -> tuple[dict, dict]:
+    previous = indexer._index_source("Edited.java", before, "h")
+    return previous, indexer._index_source("Edited.java", after, "h")
+
+
+def test_compute_edit_points():
+    old = b"ab\ncd\nef"
+    new = b"ab\ncXYd\nef"
+    edit = compute_edit(old, new)
+    assert (edit.start_byte, edit.old_end_byte, edit.new_end_byte) == (4, 4, 6)
+    assert (edit.start_point, edit.old_end_point, edit.new_end_point) == ((1, 1), (1, 1), (1, 3))
+    assert edit.row_delta == 0
+    assert compute_edit(old, old) is None
+    assert compute_edit(b"a\nb", b"a\n\nb").row_delta == 1
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        (b"int value = 1;", b"int value = 42;"),
+        (b"void run() {", b"void run() {\n"),
+        (b" * \xeb\x91\x90 \xeb\xb2\x88\xec\xa7\xb8", b" * changed"),
+        (b"/** \xec\xa1\xb0\xed\x9a\x8c */", b"/* plain */"),
+        (b"package com.example;", b"package com.other;"),
+        (b"interface Third {", b"interface Third extends Runnable {"),
+        (b"  void call();\n}", b"  void call(\n}"),
+        # 편집은 Javadoc 위쪽 빈 줄뿐이지만 새 블록 주석이 Second의 Javadoc을 삼킨다
+        (b"}\n\n/**\n", b"}\n/*\n/**\n"),
+    ],
+)
+def test_incremental_result_matches_full_parse(old, new):
+    after = SOURCE.replace(old, new, 1)
+    assert after != SOURCE
+    _, result = _incremental(SOURCE, after)
+    assert result == _fresh(after)
+
+
+def test_classes_outside_edit_are_reused():
+    after = SOURCE.replace(b"int value = 1;", b"int value = 7;")
+    previous, result = _incremental(SOURCE, after)
+    first, second, third = result["classes"]
+    assert first is previous["classes"][0]
+    assert third is previous["classes"][2]
+    assert second is not previous["classes"][1]
+    assert second == previous["classes"][1]
+
+
+def test_byte_shift_moves_offsets_of_reused_classes():
+    after = SOURCE.replace(b"int value = 1;", b"int value = 42;")
+    previous, result = _incremental(SOURCE, after)
+    third, old_third = result["classes"][2], previous["classes"][2]
+    assert third is not old_third
+    assert (third["startByte"], third["endByte"]) == (old_third["startByte"] + 1, old_third["endByte"] + 1)
+    assert third["methods"][0]["startByte"] == old_third["methods"][0]["startByte"] + 1
+    assert third["methods"][0]["params"] is old_third["methods"][0]["params"]
+    assert old_third["startByte"] == SOURCE.index(b"interface Third")
+    assert after[third["startByte"] : third["endByte"]].startswith(b"interface Third {")
+
+
+def test_line_shift_reextracts_following_classes():
+    after = SOURCE.replace(b"void run() {", b"void run() {\n")
+    previous, result = _incremental(SOURCE, after)
+    assert result["classes"][0] is previous["classes"][0]
+    assert result["classes"][2]["startLine"] == previous["classes"][2]["startLine"] + 1
+
+
+def test_retention_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("MCP_JAVA_INDEX_RETAINED_TREES", "0")
+    indexer._index_source("Edited.java", SOURCE, "h")
+    assert len(indexer._RETAINED_TREES) == 0
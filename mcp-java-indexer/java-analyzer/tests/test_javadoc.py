@@ -1,4 +1,5 @@
 from mcp_server import handlers
+from parser.indexer import _index_source
 
 from tests.conftest import fixture_path
 
@@ -12,3 +13,52 @@ def test_read_javadoc():
     assert result["found"] is True
     assert "Adds two numbers" in result["content"]
     assert result["startLine"] == 4
+
+
+JAVADOC_EDGES = b"""package edge;
+
+/** \xed\x81\xb4\xeb\x9e\x98\xec\x8a\xa4 */
+
+public class Edge {
+  /* not javadoc */
+  public void plain() {}
+
+  /** same line */ public void sameLine() {}
+  int afterSameLine;
+
+  // line comment */
+  void lineComment() {}
+
+  /** first */
+  /** second */
+  void twice() {}
+
+  /**
+   * \xec\x97\xac\xeb\x9f\xac \xec\xa4\x84
+   */
+
+  @Deprecated
+  int a, b;
+}
+"""
+
+
+def _javadocs() -> tuple[dict, dict]:
+    data = _index_source("Edge.java", JAVADOC_EDGES, "h")
+    cls = data["classes"][0]
+    found = {cls["name"]: cls["javadoc"]}
+    for member in cls["fields"] + cls["methods"]:
+        found[member["name"]] = member["javadoc"]
+    return found, data["javadocText"]
+
+
+def test_javadoc_is_the_comment_node_right_before_declaration():
+    javadocs, texts = _javadocs()
+    assert (javadocs["Edge"]["startLine"], javadocs["Edge"]["endLine"]) == (3, 3)
+    assert texts["3:3"] == "/** 클래스 */"
+    for name in ("plain", "sameLine", "afterSameLine", "lineComment"):
+        assert javadocs[name]["present"] is False, name
+    assert javadocs["twice"]["startLine"] == 16
+    assert javadocs["a"] == javadocs["b"]
+    assert (javadocs["a"]["startLine"], javadocs["a"]["endLine"]) == (19, 21)
+    assert texts["19:21"] == "  /**\n   * 여러 줄\n   */"
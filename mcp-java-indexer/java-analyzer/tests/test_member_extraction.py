@@ -0,0 +1,70 @@
+from parser.ast_utils import split_top_level_commas
+from parser.indexer import _index_source
+
+
+SOURCE = """package com.example;
+
+@Service
+public class Members<T extends Comparable<T>> extends Base<T> implements Runnable, Map<String, List<T>> {
+  @Inject @Named("a")
+  private static final int first = 1, second = 2;
+
+  /** 생성자 */
+  protected Members(final String 이름, int... values) throws IOException, IllegalStateException {}
+
+  @Override
+  public <R> java.util.List<R> 변환(Map<String, R> source, @Nullable T fallback) { return null; }
+}
+
+interface Api extends Closeable, Supplier<Map<String, Integer>> {
+  void call();
+}
+"""
+
+
+def _classes() -> list[dict]:
+    return _index_source("Members.java", SOURCE.encode("utf-8"), "h")["classes"]
+
+
+def test_field_declarators_share_declaration_header():
+    cls = _classes()[0]
+    first, second = cls["fields"]
+    assert (first["name"], second["name"]) == ("first", "second")
+    for field in (first, second):
+        assert field["typeText"] == "int"
+        assert field["modifiers"] == ["private", "static", "final"]
+        assert field["annotations"] == ["@Inject", '@Named("a")']
+
+
+def test_class_header_extraction():
+    cls, api = _classes()
+    assert cls["annotations"] == ["@Service"]
+    assert cls["modifiers"] == ["public"]
+    assert cls["extends"] == "Base<T>"
+    assert cls["implements"] == ["Runnable", "Map<String, List<T>>"]
+    assert cls["signatureText"].startswith("@Service public class Members<T extends Comparable<T>>")
+    assert api["extends"] == "Closeable, Supplier<Map<String, Integer>>"
+    assert api["implements"] == []
+
+
+def test_non_ascii_headers_extract_same_texts():
+    cls = _classes()[0]
+    ctor = cls["constructors"][0]
+    assert ctor["params"] == [{"name": "이름", "typeText": "String"}, {"name": "values", "typeText": "int..."}]
+    assert ctor["throws"] == ["IOException", "IllegalStateException"]
+    assert ctor["javadoc"]["present"] is True
+
+    method = cls["methods"][0]
+    assert method["name"] == "변환"
+    assert method["typeParamsText"] == "<R>"
+    assert method["returnTypeText"] == "java.util.List<R>"
+    assert [param["typeText"] for param in method["params"]] == ["Map<String, R>", "T"]
+    assert method["signatureText"] == (
+        "@Override public <R> java.util.List<R> 변환(Map<String, R> source, @Nullable T fallback)"
+    )
+
+
+def test_split_top_level_commas():
+    assert split_top_level_commas("A, B ,, C") == ["A", "B", "C"]
+    assert split_top_level_commas("Map<K, V>, List<T>") == ["Map<K, V>", "List<T>"]
+    assert split_top_level_commas("") == []
@@ -0,0 +1,67 @@
+import os
+import time
+
+import pytest
+
+from cache.cache_store import CacheStore, file_stat
+from parser import indexer
+from parser.formatters import format_ultra_compact
+from parser.indexer import (
+    CANONICAL_CACHE_KEY,
+    OUTLINE_CACHE_KEY,
+    index_java_file,
+    index_java_outline,
+    load_outline_index,
+)
+
+from tests.conftest import fixture_path
+
+
+FIXTURES = [
+    "SimpleClass",
+    "AnnotationsAndOverloads",
+    "NestedClasses",
+    "RecordEnumInterface",
+    "MultiLineSignature",
+    "JavadocOnly",
+    "JavadocWithAnnotation",
+    "InnerClassJavadoc",
+]
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+@pytest.mark.parametrize(
+    "index_options, format_options",
+    [
+        ({}, {"with_fields": True, "scope": "all"}),
+        ({"includePrivate": False}, {"with_fields": True, "scope": "all"}),
+        ({"includeFields": False}, {"with_fields": False, "scope": "public"}),
+        ({"maxJavadocPreviewChars": 10}, {"with_fields": True, "scope": "protected"}),
+    ],
+)
+def test_outline_gives_same_ultra_output(name, index_options, format_options, tmp_path):
+    file_path = fixture_path(f"{name}.java").as_posix()
+    outline = index_java_outline(file_path, index_options, CacheStore(tmp_path / "outline"))
+    full = index_java_file(file_path, index_options, CacheStore(tmp_path / "full"))
+    assert format_ultra_compact(outline, format_options) == format_ultra_compact(full, format_options)
+    assert outline["errors"] == full["errors"]
+
+
+def test_outline_uses_own_cache_entry_and_prefers_canonical(tmp_path):
+    source = tmp_path / "Service.java"
+    source.write_text("class Service {\n  /** 실행 */\n  void run(int times) {}\n}\n", encoding="utf-8")
+    stamp = time.time() - 60
+    os.utime(source, (stamp, stamp))
+    store = CacheStore(tmp_path / "cache")
+    stat = file_stat(str(source))
+    indexer._RETAINED_TREES.clear()
+
+    outline = load_outline_index(str(source), store)
+    assert outline["classes"][0]["methods"][0]["params"] == [{"name": "times", "typeText": "int"}]
+    assert "signatureText" not in outline["classes"][0]["methods"][0]
+    assert store.load_by_stat(str(source), stat, OUTLINE_CACHE_KEY) == outline
+    assert store.load_by_stat(str(source), stat, CANONICAL_CACHE_KEY) is None
+    assert len(indexer._RETAINED_TREES) == 0
+
+    canonical = indexer.load_canonical_index(str(source), store)
+    assert load_outline_index(str(source), store) == canonical
@@ -0,0 +1,67 @@
+import pytest
+
+from cache.cache_store import CacheStore, MemoryCacheStore, SqliteCacheStore
+from parser import parallel
+from parser.indexer import index_directory, index_java_files, load_canonical_index
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _shutdown_pool():
+    yield
+    parallel.shutdown_pool()
+
+
+def _write_sources(root, count: int) -> list[str]:
+    paths = []
+    for idx in range(count):
+        package_dir = root / f"pkg{idx % 3}"
+        package_dir.mkdir(parents=True, exist_ok=True)
+        path = package_dir / f"Service{idx}.java"
+        path.write_text(
+            f"package pkg{idx % 3};\n\n"
+            f"/** 서비스 {idx} */\n"
+            f"public class Service{idx} {{\n"
+            f"  private int count{idx};\n"
+            f"  /** 실행 */\n"
+            f"  public void run{idx}(String arg) {{}}\n"
+            f"}}\n",
+            encoding="utf-8",
+        )
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.parametrize("store_cls", [CacheStore, SqliteCacheStore], ids=["files", "sqlite"])
+def test_parallel_indexing_matches_serial_order_and_content(store_cls, tmp_path):
+    paths = _write_sources(tmp_path / "src", parallel.PARALLEL_MIN_ITEMS + 8)
+    serial = index_java_files(paths, {"maxJavadocPreviewChars": 20}, store_cls(tmp_path / "serial"), workers=1)
+
+    memory = MemoryCacheStore(store_cls(tmp_path / "parallel"), max_bytes=16 * 1024 * 1024)
+    assert index_java_files(paths, {"maxJavadocPreviewChars": 20}, memory, workers=2) == serial
+
+    # 워커가 디스크에 저장하고, 현재 프로세스는 메모리 캐시에 올려 두었어야 한다
+    assert memory.stats()["entries"] == len(paths)
+    disk_only = store_cls(tmp_path / "parallel")
+    assert [load_canonical_index(path, disk_only)["hash"] for path in paths] == [data["hash"] for data in serial]
+
+
+def test_index_directory_is_sorted_and_independent_of_workers(tmp_path):
+    _write_sources(tmp_path / "src", parallel.PARALLEL_MIN_ITEMS + 1)
+    serial = index_directory(str(tmp_path / "src"), cache_store=CacheStore(tmp_path / "a"), workers=1, include_files=True)
+    parallel_run = index_directory(
+        str(tmp_path / "src"), cache_store=CacheStore(tmp_path / "b"), workers=2, include_files=True
+    )
+
+    file_paths = [data["filePath"] for data in serial["files"]]
+    assert file_paths == sorted(file_paths)
+    assert parallel_run["files"] == serial["files"]
+    assert (serial["fileCount"], serial["classCount"], serial["errorFileCount"]) == (len(file_paths), len(file_paths), 0)
+    assert (serial["workers"], parallel_run["workers"]) == (1, 2)
+
+
+def test_resolve_workers(monkeypatch):
+    monkeypatch.setenv("MCP_JAVA_INDEX_WORKERS", "3")
+    assert parallel.resolve_workers() == 3
+    assert parallel.resolve_workers(1) == 1
+    monkeypatch.setenv("MCP_JAVA_INDEX_WORKERS", "0")
+    assert parallel.resolve_workers() >= 1
@@ -0,0 +1,33 @@
+from parser.indexer import _collect_errors, _index_source, _parser
+
+
+def _errors(source: str) -> list[dict]:
+    source_bytes = source.encode("utf-8")
+    return _collect_errors(_parser().parse(source_bytes).root_node, source_bytes)
+
+
+def test_clean_file_has_no_errors():
+    assert _errors("class A {\n  void f() { int x = 1; }\n}\n") == []
+
+
+def test_missing_nodes_are_reported_with_columns():
+    source = "class A {\n  void f() { int x = 1 }\n  String 한글 = \"가\" }\n"
+    assert _errors(source) == [
+        {"level": "error", "message": "Missing ;", "line": 2, "column": 23},
+        # 열 번호는 바이트가 아니라 문자 기준
+        {"level": "error", "message": "Missing ;", "line": 3, "column": 18},
+    ]
+
+
+def test_error_nodes_keep_line_and_source_order():
+    errors = _errors("class A {\n  void f() { int x = ; }\n  void g() { return ) ; }\n}\n")
+    assert [error["message"] for error in errors] == ["Parse error", "Parse error"]
+    assert [(error["line"], error["column"]) for error in errors] == [(2, 20), (3, 21)]
+
+
+def test_deeply_nested_error_does_not_hit_recursion_limit():
+    depth = 1500
+    source = "class Deep {\n  void f() {\n" + "{" * depth + "int x = ;" + "}" * depth + "\n  }\n}\n"
+    result = _index_source("Deep.java", source.encode("utf-8"), "h")
+    assert result["errors"] == [{"level": "error", "message": "Parse error", "line": 3, "column": depth + 7}]
+    assert [method["name"] for method in result["classes"][0]["methods"]] == ["f"]
@@ -0,0 +1,74 @@
+import os
+import time
+
+import pytest
+
+from cache.cache_store import CacheStore
+from parser.indexer import _iter_canonical, iter_java_files
+from parser.ranking import CAMEL_HUMP, EXACT, FUZZY, PREFIX, SUBSTRING, QueryScorer, split_humps
+from parser.symbol_table import SymbolTable
+
+
+def test_split_humps():
+    assert split_humps("selectDetailByMailUser") == ("select", "Detail", "By", "Mail", "User")
+    assert split_humps("HTMLParser") == ("HTML", "Parser")
+    assert split_humps("MAX_VALUE2") == ("MAX", "VALUE", "2")
+
+
+@pytest.mark.parametrize(
+    "query, name, tier",
+    [
+        ("selectDetail", "selectDetail", EXACT),
+        ("select", "selectDetail", PREFIX),
+        ("SDBMU", "selectDetailByMailUser", CAMEL_HUMP),
+        ("sdbmu", "selectDetailByMailUser", CAMEL_HUMP),
+        ("selDetBMU", "selectDetailByMailUser", CAMEL_HUMP),
+        ("ailUs", "selectDetailByMailUser", SUBSTRING),
+        ("sdmlu", "selectDetailByMailUser", FUZZY),
+    ],
+)
+def test_match_tiers(query, name, tier):
+    assert QueryScorer(query).score(name)[0] == tier
+
+
+def test_non_matching_names_are_filtered():
+    scorer = QueryScorer("xyz")
+    assert list(scorer.prefilter(["selectDetail", "xaybzc", "zyx"])) == ["xaybzc"]
+    assert scorer.score("zyx") is None
+    assert QueryScorer("SDBMU", case_sensitive=True).score("sdbmu_other") is None
+
+
+def test_hump_match_is_not_exponential():
+    # 반복되는 이름/쿼리에서 역추적 정규식은 글자 두 개마다 약 8배씩 느려졌다
+    name = "get" + "Aa" * 200 + "Xb"
+    start = time.perf_counter()
+    assert QueryScorer("a" * 200 + "b").score(name)[0] == FUZZY
+    assert QueryScorer("a" * 200 + "xb").score(name)[0] == CAMEL_HUMP
+    assert time.perf_counter() - start < 1.0
+
+
+def _write_java(path, body: str) -> None:
+    path.write_text(body, encoding="utf-8")
+    stamp = time.time() - 60
+    os.utime(path, (stamp, stamp))
+
+
+def test_ranked_search_orders_by_tier_and_keeps_top_k(tmp_path):
+    cache = CacheStore(tmp_path / "cache")
+    src = tmp_path / "src"
+    src.mkdir()
+    # 탐색 순서상 앞에 오는 파일에 약한 매치를 둔다
+    _write_java(src / "A.java", "class A { void sxdxbxmxu() {} void mailSender() {} }\n")
+    _write_java(src / "B.java", "class B { void selectDetailByMailUser() {} void sdbmuCache() {} void sdbmu() {} }\n")
+    table = SymbolTable(str(src), None)
+    table.refresh(iter_java_files(str(src)), lambda paths: _iter_canonical(paths, cache))
+
+    ranked = table.search_ranked("sdbmu", max_results=10)
+    assert [(r["qualifiedName"], r["match"]) for r in ranked] == [
+        ("B#sdbmu", "exact"),
+        ("B#sdbmuCache", "prefix"),
+        ("B#selectDetailByMailUser", "camelCase"),
+        ("A#sxdxbxmxu", "fuzzy"),
+    ]
+    assert table.search_ranked("sdbmu", max_results=2) == ranked[:2]
+    assert table.search_ranked("sdbmu", match_kind="class") == []
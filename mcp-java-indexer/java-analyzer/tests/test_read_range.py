@@ -1,4 +1,12 @@
+import os
+import time
+
+import pytest
+
 from mcp_server import handlers
+from parser import readers
+from parser.indexer import _line_count
+from parser.readers import LineIndexes, read_range, read_ranges
 
 from tests.conftest import fixture_path
 
@@ -9,3 +17,124 @@ def test_read_range_basic():
     content = result["content"]
     assert "1: package com.example;" in content
     assert "3: public class SimpleClass" in content
+
+
+def _write(path, data: bytes, age_seconds: int = 60) -> str:
+    path.write_bytes(data)
+    stamp = time.time() - age_seconds
+    os.utime(path, (stamp, stamp))
+    return str(path)
+
+
+def test_read_range_line_endings(tmp_path):
+    path = _write(tmp_path / "Crlf.java", "class A {\r\n  // é\r\n}".encode("utf-8"))
+
+    result = read_range(path, 2, 3, {"includeLineNumbers": False})
+    assert result["content"] == "  // é\n}"
+    with pytest.raises(ValueError):
+        read_range(path, 3, 4)
+
+    trailing = _write(tmp_path / "Trailing.java", b"a\nb\n")
+    assert read_range(trailing, 1, 2)["content"] == "1: a\n2: b"
+    with pytest.raises(ValueError):
+        read_range(trailing, 3, 3)
+
+
+def test_read_range_truncates_at_max_chars(tmp_path):
+    path = _write(tmp_path / "Long.java", "".join(f"line {idx} 한글\n" for idx in range(1000)).encode("utf-8"))
+
+    content = read_range(path, 1, 1000, {"includeLineNumbers": False, "maxChars": 25})["content"]
+    assert content == "line 0 한글\nline 1 한글\n... [truncated at 25 chars]"
+
+
+def test_line_index_follows_file_changes(tmp_path):
+    path = tmp_path / "Changing.java"
+    _write(path, b"a\nb\nc\n")
+    assert read_range(str(path), 3, 3)["content"] == "3: c"
+
+    _write(path, b"a\nbb\nx\ny\n", age_seconds=30)
+    assert read_range(str(path), 3, 4)["content"] == "3: x\n4: y"
+
+    # 방금 같은 크기로 다시 쓴 파일 (stat을 신뢰하지 않으므로 내용 표본으로 확인)
+    path.write_bytes(b"a\nbb\nz\nw\n")
+    assert read_range(str(path), 3, 4)["content"] == "3: z\n4: w"
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"a", b"a\n", b"a\r\nb", b"a\rb\rc\n", b"a\x0cb\n\n", "a\u2028b\u0085c\n".encode("utf-8")],
+)
+def test_line_count_matches_line_index(tmp_path, data):
+    path = _write(tmp_path / "Breaks.java", data)
+    stat = readers.file_stat(path)
+    assert LineIndexes().get(path, stat, data).line_count == _line_count(data)
+
+
+def test_line_index_reuses_offsets_by_sampled_check(tmp_path, monkeypatch):
+    data = b"".join(b"line %d\n" % idx for idx in range(40000))
+    path = _write(tmp_path / "Big.java", data)
+    indexes = LineIndexes()
+    first = indexes.get(path, readers.file_stat(path), data)
+
+    # 같은 내용으로 다시 쓴 파일: 전체를 해시하거나 다시 훑지 않고 오프셋을 재사용한다
+    _write(tmp_path / "Big.java", data, age_seconds=30)
+    monkeypatch.setattr(readers, "_line_offsets", lambda *args: pytest.fail("offsets rebuilt"))
+    touched = indexes.get(path, readers.file_stat(path), data)
+    assert touched.offsets is first.offsets
+    monkeypatch.undo()
+
+    # 같은 크기로 줄바꿈 위치만 옮긴 편집(파일 앞부분)은 표본 CRC로 잡아 다시 만든다
+    edited = data.replace(b"line 1\nline 2\n", b"line 1 line\n2\n", 1)
+    assert len(edited) == len(data)
+    _write(tmp_path / "Big.java", edited, age_seconds=20)
+    rebuilt = indexes.get(path, readers.file_stat(path), edited)
+    assert rebuilt.offsets is not first.offsets
+    assert rebuilt.span(2, 2) == (7, 19)
+
+
+def test_read_ranges_groups_and_merges(tmp_path):
+    first = _write(tmp_path / "First.java", "".join(f"a{idx}\n" for idx in range(1, 21)).encode())
+    second = _write(tmp_path / "Second.java", b"b1\nb2\nb3\n")
+
+    result = handlers.java_read_ranges(
+        [
+            {"filePath": first, "startLine": 5, "endLine": 6},
+            {"filePath": second, "startLine": 2, "endLine": 2},
+            {"filePath": first, "startLine": 1, "endLine": 2},
+            {"filePath": first, "startLine": 3, "endLine": 4},
+            {"filePath": first, "startLine": 10, "endLine": 10},
+            {"filePath": first, "startLine": 19, "endLine": 25},
+            {"filePath": str(tmp_path / "Missing.java"), "startLine": 1, "endLine": 1},
+        ],
+        {"includeLineNumbers": False},
+    )
+
+    assert [entry["filePath"] for entry in result["files"]] == [first, second]
+    ranges = result["files"][0]["ranges"]
+    assert [(item["startLine"], item["endLine"]) for item in ranges] == [(1, 6), (10, 10)]
+    assert ranges[0]["content"] == "a1\na2\na3\na4\na5\na6"
+    assert result["files"][1]["ranges"][0]["content"] == "b2"
+    assert [(error["startLine"], error["error"]) for error in result["errors"]][0] == (19, "Invalid line range")
+    assert result["errors"][1]["filePath"].endswith("Missing.java")
+    assert result["totalChars"] == len("a1\na2\na3\na4\na5\na6\n") + len("a10\n") + len("b2\n")
+    assert not result["truncated"] and result["skipped"] == []
+
+
+def test_read_ranges_shares_max_chars(tmp_path):
+    first = _write(tmp_path / "First.java", b"12345\n12345\n12345\n12345\n")
+    second = _write(tmp_path / "Second.java", b"x\n")
+
+    result = read_ranges(
+        [
+            {"filePath": first, "startLine": 1, "endLine": 1},
+            {"filePath": first, "startLine": 3, "endLine": 4},
+            {"filePath": second, "startLine": 1, "endLine": 1},
+        ],
+        {"includeLineNumbers": False, "maxChars": 15},
+    )
+
+    ranges = result["files"][0]["ranges"]
+    assert ranges[0]["content"] == "12345"
+    assert ranges[1]["content"] == "12345\n... [truncated at 15 chars]"
+    assert result["truncated"] and result["totalChars"] == 12
+    assert result["skipped"] == [{"filePath": second, "startLine": 1, "endLine": 1}]
@@ -0,0 +1,124 @@
+import pytest
+
+from cache.cache_store import CacheStore
+from mcp_server import handlers
+from parser import readers
+from parser.indexer import _walk_symbols, load_canonical_index
+from parser.readers import read_symbol
+
+from tests.conftest import fixture_path
+
+
+SOURCE = """package p;
+
+/** 클래스 */
+@Deprecated
+public class A {
+    /**
+     * 필드
+     */
+    @SuppressWarnings({"a", "b)"}) @x.Y(value = ')') private int a, b = 2;
+
+    /** 메서드 */
+    @Override
+    // note
+    public String toString() { return "}"; }
+
+    @interface Ann { String v() default "x"; }
+}
+"""
+
+
+def _symbols(path: str, store: CacheStore) -> dict:
+    data = load_canonical_index(path, store)
+    return {symbol["name"]: symbol for symbol in _walk_symbols(data)}
+
+
+@pytest.mark.parametrize("name", ["SimpleClass", "AnnotationsAndOverloads", "NestedClasses", "RecordEnumInterface"])
+def test_symbol_bytes_slice_declaration(name, tmp_path):
+    path = fixture_path(f"{name}.java").as_posix()
+    source = fixture_path(f"{name}.java").read_bytes()
+    store = CacheStore(tmp_path)
+    data = load_canonical_index(path, store)
+    for symbol in _walk_symbols(data):
+        result = read_symbol(path, symbol["symbolId"], {}, store)
+        assert result["found"] is True
+        assert result["content"] == source[symbol["startByte"] : symbol["endByte"]].decode("utf-8")
+        # 필드는 선언 전체(modifiers/타입 포함)를 자르므로 변수의 줄 범위를 감싼다
+        assert result["startLine"] <= symbol["startLine"] <= symbol["endLine"] <= result["endLine"]
+        assert symbol["name"] in result["content"]
+
+
+def test_read_symbol_javadoc_and_annotations(tmp_path):
+    path = tmp_path / "A.java"
+    path.write_text(SOURCE.replace("\n", "\r\n"), encoding="utf-8")
+    path = path.as_posix()
+    store = CacheStore(tmp_path / "cache")
+    symbols = _symbols(path, store)
+
+    method = symbols["toString"]["symbolId"]
+    assert read_symbol(path, method, {}, store)["content"] == (
+        '@Override\n    // note\n    public String toString() { return "}"; }'
+    )
+    bare = read_symbol(path, method, {"includeAnnotations": False}, store)
+    assert bare["content"] == 'public String toString() { return "}"; }'
+    assert (bare["startLine"], bare["endLine"]) == (14, 14)
+    documented = read_symbol(path, method, {"includeJavadoc": True}, store)
+    assert documented["content"].startswith("/** 메서드 */\n    @Override")
+    assert documented["startLine"] == 11
+
+    # 한 선언의 변수들은 선언 전체를 돌려준다
+    field = read_symbol(path, symbols["b"]["symbolId"], {"includeAnnotations": False}, store)
+    assert field["content"] == "private int a, b = 2;"
+    assert read_symbol(path, symbols["Ann"]["symbolId"], {"includeAnnotations": False}, store)["content"].startswith(
+        "@interface Ann"
+    )
+    cls = read_symbol(path, symbols["A"]["symbolId"], {"includeAnnotations": False, "maxChars": 20}, store)
+    assert cls["truncated"] is True
+    assert cls["content"] == "public class A {\n   \n... [truncated at 20 chars]"
+
+
+def test_read_symbol_stale(tmp_path):
+    path = tmp_path / "A.java"
+    path.write_text(SOURCE, encoding="utf-8")
+    path = path.as_posix()
+    store = CacheStore(tmp_path / "cache")
+    method = _symbols(path, store)["toString"]
+    old_index = load_canonical_index(path, store)
+
+    result = handlers.java_read_symbol(path, method["symbolId"], {"expectedHash": "0" * 40})
+    assert (result["found"], result["stale"], result["hash"]) == (False, True, old_index["hash"])
+
+    # 선언이 옮겨지면 예전 symbolId로는 찾지 못한다
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(SOURCE.replace("package p;\n", "package p;\n\nimport java.util.List;\n"))
+    moved = read_symbol(path, method["symbolId"], {}, store)
+    assert moved["found"] is False
+    assert moved["hash"] != old_index["hash"]
+
+
+def test_read_symbol_rechecks_content_hash(tmp_path, monkeypatch):
+    path = tmp_path / "A.java"
+    path.write_text(SOURCE, encoding="utf-8")
+    path = path.as_posix()
+    store = CacheStore(tmp_path / "cache")
+    old_index = load_canonical_index(path, store)
+    method = _symbols(path, store)["toString"]
+
+    # 인덱스를 읽은 직후 파일이 바뀐 경우: 예전 오프셋으로 자르지 않고 새 내용으로 다시 찾는다
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(SOURCE.replace("return \"}\";", "return \"}}}}\";"))
+    loads = []
+
+    def racing_load(file_path, cache):
+        loads.append(file_path)
+        return old_index if len(loads) == 1 else load_canonical_index(file_path, cache)
+
+    monkeypatch.setattr(readers, "load_canonical_index", racing_load)
+    result = read_symbol(path, method["symbolId"], {"includeAnnotations": False}, store)
+    assert len(loads) == 2
+    assert result["content"] == 'public String toString() { return "}}}}"; }'
+
+    monkeypatch.setattr(readers, "load_canonical_index", lambda file_path, cache: old_index)
+    with pytest.raises(ValueError):
+        read_symbol(path, method["symbolId"], {}, store)
@@ -0,0 +1,78 @@
+import pytest
+
+from cache.cache_store import CacheStore
+from cache.serializers import JsonSerializer, MarshalSerializer
+from parser import indexer
+from parser.indexer import _walk_symbols, find_symbol_at_line, find_symbol_by_id, load_canonical_index
+
+from tests.conftest import fixture_path
+
+
+SOURCE = b"""package com.example;
+
+/** \xec\x84\x9c\xeb\xb9\x84\xec\x8a\xa4 */
+public class Service {
+  private int a, b;
+
+  Service() {}
+  class Line { void one() {} }
+
+  void run() {
+    int local = 1;
+  }
+
+  static class Inner {
+    void nested() {}
+  }
+}
+"""
+
+
+def _index(source: bytes = SOURCE) -> dict:
+    indexer._RETAINED_TREES.clear()
+    return indexer._index_source("Service.java", source, "h")
+
+
+@pytest.mark.parametrize("name", ["NestedClasses", "RecordEnumInterface", "AnnotationsAndOverloads"])
+def test_symbol_index_finds_every_symbol(name, tmp_path):
+    data = load_canonical_index(fixture_path(f"{name}.java").as_posix(), CacheStore(tmp_path))
+    symbols = _walk_symbols(data)
+    assert set(data["symbolIndex"]) == {symbol["symbolId"] for symbol in symbols}
+    for symbol in symbols:
+        assert find_symbol_by_id(data, symbol["symbolId"]) is next(
+            s for s in symbols if s["symbolId"] == symbol["symbolId"]
+        )
+    assert find_symbol_by_id(data, "Method#missing") is None
+
+
+def test_find_symbol_at_line_returns_innermost_symbol():
+    data = _index()
+    assert find_symbol_at_line(data, 4)["name"] == "Service"
+    assert find_symbol_at_line(data, 5)["name"] in ("a", "b")
+    assert find_symbol_at_line(data, 6)["name"] == "Service"
+    assert find_symbol_at_line(data, 8)["name"] == "one"
+    assert find_symbol_at_line(data, 11)["name"] == "run"
+    assert find_symbol_at_line(data, 15)["name"] == "nested"
+    assert find_symbol_at_line(data, 16)["name"] == "Inner"
+    assert find_symbol_at_line(data, 1) is None
+    assert find_symbol_at_line(data, 99) is None
+
+
+def test_views_without_maps_fall_back_to_walk():
+    data = _index()
+    view = indexer.apply_view(data, {"includePrivate": False})
+    run = find_symbol_by_id(data, data["classes"][0]["methods"][0]["symbolId"])
+    assert "symbolIndex" not in view
+    assert find_symbol_by_id(view, run["symbolId"]) == run
+    assert find_symbol_at_line(view, 11) is None
+
+
+@pytest.mark.parametrize("serializer", [JsonSerializer(), MarshalSerializer()], ids=["json", "marshal"])
+def test_symbol_maps_survive_cache_roundtrip(serializer, tmp_path):
+    data = _index()
+    store = CacheStore(tmp_path, serializer)
+    store.save("Service.java", data, indexer.CANONICAL_CACHE_KEY)
+    loaded = store.load("Service.java", "h", indexer.CANONICAL_CACHE_KEY)
+    inner = data["classes"][0]["innerClasses"][1]["methods"][0]
+    assert find_symbol_by_id(loaded, inner["symbolId"]) == inner
+    assert find_symbol_at_line(loaded, 15) == inner
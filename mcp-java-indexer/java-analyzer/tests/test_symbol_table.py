@@ -0,0 +1,312 @@
+import os
+import time
+
+import pytest
+
+from cache.cache_store import CacheStore, default_cache_store
+from parser import symbol_table
+from parser.indexer import (
+    _iter_canonical,
+    apply_view,
+    find_symbols,
+    find_symbols_in_file,
+    iter_find_symbols,
+    iter_java_files,
+)
+from parser.symbol_table import FLAG_PRIVATE, SymbolTable, excluded_flags, symbol_table_for
+from parser.trigram_index import TermIndex
+
+from tests.conftest import fixture_path
+
+
+def _write_java(path, body: str, age_seconds: int = 60) -> str:
+    path.write_text(body, encoding="utf-8")
+    stamp = time.time() - age_seconds
+    os.utime(path, (stamp, stamp))
+    return str(path)
+
+
+class _CountingLoader:
+    def __init__(self, cache):
+        self.cache = cache
+        self.loaded: list[str] = []
+
+    def __call__(self, paths):
+        self.loaded.extend(paths)
+        return _iter_canonical(paths, self.cache)
+
+
+def _legacy_scan(root: str, query: str, opts: dict, view: dict, cache) -> list[dict]:
+    found = []
+    for path, canonical in _iter_canonical(list(iter_java_files(root)), cache):
+        for match in find_symbols_in_file(apply_view(canonical, view), query, opts):
+            symbol = match["symbol"]
+            found.append((path, symbol["symbolId"], symbol["kind"]))
+    return found
+
+
+@pytest.mark.parametrize(
+    "query, opts, view",
+    [
+        ("", {}, {}),
+        ("do", {"matchKind": "method"}, {}),
+        ("S", {"caseSensitive": True}, {"includePrivate": False}),
+        ("e", {}, {"includeFields": False, "includeConstructors": False}),
+        ("", {"matchKind": "class"}, {"includeInnerClasses": False}),
+    ],
+)
+def test_table_search_matches_linear_scan(query, opts, view, tmp_path):
+    cache = CacheStore(tmp_path)
+    root = str(fixture_path(""))
+    table = SymbolTable(root, None)
+    table.refresh(iter_java_files(root), lambda paths: _iter_canonical(paths, cache))
+
+    results = table.search(
+        query,
+        match_kind=opts.get("matchKind", "any"),
+        case_sensitive=opts.get("caseSensitive", False),
+        excluded=excluded_flags(view),
+        max_results=10_000,
+    )
+
+    expected = _legacy_scan(root, query, opts, view, cache)
+    assert expected
+    assert [(r["filePath"], r["symbolId"], r["kind"]) for r in results] == expected
+
+
+def test_refresh_reloads_only_changed_files_and_persists(tmp_path):
+    cache = CacheStore(tmp_path / "cache")
+    src = tmp_path / "src"
+    src.mkdir()
+    a = _write_java(src / "A.java", "class A { void alpha() {} }\n")
+    b = _write_java(src / "B.java", "class B { void beta() {} }\n")
+    storage = tmp_path / "table.bin"
+
+    table = SymbolTable(str(src), storage, cache.serializer)
+    loader = _CountingLoader(cache)
+    table.refresh(iter_java_files(str(src)), loader)
+    assert sorted(loader.loaded) == [a, b]
+
+    _write_java(src / "B.java", "class B { void gamma() {} }\n", age_seconds=30)
+    os.remove(a)
+    loader.loaded.clear()
+    table.refresh(iter_java_files(str(src)), loader)
+    assert loader.loaded == [b]
+    assert [r["qualifiedName"] for r in table.search("a", max_results=10)] == ["B#gamma"]
+
+    # 저장된 테이블을 다시 열면 바뀐 파일이 없으므로 아무것도 로드하지 않는다
+    reopened = SymbolTable(str(src), storage, cache.serializer)
+    loader.loaded.clear()
+    reopened.refresh(iter_java_files(str(src)), loader)
+    assert loader.loaded == []
+    assert reopened.stats()["symbols"] == 2
+
+
+def test_search_keeps_first_results_in_discovery_order(tmp_path):
+    cache = CacheStore(tmp_path / "cache")
+    src = tmp_path / "src"
+    src.mkdir()
+    for idx in range(5):
+        _write_java(src / f"C{idx}.java", f"class C{idx} {{ void run{idx}() {{}} void runAgain() {{}} }}\n")
+    table = SymbolTable(str(src), None)
+    table.refresh(iter_java_files(str(src)), lambda paths: _iter_canonical(paths, cache))
+
+    everything = table.search("run", max_results=100)
+    assert table.search("run", max_results=3) == everything[:3]
+
+
+def test_find_symbols_sees_edits_after_invalidate(tmp_path, monkeypatch):
+    monkeypatch.setenv("MCP_JAVA_INDEX_SYMBOL_REFRESH_SEC", "3600")
+    src = tmp_path / "src"
+    src.mkdir()
+    _write_java(src / "Edit.java", "class Edit { void before() {} }\n")
+    assert [r["qualifiedName"] for r in find_symbols(str(src), "before")["results"]] == ["Edit#before"]
+
+    _write_java(src / "Edit.java", "class Edit { void after() {} }\n", age_seconds=30)
+    # 갱신 주기 안에서는 메모리 테이블로 응답하고, invalidate 후에는 바뀐 파일을 반영한다
+    assert find_symbols(str(src), "after")["results"] == []
+    symbol_table_for(str(src), default_cache_store()).invalidate()
+    assert [r["qualifiedName"] for r in find_symbols(str(src), "after")["results"]] == ["Edit#after"]
+
+
+@pytest.mark.parametrize(
+    "query, opts",
+    [
+        ("", {}),
+        ("do", {"match_kind": "method"}),
+        ("S", {"case_sensitive": True, "excluded": FLAG_PRIVATE}),
+        ("example.docs", {"include_qualified": True}),
+    ],
+)
+def test_streaming_search_matches_refreshed_search(query, opts, tmp_path):
+    cache = CacheStore(tmp_path)
+    root = str(fixture_path(""))
+    loader = lambda paths: _iter_canonical(paths, cache)
+    refreshed = SymbolTable(root, None)
+    refreshed.refresh(iter_java_files(root), loader)
+
+    # 빈 테이블(전부 로드)과 갱신된 테이블(3-gram 결과 사용) 모두 refresh 후 search와 같은 결과/순서
+    streamed = SymbolTable(root, None)
+    cold = list(streamed.iter_search(iter_java_files(root), loader, query, **opts))
+    assert cold == refreshed.search(query, max_results=10_000, **opts)
+    assert list(refreshed.iter_search(iter_java_files(root), loader, query, **opts)) == cold
+    assert streamed.stats() == refreshed.stats()
+
+
+def _many_files(src, count: int) -> None:
+    src.mkdir()
+    for idx in range(count):
+        _write_java(src / f"M{idx:03d}.java", f"class M{idx:03d} {{ void run{idx}() {{}} }}\n")
+
+
+def test_streaming_search_stops_loading_after_consumer_stops(tmp_path):
+    cache = CacheStore(tmp_path / "cache")
+    src = tmp_path / "src"
+    _many_files(src, 100)
+    table = SymbolTable(str(src), None)
+    loader = _CountingLoader(cache)
+
+    first = next(iter(table.iter_search(sorted(iter_java_files(str(src))), loader, "run")))
+    assert first["qualifiedName"] == "M000#run0"
+    # 첫 묶음만 요청했고 그중 내보낸 파일만 테이블에 넣었으며, 끝까지 훑지 않았으므로 갱신된 것으로 표시하지 않는다
+    assert 0 < len(loader.loaded) < 100
+    assert table.stats()["files"] == 1
+    assert table._refreshed_at is None
+
+    # 이미 넣은 파일은 다음 갱신에서 다시 로드하지 않는다
+    loader.loaded.clear()
+    table.refresh(iter_java_files(str(src)), loader)
+    assert first["filePath"] not in loader.loaded
+    assert len(loader.loaded) == 99
+    assert table.stats()["files"] == 100
+
+
+def test_iter_find_symbols_honours_max_results_and_should_stop(tmp_path, monkeypatch):
+    monkeypatch.setenv("MCP_JAVA_INDEX_CACHE_ROOT", str(tmp_path / "cache"))
+    src = tmp_path / "src"
+    _many_files(src, 40)
+    root = str(src)
+
+    assert list(iter_find_symbols(root, "run", {"maxResults": 0})) == []
+    assert find_symbols(root, "run", {"maxResults": 5}, should_stop=lambda: True)["results"] == []
+    results = list(iter_find_symbols(root, "run", {"maxResults": 5, "matchKind": "method"}))
+    assert len(results) == 5
+
+    checks = []
+
+    def stop_after_three() -> bool:
+        checks.append(None)
+        return len(checks) > 3
+
+    symbol_table_for(root, default_cache_store()).invalidate()
+    stopped = find_symbols(root, "M0", {"maxResults": 100, "matchKind": "class"}, should_stop=stop_after_three)
+    assert len(stopped["results"]) == 3
+
+
+def test_term_index_intersects_trigram_postings():
+    index = TermIndex()
+    for seq, (term, kind) in enumerate(
+        [("selectDetailByMailUser", "method"), ("MailUser", "class"), ("findByName", "method"), ("mail", "field")]
+    ):
+        index.add(term, "A.java", seq, (term, kind), kind)
+
+    assert set(index.candidate_terms("bymailuser")) == {"selectDetailByMailUser"}
+    assert [r[0] for _, _, r in index.search("ByMailUser", True, "any")] == ["selectDetailByMailUser"]
+    assert list(index.search("bymailuser", True, "any")) == []
+    assert sorted(r[0] for _, _, r in index.search("mailuser", False, "any")) == ["MailUser", "selectDetailByMailUser"]
+    assert [r[0] for _, _, r in index.search("mailuser", False, "class")] == ["MailUser"]
+    # 3글자 미만 쿼리는 모든 term을 비교
+    assert len(list(index.search("ma", False, "any"))) == 3
+
+    index.remove_file("A.java", [("selectDetailByMailUser", "method")])
+    assert "tai" not in index.postings
+    assert list(index.search("Detail", False, "any")) == []
+
+
+def test_qualified_name_search_and_persisted_trigrams(tmp_path):
+    cache = CacheStore(tmp_path / "cache")
+    src = tmp_path / "src"
+    src.mkdir()
+    _write_java(src / "Mail.java", "package com.mail;\nclass Mail { void send() {} }\n")
+    _write_java(src / "Other.java", "package com.other;\nclass Other { void send() {} }\n")
+    storage = tmp_path / "table.bin"
+    table = SymbolTable(str(src), storage, cache.serializer)
+    table.refresh(iter_java_files(str(src)), lambda paths: _iter_canonical(paths, cache))
+
+    assert table.search("com.mail", max_results=10) == []
+    qualified = table.search("com.mail", max_results=10, include_qualified=True)
+    assert [r["qualifiedName"] for r in qualified] == ["com.mail.Mail", "com.mail.Mail#send"]
+
+    reopened = SymbolTable(str(src), storage, cache.serializer)
+    reopened.refresh(iter_java_files(str(src)), lambda paths: _iter_canonical(paths, cache))
+    assert reopened._names.postings == table._names.postings
+    assert reopened.search("sen", max_results=10) == table.search("sen", max_results=10)
+
+
+def test_single_file_change_appends_to_journal(tmp_path):
+    cache = CacheStore(tmp_path / "cache")
+    src = tmp_path / "src"
+    src.mkdir()
+    for idx in range(20):
+        _write_java(src / f"C{idx}.java", f"class C{idx} {{ void run{idx}() {{}} }}\n")
+    storage = tmp_path / "table.bin"
+    table = SymbolTable(str(src), storage, cache.serializer)
+    table.refresh(iter_java_files(str(src)), lambda paths: _iter_canonical(paths, cache))
+    base = storage.read_bytes()
+    journal_size = table.journal_path.stat().st_size
+
+    # 파일 하나가 바뀌면 스냅샷은 그대로 두고 그 파일의 레코드만 저널에 덧붙인다
+    _write_java(src / "C3.java", "class C3 { void walk() {} }\n", age_seconds=30)
+    (src / "C7.java").unlink()
+    table.refresh(iter_java_files(str(src)), lambda paths: _iter_canonical(paths, cache))
+    assert storage.read_bytes() == base
+    grown = table.journal_path.stat().st_size
+    assert journal_size < grown < len(base)
+
+    reopened = SymbolTable(str(src), storage, cache.serializer)
+    loader = _CountingLoader(cache)
+    reopened.refresh(iter_java_files(str(src)), loader)
+    assert loader.loaded == []
+    assert reopened._names.postings == table._names.postings
+    for query in ("walk", "run", "C"):
+        assert reopened.search(query, max_results=100) == table.search(query, max_results=100)
+
+    # 끝이 잘린 저널은 온전한 프레임까지만 적용하고, 다음 저장에서 스냅샷으로 합친다
+    with open(table.journal_path, "ab") as handle:
+        handle.write(b"\x40\x00\x00\x00abc")
+    torn = SymbolTable(str(src), storage, cache.serializer)
+    torn.refresh(iter_java_files(str(src)), lambda paths: _iter_canonical(paths, cache))
+    assert torn.search("walk", max_results=10) == table.search("walk", max_results=10)
+    _write_java(src / "C4.java", "class C4 { void swim() {} }\n", age_seconds=20)
+    torn.refresh(iter_java_files(str(src)), lambda paths: _iter_canonical(paths, cache))
+    assert storage.read_bytes() != base
+    assert torn.journal_path.stat().st_size == journal_size
+    compacted = SymbolTable(str(src), storage, cache.serializer)
+    compacted.refresh(iter_java_files(str(src)), lambda paths: _iter_canonical(paths, cache))
+    assert [r["qualifiedName"] for r in compacted.search("swim", max_results=10)] == ["C4#swim"]
+
+
+def test_journal_is_compacted_when_it_outgrows_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(symbol_table, "_JOURNAL_COMPACT_MIN_BYTES", 0)
+    cache = CacheStore(tmp_path / "cache")
+    src = tmp_path / "src"
+    src.mkdir()
+    path = src / "A.java"
+    _write_java(path, "class A { void v0() {} }\n")
+    storage = tmp_path / "table.bin"
+    table = SymbolTable(str(src), storage, cache.serializer)
+    table.refresh(iter_java_files(str(src)), lambda paths: _iter_canonical(paths, cache))
+    header_size = table.journal_path.stat().st_size
+
+    snapshots = {storage.read_bytes()}
+    for idx in range(1, 6):
+        _write_java(path, f"class A {{ void v{idx}() {{}} }}\n", age_seconds=60 - idx)
+        table.refresh(iter_java_files(str(src)), lambda paths: _iter_canonical(paths, cache))
+        snapshots.add(storage.read_bytes())
+        assert table.journal_path.stat().st_size <= max(header_size, storage.stat().st_size // 2)
+    assert len(snapshots) > 1
+    reopened = SymbolTable(str(src), storage, cache.serializer)
+    loader = _CountingLoader(cache)
+    reopened.refresh(iter_java_files(str(src)), loader)
+    assert loader.loaded == []
+    assert [r["qualifiedName"] for r in reopened.search("v", max_results=10)] == ["A#v5"]
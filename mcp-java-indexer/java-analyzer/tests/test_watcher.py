@@ -0,0 +1,232 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from cache.cache_store import default_cache_store
+from mcp_server import handlers
+from parser import indexer
+from parser.indexer import find_symbols, refresh_symbol_table, update_symbol_table_paths
+from mcp_server.watcher import FileWatcher
+
+
+class _Recorder:
+    def __init__(self):
+        self.calls: list[tuple[str, list[str]]] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, root, paths):
+        with self.lock:
+            self.calls.append((root, paths))
+
+
+def _backends():
+    backends = ["polling"]
+    if sys.platform.startswith("linux"):
+        backends.append("inotify")
+    return backends
+
+
+def _wait_for(condition, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.mark.parametrize("backend", _backends())
+def test_watcher_debounces_changes_into_one_batch(backend, tmp_path):
+    root = tmp_path / "src"
+    (root / "pkg").mkdir(parents=True)
+    recorder = _Recorder()
+    watcher = FileWatcher([str(root)], recorder, backend=backend, debounce_sec=0.2, poll_sec=0.1, initial_scan=False)
+    watcher.start()
+    try:
+        assert watcher.status()["backend"] == backend
+        time.sleep(0.2)
+        for idx in range(5):
+            (root / "pkg" / f"A{idx}.java").write_text(f"class A{idx} {{}}\n", encoding="utf-8")
+        (root / "pkg" / "notes.txt").write_text("ignored", encoding="utf-8")
+
+        assert _wait_for(lambda: recorder.calls)
+        assert watcher.wait_idle()
+        changed = sorted(path for _, paths in recorder.calls for path in paths)
+        assert changed == sorted(str(root / "pkg" / f"A{idx}.java") for idx in range(5))
+        assert len(recorder.calls) == 1
+        assert watcher.status()["queueDepth"] == 0
+        assert watcher.status()["lastBatch"]["roots"] == [str(root)]
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_watches_new_directories(tmp_path):
+    root = tmp_path / "src"
+    root.mkdir()
+    recorder = _Recorder()
+    watcher = FileWatcher([str(root)], recorder, backend="inotify", debounce_sec=0.2, initial_scan=False)
+    watcher.start()
+    try:
+        nested = root / "a" / "b"
+        nested.mkdir(parents=True)
+        (nested / "Late.java").write_text("class Late {}\n", encoding="utf-8")
+        target = str(nested / "Late.java")
+        # 새 디렉토리는 디렉토리째 다시 인덱싱하므로 파일이나 그 상위 디렉토리가 전달된다
+        assert _wait_for(
+            lambda: any(
+                path == target or target.startswith(path + os.sep) for _, paths in recorder.calls for path in paths
+            )
+        )
+    finally:
+        watcher.stop()
+
+
+def test_initial_scan_and_reindex_warm_symbol_table(tmp_path, monkeypatch):
+    monkeypatch.setenv("MCP_JAVA_INDEX_CACHE_ROOT", str(tmp_path / "cache"))
+    monkeypatch.setenv("MCP_JAVA_INDEX_SYMBOL_REFRESH_SEC", "3600")
+    root = tmp_path / "src"
+    root.mkdir()
+    source = root / "Service.java"
+    source.write_text("class Service { void first() {} }\n", encoding="utf-8")
+    cache = default_cache_store()
+
+    watcher = FileWatcher(
+        [str(root)],
+        lambda root_dir, paths: refresh_symbol_table(root_dir, cache),
+        backend="polling",
+        debounce_sec=0.05,
+        poll_sec=0.05,
+    )
+    watcher.start()
+    try:
+        assert _wait_for(lambda: watcher.status()["batches"] >= 1)
+        time.sleep(0.1)
+        source.write_text("class Service { void second() {} }\n", encoding="utf-8")
+        stamp = time.time() - 60
+        os.utime(source, (stamp, stamp))
+        assert _wait_for(lambda: watcher.status()["batches"] >= 2)
+        assert watcher.wait_idle()
+    finally:
+        watcher.stop()
+
+    # 갱신 주기가 길어도 감시기가 이미 테이블을 갱신했으므로 새 내용이 보인다
+    assert [result["qualifiedName"] for result in find_symbols(str(root), "second", {})["results"]] == ["Service#second"]
+    assert find_symbols(str(root), "first", {})["results"] == []
+
+
+def _service_source(idx: int, methods: int = 40) -> str:
+    body = "\n".join(f"  /** m{m} */\n  public int m{idx}x{m}(int a) {{ return a + {m}; }}" for m in range(methods))
+    return f"package pkg;\n\npublic class Service{idx} {{\n{body}\n}}\n"
+
+
+def test_watcher_reindex_runs_alongside_handler_calls(tmp_path, monkeypatch):
+    monkeypatch.setenv("MCP_JAVA_INDEX_CACHE_ROOT", str(tmp_path / "cache"))
+    watched = tmp_path / "watched"
+    requested = tmp_path / "requested"
+    for directory, offset in ((watched, 0), (requested, 100)):
+        directory.mkdir()
+        for idx in range(offset, offset + 30):
+            (directory / f"Service{idx}.java").write_text(_service_source(idx), encoding="utf-8")
+    cache = default_cache_store()
+    reindexing = threading.Event()
+    parsers = {}
+
+    def reindex(root_dir, paths):
+        parsers["watcher"] = indexer._parser()
+        reindexing.set()
+        refresh_symbol_table(root_dir, cache)
+
+    watcher = FileWatcher([str(watched)], reindex, backend="polling", debounce_sec=0.01, poll_sec=0.05)
+    watcher.start()
+    try:
+        # 감시기가 감시 루트 전체를 파싱하는 동안 도구 호출도 파싱한다
+        assert reindexing.wait(10)
+        parsers["handler"] = indexer._parser()
+        results = [
+            handlers.java_index(str(requested / f"Service{idx}.java"), {"mode": "full"}) for idx in range(100, 130)
+        ]
+        assert watcher.wait_idle()
+    finally:
+        watcher.stop()
+
+    assert parsers["watcher"] is not parsers["handler"]
+    for idx, result in zip(range(100, 130), results):
+        assert [method["name"] for method in result["classes"][0]["methods"]] == [f"m{idx}x{m}" for m in range(40)]
+    found = find_symbols(str(watched), "m7x3", {})["results"]
+    assert "pkg.Service7#m7x3" in [result["qualifiedName"] for result in found]
+
+
+@pytest.mark.parametrize("backend", _backends())
+def test_watcher_skips_directories_excluded_from_discovery(backend, tmp_path):
+    root = tmp_path / "src"
+    for directory in ("pkg", "target/generated", "gen", "node_modules/lib"):
+        (root / directory).mkdir(parents=True)
+    (root / "pom.xml").write_text("<project/>", encoding="utf-8")
+    (root / ".gitignore").write_text("gen/\n", encoding="utf-8")
+    recorder = _Recorder()
+    watcher = FileWatcher([str(root)], recorder, backend=backend, debounce_sec=0.2, poll_sec=0.1, initial_scan=False)
+    watcher.start()
+    try:
+        if backend == "inotify":
+            assert sorted(watcher._inotify.directories.values()) == [str(root), str(root / "pkg")]
+        time.sleep(0.2)
+        for directory in ("target/generated", "gen", "node_modules/lib", "pkg"):
+            (root / directory / "A.java").write_text("class A {}\n", encoding="utf-8")
+
+        assert _wait_for(lambda: recorder.calls)
+        assert watcher.wait_idle()
+        time.sleep(0.3)
+        assert [path for _, paths in recorder.calls for path in paths] == [str(root / "pkg" / "A.java")]
+    finally:
+        watcher.stop()
+
+
+def test_update_symbol_table_paths_reloads_only_changed_paths(tmp_path, monkeypatch):
+    monkeypatch.setenv("MCP_JAVA_INDEX_SYMBOL_REFRESH_SEC", "3600")
+    cache = default_cache_store()
+    root = tmp_path / "src"
+    for directory in ("a", "b", "c"):
+        (root / directory).mkdir(parents=True)
+        for idx in range(3):
+            (root / directory / f"{directory.upper()}{idx}.java").write_text(
+                f"class {directory.upper()}{idx} {{ void run() {{}} }}\n", encoding="utf-8"
+            )
+    (root / ".gitignore").write_text("Skip.java\n", encoding="utf-8")
+    refresh_symbol_table(str(root), cache)
+
+    stamp = time.time() - 60
+    (root / "a" / "A1.java").write_text("class A1 { void walk() {} }\n", encoding="utf-8")
+    os.utime(root / "a" / "A1.java", (stamp, stamp))
+    (root / "b" / "A0.java").write_text("class Early { void run() {} }\n", encoding="utf-8")
+    (root / "b" / "Skip.java").write_text("class Skip { void run() {} }\n", encoding="utf-8")
+    (root / "c" / "C2.java").unlink()
+    (root / "d").mkdir()
+    (root / "d" / "D0.java").write_text("class D0 { void run() {} }\n", encoding="utf-8")
+    for path in (root / "b").iterdir():
+        if path.name.startswith("B"):
+            path.unlink()
+    (root / "b").rename(root / "e")
+
+    loaded = []
+    original = indexer._iter_canonical
+
+    def counting(paths, cache_store, workers=1):
+        loaded.extend(paths)
+        return original(paths, cache_store, workers)
+
+    monkeypatch.setattr(indexer, "_iter_canonical", counting)
+    changed = [root / "a" / "A1.java", root / "c" / "C2.java", root / "d", root / "b", root / "e"]
+    update_symbol_table_paths(str(root), [str(path) for path in changed], cache)
+    assert sorted(loaded) == sorted(str(root / path) for path in ("a/A1.java", "d/D0.java", "e/A0.java"))
+
+    # 갱신 주기가 길어 파일을 다시 훑지 않아도 처음부터 훑은 결과와 같다
+    found = find_symbols(str(root), "", {"maxResults": 100})["results"]
+    monkeypatch.setenv("MCP_JAVA_INDEX_SYMBOL_REFRESH_SEC", "0")
+    assert find_symbols(str(root), "", {"maxResults": 100})["results"] == found
+    assert [result["qualifiedName"] for result in found if result["kind"] == "class"] == [
+        "A0", "A1", "A2", "C0", "C1", "D0", "Early"
+    ]
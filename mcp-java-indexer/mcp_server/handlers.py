@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import os
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 # java-analyzer를 path에 추가
 _java_analyzer_path = Path(__file__).parent.parent / "java-analyzer"
@@ -10,13 +13,28 @@ if str(_java_analyzer_path) not in sys.path:
     sys.path.insert(0, str(_java_analyzer_path))
 
 from cache.cache_store import default_cache_store
-from parser.indexer import find_symbols, index_java_file
-from parser.readers import read_javadoc, read_range
+from cache.gc import collect_garbage, default_gc_policy
+from parser.indexer import (
+    LIVE_CACHE_KEYS,
+    find_symbols,
+    index_directory,
+    index_java_file,
+    index_java_outline,
+    update_symbol_table_paths,
+)
+from parser.readers import read_javadoc, read_range, read_ranges, read_symbol
 from parser.formatters import format_ultra_compact, format_compact
+from parser.symbol_table import invalidate_symbol_tables
+from mcp_server.watcher import FileWatcher, watcher_from_env
 
 
 _CACHE = default_cache_store()
 
+_GC_LOCK = threading.Lock()
+_GC_STATE: dict = {"lastRun": None, "lastReport": None, "intervalMinutes": None}
+
+_WATCHER: Optional[FileWatcher] = None
+
 
 def _normalize_index_options(options: Optional[dict]) -> dict:
     """
@@ -63,12 +81,28 @@ def _normalize_javadoc_options(options: Optional[dict]) -> dict:
     }
 
 
+def _normalize_symbol_options(options: Optional[dict]) -> dict:
+    opts = options or {}
+    return {
+        "includeJavadoc": opts.get("includeJavadoc", False),
+        "includeAnnotations": opts.get("includeAnnotations", True),
+        "maxChars": opts.get("maxChars", 20000),
+        "expectedHash": opts.get("expectedHash"),
+    }
+
+
 def _normalize_find_options(options: Optional[dict]) -> dict:
     opts = options or {}
     return {
         "matchKind": opts.get("matchKind", "any"),
         "maxResults": opts.get("maxResults", 50),
         "caseSensitive": opts.get("caseSensitive", False),
+        "matchQualifiedName": opts.get("matchQualifiedName", False),
+        "rank": opts.get("rank", False),
+        "workers": opts.get("workers"),
+        "include": opts.get("include"),
+        "exclude": opts.get("exclude"),
+        "useGitignore": opts.get("useGitignore"),
     }
 
 
@@ -94,15 +128,18 @@ def java_index(filePath: str, options: Optional[dict] = None) -> dict:
     opts = options or {}
     mode = opts.get("mode", "ultra")
 
-    # Full 모드 옵션으로 인덱싱
     index_opts = _normalize_index_options(options)
-    full_result = index_java_file(filePath, index_opts, _CACHE)
 
-    # 모드에 따라 포맷팅
+    # ultra는 개요 인덱스로 충분 (정규 인덱스가 캐시에 있으면 그것을 사용)
     if mode == "ultra":
         format_opts = _normalize_format_options(options)
-        return format_ultra_compact(full_result, format_opts)
-    elif mode == "compact":
+        return format_ultra_compact(index_java_outline(filePath, index_opts, _CACHE), format_opts)
+
+    # Full 모드 옵션으로 인덱싱
+    full_result = index_java_file(filePath, index_opts, _CACHE)
+
+    # 모드에 따라 포맷팅
+    if mode == "compact":
         format_opts = _normalize_format_options(options)
         return format_compact(full_result, format_opts)
     else:  # full
@@ -116,11 +153,193 @@ def java_read_range(
     return read_range(filePath, startLine, endLine, opts)
 
 
+def java_read_ranges(requests: list[dict], options: Optional[dict] = None) -> dict:
+    """
+    여러 파일/범위 일괄 읽기 (MCP 도구)
+
+    요청을 파일별로 묶고 겹치거나 맞닿은 범위를 합쳐 파일마다 한 번만 읽습니다.
+
+    Args:
+        requests: [{"filePath", "startLine", "endLine"}, ...]
+        options: 옵션 딕셔너리
+            - includeLineNumbers: 라인 번호 포함 (기본값: True)
+            - maxChars: 배치 전체의 최대 문자 수 (기본값: 20000)
+
+    Returns:
+        파일별로 합친 범위의 내용, 요청별 오류, maxChars를 넘어 읽지 않은 범위
+    """
+    opts = _normalize_range_options(options)
+    return read_ranges(requests or [], opts)
+
+
 def java_read_javadoc(filePath: str, symbolId: str, options: Optional[dict] = None) -> dict:
     opts = _normalize_javadoc_options(options)
     return read_javadoc(filePath, symbolId, opts, _CACHE)
 
 
-def java_find_symbol(rootDir: str, query: str, options: Optional[dict] = None) -> dict:
+def java_read_symbol(filePath: str, symbolId: str, options: Optional[dict] = None) -> dict:
+    """
+    심볼 선언 원문 읽기 (MCP 도구)
+
+    정규 인덱스에 저장된 startByte/endByte로 심볼 구간만 잘라 읽습니다. 파일 내용 해시가 인덱스와 같을 때만 자릅니다.
+
+    Args:
+        filePath: Java 파일 경로
+        symbolId: java_index/java_find_symbol이 돌려준 symbolId
+        options: 옵션 딕셔너리
+            - includeJavadoc: 앞의 Javadoc 주석부터 포함 (기본값: False)
+            - includeAnnotations: 앞쪽 어노테이션 포함 (기본값: True, includeJavadoc이면 항상 포함)
+            - maxChars: 최대 문자 수 (기본값: 20000)
+            - expectedHash: 인덱싱할 때의 hash. 현재 내용과 다르면 읽지 않고 stale로 실패
+
+    Returns:
+        심볼의 줄/바이트 범위, 내용 해시, 원문
+    """
+    opts = _normalize_symbol_options(options)
+    return read_symbol(filePath, symbolId, opts, _CACHE)
+
+
+def java_find_symbol(
+    rootDir: str, query: str, options: Optional[dict] = None, should_stop: Optional[Callable[[], bool]] = None
+) -> dict:
+    """
+    심볼 검색 (MCP 도구)
+
+    maxResults개를 찾으면 남은 파일은 훑지 않고, should_stop()이 참이 되면 (클라이언트가 요청을 취소하면)
+    다음 파일에서 멈춥니다.
+    """
     opts = _normalize_find_options(options)
-    return find_symbols(rootDir, query, opts)
+    return find_symbols(rootDir, query, opts, should_stop)
+
+
+def java_index_directory(rootDir: str, options: Optional[dict] = None) -> dict:
+    """
+    디렉토리 일괄 인덱싱 (MCP 도구)
+
+    캐시를 미리 채워 이후 java_find_symbol/java_index 호출이 파싱 없이 끝나도록 합니다.
+
+    Args:
+        rootDir: 루트 디렉토리
+        options: 옵션 딕셔너리
+            - workers: 워커 프로세스 수 (기본값: MCP_JAVA_INDEX_WORKERS 또는 CPU 코어 수)
+            - include: 포함할 경로 glob 목록 (루트 기준 상대 경로, 기본값: 전체)
+            - exclude: 제외할 경로 glob 목록
+            - useGitignore: .gitignore 규칙 적용 (기본값: MCP_JAVA_INDEX_GITIGNORE 또는 True)
+
+    Returns:
+        파일/클래스 수, 파싱 오류가 있는 파일 목록, 사용한 워커 수, 소요 시간
+    """
+    opts = options or {}
+    scope = {key: opts.get(key) for key in ("include", "exclude", "useGitignore")}
+    return index_directory(rootDir, options=scope, cache_store=_CACHE, workers=opts.get("workers"))
+
+
+def java_cache_stats() -> dict:
+    """
+    캐시 상태 조회 (MCP 도구)
+
+    Returns:
+        캐시 디렉토리와 메모리 LRU 캐시 통계 (적중/미스/제거 횟수, 사용 바이트)
+    """
+    memory = _CACHE.stats() if hasattr(_CACHE, "stats") else None
+    return {
+        "cacheDir": str(_CACHE.cache_dir),
+        "memory": memory,
+        "gc": dict(_GC_STATE),
+    }
+
+
+def java_cache_gc(options: Optional[dict] = None) -> dict:
+    """
+    캐시 GC 실행 (MCP 도구)
+
+    Args:
+        options: 옵션 딕셔너리
+            - maxMb: 캐시 크기 상한 MB (기본값: MCP_JAVA_INDEX_CACHE_MAX_MB 또는 512)
+            - maxAgeDays: 미사용 항목 보관 기간 (기본값: MCP_JAVA_INDEX_CACHE_MAX_AGE_DAYS 또는 30)
+            - removeOrphans: 원본 파일이 삭제된 항목 제거 (기본값: True)
+            - dryRun: 삭제하지 않고 결과만 보고 (기본값: False)
+
+    Returns:
+        검사/삭제한 항목 수와 회수한 바이트 수
+    """
+    opts = options or {}
+    policy = default_gc_policy(LIVE_CACHE_KEYS)
+    if opts.get("maxMb") is not None:
+        policy.max_bytes = int(float(opts["maxMb"]) * 1024 * 1024)
+    if opts.get("maxAgeDays") is not None:
+        policy.max_age_days = float(opts["maxAgeDays"])
+    policy.remove_orphans = bool(opts.get("removeOrphans", True))
+    dry_run = bool(opts.get("dryRun", False))
+
+    with _GC_LOCK:
+        report = collect_garbage(_CACHE, policy, dry_run=dry_run)
+        if not dry_run:
+            _GC_STATE["lastRun"] = time.time()
+            _GC_STATE["lastReport"] = report
+    return report
+
+
+def start_background_gc() -> Optional[threading.Thread]:
+    """
+    주기적으로 캐시 GC를 실행하는 데몬 스레드 시작
+
+    MCP_JAVA_INDEX_GC_INTERVAL_MIN (기본값: 60)분마다 실행하며, 0이면 시작하지 않습니다.
+    """
+    raw = os.environ.get("MCP_JAVA_INDEX_GC_INTERVAL_MIN")
+    try:
+        interval_min = float(raw) if raw and raw.strip() else 60.0
+    except ValueError:
+        interval_min = 60.0
+    if interval_min <= 0:
+        return None
+    _GC_STATE["intervalMinutes"] = interval_min
+
+    def run() -> None:
+        while True:
+            time.sleep(interval_min * 60)
+            try:
+                java_cache_gc()
+            except Exception as exc:
+                _GC_STATE["lastReport"] = {"error": str(exc)}
+
+    thread = threading.Thread(target=run, name="mcp-java-index-cache-gc", daemon=True)
+    thread.start()
+    return thread
+
+
+def _reindex_watched_root(root_dir: str, paths: list[str]) -> None:
+    # 같은 루트를 다른 경로 표기로 검색하는 테이블도 다음 검색에서 다시 확인하도록 표시한 뒤,
+    # 감시 루트의 테이블은 감시기가 알려 준 경로만 지금 다시 로드한다 (파싱 결과는 캐시에도 저장됨).
+    # 첫 인덱싱과 이벤트 유실 때는 경로에 루트 자신이 들어 있어 전체를 갱신한다
+    invalidate_symbol_tables()
+    update_symbol_table_paths(root_dir, paths, _CACHE)
+
+
+def start_watcher() -> Optional[FileWatcher]:
+    """
+    MCP_JAVA_INDEX_WATCH_ROOTS가 설정되어 있으면 파일 감시기 시작 (mcp_server/watcher.py)
+
+    감시 루트 전체를 한 번 인덱싱한 뒤, 바뀐 .java 파일을 백그라운드에서 다시 인덱싱해
+    java_find_symbol/java_index가 따뜻한 캐시에서 응답하도록 합니다.
+    """
+    global _WATCHER
+    if _WATCHER is not None:
+        return _WATCHER
+    watcher = watcher_from_env(_reindex_watched_root)
+    if watcher is None:
+        return None
+    _WATCHER = watcher.start()
+    return _WATCHER
+
+
+def java_watch_status() -> dict:
+    """
+    파일 감시기 상태 조회 (MCP 도구)
+
+    Returns:
+        감시 여부, 백엔드(inotify/polling), 감시 루트, 대기열 깊이, 처리 중인 경로 수, 마지막 배치 정보
+    """
+    if _WATCHER is None:
+        return {"enabled": False, "roots": [], "queueDepth": 0, "inProgress": 0}
+    return _WATCHER.status()
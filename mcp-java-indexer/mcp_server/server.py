@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import threading
+from functools import partial
+
+import anyio
 from mcp.server.fastmcp import FastMCP
 
 from mcp_server import handlers
@@ -7,6 +11,21 @@ from mcp_server import handlers
 mcp = FastMCP("mcp-java-indexer")
 
 
+async def _run_cancellable(fn, *args):
+    """
+    fn(*args, should_stop=...)을 워커 스레드에서 실행
+
+    동기 도구는 이벤트 루프를 막아 취소 알림을 받을 수 없으므로 스레드로 넘기고,
+    요청이 취소되면 should_stop()이 참이 되게 해서 handler가 다음 파일에서 멈추도록 합니다.
+    """
+    cancelled = threading.Event()
+    try:
+        return await anyio.to_thread.run_sync(partial(fn, *args, should_stop=cancelled.is_set), abandon_on_cancel=True)
+    except anyio.get_cancelled_exc_class():
+        cancelled.set()
+        raise
+
+
 @mcp.tool()
 def java_index(filePath: str, options: dict | None = None) -> dict:
     return handlers.java_index(filePath, options)
@@ -19,17 +38,49 @@ def java_read_range(
     return handlers.java_read_range(filePath, startLine, endLine, options)
 
 
+@mcp.tool()
+def java_read_ranges(requests: list[dict], options: dict | None = None) -> dict:
+    return handlers.java_read_ranges(requests, options)
+
+
 @mcp.tool()
 def java_read_javadoc(filePath: str, symbolId: str, options: dict | None = None) -> dict:
     return handlers.java_read_javadoc(filePath, symbolId, options)
 
 
 @mcp.tool()
-def java_find_symbol(rootDir: str, query: str, options: dict | None = None) -> dict:
-    return handlers.java_find_symbol(rootDir, query, options)
+def java_read_symbol(filePath: str, symbolId: str, options: dict | None = None) -> dict:
+    return handlers.java_read_symbol(filePath, symbolId, options)
+
+
+@mcp.tool()
+async def java_find_symbol(rootDir: str, query: str, options: dict | None = None) -> dict:
+    return await _run_cancellable(handlers.java_find_symbol, rootDir, query, options)
+
+
+@mcp.tool()
+def java_index_directory(rootDir: str, options: dict | None = None) -> dict:
+    return handlers.java_index_directory(rootDir, options)
+
+
+@mcp.tool()
+def java_cache_stats() -> dict:
+    return handlers.java_cache_stats()
+
+
+@mcp.tool()
+def java_cache_gc(options: dict | None = None) -> dict:
+    return handlers.java_cache_gc(options)
+
+
+@mcp.tool()
+def java_watch_status() -> dict:
+    return handlers.java_watch_status()
 
 
 def main() -> None:
+    handlers.start_background_gc()
+    handlers.start_watcher()
     mcp.run()
 
 
@@ -0,0 +1,426 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from parser.discovery import iter_directories
+
+
+# inotify(7) 상수
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+# 이벤트 소스 스레드가 중지 요청을 확인하는 주기 (초)
+_STOP_CHECK_SEC = 0.5
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.environ.get(name, "").strip()
+    try:
+        return max(0.0, float(raw)) if raw else default
+    except ValueError:
+        return default
+
+
+def watch_roots_from_env() -> list[str]:
+    """MCP_JAVA_INDEX_WATCH_ROOTS 환경 변수 (os.pathsep으로 구분한 루트 목록, 비어 있으면 감시 안 함)"""
+    raw = os.environ.get("MCP_JAVA_INDEX_WATCH_ROOTS", "")
+    return [root for root in (part.strip() for part in raw.split(os.pathsep)) if root]
+
+
+def _is_java(name: str) -> bool:
+    return name.endswith(".java")
+
+
+def _walk_directories(root: str, directory: Optional[str] = None) -> Iterable[tuple[str, list[str]]]:
+    # 인덱싱과 같은 탐색 규칙 (VCS/캐시 디렉토리, 빌드 파일 옆의 빌드 출력, .gitignore, include/exclude)으로
+    # 제외되는 디렉토리는 감시하지도 훑지도 않는다. directory가 있으면 그 하위 트리만 (규칙은 root 기준)
+    return iter_directories(root, start=directory)
+
+
+class _Inotify:
+    """ctypes로 호출하는 Linux inotify (하위 디렉토리마다 watch 등록)"""
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+        # watch 디스크립터 → 디렉토리 경로
+        self.directories: dict[int, str] = {}
+
+    def add_tree(self, root: str, directory: Optional[str] = None) -> int:
+        """
+        root(directory가 있으면 그 하위 트리)의 감시 대상 디렉토리에 watch 등록하고 등록한 디렉토리 수 반환
+
+        watch 수 한도 초과 등은 OSError입니다.
+        """
+        watched = 0
+        for dirpath, _ in _walk_directories(root, directory):
+            wd = self._add_watch(self.fd, os.fsencode(dirpath), _WATCH_MASK)
+            if wd < 0:
+                code = ctypes.get_errno()
+                if code in (errno.ENOENT, errno.ENOTDIR):
+                    # 탐색 도중 삭제된 디렉토리
+                    continue
+                raise OSError(code, f"inotify_add_watch({dirpath}): {os.strerror(code)}")
+            self.directories[wd] = dirpath
+            watched += 1
+        return watched
+
+    def read_events(self, timeout: float) -> list[tuple[int, int, str]]:
+        """(wd, mask, 이름) 목록. timeout 동안 이벤트가 없으면 빈 목록"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].split(b"\0", 1)[0]
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class FileWatcher:
+    """
+    루트 디렉토리의 .java 파일 변경을 감시해 백그라운드에서 다시 인덱싱
+
+    이벤트 소스(inotify 또는 폴링) 스레드가 변경된 경로를 대기열에 넣고, 처리 스레드는 마지막 이벤트 후
+    debounce_sec 동안 조용해지면(계속 바뀌어도 최대 max_delay_sec 후에는) 모인 변경을 루트별로 한 번에
+    reindex(root, paths)로 넘깁니다. git checkout처럼 수천 개 파일이 한꺼번에 바뀌어도 루트당 한 번만 처리합니다.
+
+    backend:
+        "auto": Linux에서는 inotify, 실패하면(다른 OS, watch 수 한도 초과 등) 폴링
+        "inotify": inotify만 사용 (실패하면 start()에서 OSError)
+        "polling": poll_sec마다 .java 파일의 (mtime, 크기)를 비교
+    """
+
+    def __init__(
+        self,
+        roots: Iterable[str],
+        reindex: Callable[[str, list[str]], None],
+        backend: str = "auto",
+        debounce_sec: float = 0.3,
+        poll_sec: float = 2.0,
+        max_delay_sec: Optional[float] = None,
+        initial_scan: bool = True,
+    ) -> None:
+        self.roots = [os.path.abspath(root) for root in roots]
+        self._root_names = dict(zip(self.roots, roots))
+        self._reindex = reindex
+        self.requested_backend = backend
+        self.backend: Optional[str] = None
+        self.debounce_sec = debounce_sec
+        self.poll_sec = poll_sec
+        self.max_delay_sec = max_delay_sec if max_delay_sec is not None else max(10 * debounce_sec, 2.0)
+        self._initial_scan = initial_scan
+
+        self._cond = threading.Condition()
+        self._pending: dict[str, set[str]] = {}
+        self._first_event: Optional[float] = None
+        self._last_event: Optional[float] = None
+        self._in_progress = 0
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._inotify: Optional[_Inotify] = None
+
+        self._events = 0
+        self._batches = 0
+        self._paths_processed = 0
+        self._last_batch: Optional[dict] = None
+        self._last_error: Optional[str] = None
+
+    # ----- 시작/종료 -----
+
+    def start(self) -> "FileWatcher":
+        if self._threads:
+            return self
+        if self.requested_backend in ("auto", "inotify"):
+            try:
+                inotify = _Inotify()
+                try:
+                    for root in self.roots:
+                        inotify.add_tree(root)
+                except OSError:
+                    inotify.close()
+                    raise
+                self._inotify = inotify
+                self.backend = "inotify"
+            except OSError as exc:
+                if self.requested_backend == "inotify":
+                    raise
+                self._last_error = f"inotify unavailable, falling back to polling: {exc}"
+        if self.backend is None:
+            self.backend = "polling"
+
+        source = self._run_inotify if self.backend == "inotify" else self._run_polling
+        self._threads = [
+            threading.Thread(target=source, name="mcp-java-index-watch-events", daemon=True),
+            threading.Thread(target=self._run_worker, name="mcp-java-index-watch-reindex", daemon=True),
+        ]
+        if self._initial_scan:
+            # 서버 시작 직후 첫 검색도 따뜻한 캐시에서 응답하도록 루트 전체를 한 번 인덱싱
+            for root in self.roots:
+                self._enqueue(root, root)
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        if self._inotify is not None:
+            self._inotify.close()
+
+    # ----- 대기열 -----
+
+    def _root_of(self, path: str) -> Optional[str]:
+        for root in self.roots:
+            if path == root or path.startswith(root + os.sep):
+                return root
+        return None
+
+    def _enqueue(self, root: str, path: str) -> None:
+        with self._cond:
+            now = time.monotonic()
+            self._pending.setdefault(root, set()).add(path)
+            self._events += 1
+            if self._first_event is None:
+                self._first_event = now
+            self._last_event = now
+            self._cond.notify_all()
+
+    def notify(self, path: str) -> None:
+        """path(파일 또는 디렉토리)가 바뀌었음을 알림 (감시 루트 밖이면 무시)"""
+        path = os.path.abspath(path)
+        root = self._root_of(path)
+        if root is not None:
+            self._enqueue(root, path)
+
+    def _take_batch(self) -> Optional[dict[str, set[str]]]:
+        with self._cond:
+            while not self._stop.is_set():
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                quiet = now - self._last_event
+                waited = now - self._first_event
+                if quiet < self.debounce_sec and waited < self.max_delay_sec:
+                    self._cond.wait(min(self.debounce_sec - quiet, self.max_delay_sec - waited))
+                    continue
+                batch, self._pending = self._pending, {}
+                self._first_event = self._last_event = None
+                self._in_progress = sum(len(paths) for paths in batch.values())
+                return batch
+        return None
+
+    def _run_worker(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            start = time.perf_counter()
+            for root, paths in batch.items():
+                try:
+                    self._reindex(self._root_names.get(root, root), sorted(paths))
+                except Exception as exc:
+                    self._last_error = f"reindex {root}: {exc}"
+            with self._cond:
+                self._batches += 1
+                self._paths_processed += self._in_progress
+                self._last_batch = {
+                    "roots": sorted(self._root_names.get(root, root) for root in batch),
+                    "paths": self._in_progress,
+                    "elapsedMs": round((time.perf_counter() - start) * 1000, 1),
+                    "finishedAt": time.time(),
+                }
+                self._in_progress = 0
+                self._cond.notify_all()
+
+    def wait_idle(self, timeout: float = 10.0) -> bool:
+        """대기열과 처리 중인 배치가 모두 비면 True (timeout 초과 시 False)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._in_progress:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # ----- 이벤트 소스 -----
+
+    def _run_inotify(self) -> None:
+        inotify = self._inotify
+        assert inotify is not None
+        while not self._stop.is_set():
+            try:
+                events = inotify.read_events(_STOP_CHECK_SEC)
+            except OSError as exc:
+                self._last_error = f"inotify read failed: {exc}"
+                return
+            for wd, mask, name in events:
+                if mask & _IN_Q_OVERFLOW:
+                    # 이벤트가 유실됐으므로 루트 전체를 다시 확인
+                    for root in self.roots:
+                        self._enqueue(root, root)
+                    continue
+                directory = inotify.directories.get(wd)
+                if directory is None:
+                    continue
+                if mask & _IN_IGNORED:
+                    inotify.directories.pop(wd, None)
+                    continue
+                if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                    self.notify(directory)
+                    continue
+                path = os.path.join(directory, name)
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        self._watch_new_directory(inotify, path)
+                    elif mask & _IN_MOVED_FROM:
+                        self.notify(path)
+                    continue
+                if _is_java(name):
+                    self.notify(path)
+
+    def _watch_new_directory(self, inotify: _Inotify, directory: str) -> None:
+        root = self._root_of(directory)
+        if root is None:
+            return
+        try:
+            watched = inotify.add_tree(root, directory)
+        except OSError as exc:
+            self._last_error = str(exc)
+            watched = 1
+        # watch 등록 전에 만들어진 파일은 이벤트가 없으므로 디렉토리째 다시 인덱싱한다 (탐색 규칙이 제외한 디렉토리는 건너뜀)
+        if watched:
+            self.notify(directory)
+
+    def _snapshot(self) -> dict[str, tuple[int, int]]:
+        snapshot: dict[str, tuple[int, int]] = {}
+        for root in self.roots:
+            for _, files in _walk_directories(root):
+                for path in files:
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _run_polling(self) -> None:
+        previous = self._snapshot()
+        while not self._stop.wait(self.poll_sec):
+            try:
+                current = self._snapshot()
+            except OSError as exc:
+                self._last_error = f"polling failed: {exc}"
+                continue
+            for path, signature in current.items():
+                if previous.get(path) != signature:
+                    self.notify(path)
+            for path in previous.keys() - current.keys():
+                self.notify(path)
+            previous = current
+
+    # ----- 상태 -----
+
+    def status(self) -> dict:
+        with self._cond:
+            return {
+                "enabled": True,
+                "running": any(thread.is_alive() for thread in self._threads),
+                "backend": self.backend,
+                "roots": [self._root_names.get(root, root) for root in self.roots],
+                "watchedDirectories": len(self._inotify.directories) if self._inotify is not None else None,
+                "queueDepth": sum(len(paths) for paths in self._pending.values()),
+                "inProgress": self._in_progress,
+                "debounceMs": round(self.debounce_sec * 1000),
+                "pollSec": self.poll_sec if self.backend == "polling" else None,
+                "events": self._events,
+                "batches": self._batches,
+                "pathsProcessed": self._paths_processed,
+                "lastBatch": self._last_batch,
+                "lastError": self._last_error,
+            }
+
+
+def watcher_from_env(reindex: Callable[[str, list[str]], None]) -> Optional[FileWatcher]:
+    """
+    환경 변수 기반 파일 감시기 (MCP_JAVA_INDEX_WATCH_ROOTS가 비어 있으면 None)
+
+    - MCP_JAVA_INDEX_WATCH_ROOTS: 감시할 루트 디렉토리 (os.pathsep으로 구분)
+    - MCP_JAVA_INDEX_WATCH_BACKEND: "auto" (기본값) | "inotify" | "polling"
+    - MCP_JAVA_INDEX_WATCH_DEBOUNCE_MS: 마지막 변경 후 다시 인덱싱하기까지 기다리는 시간 (기본값: 300)
+    - MCP_JAVA_INDEX_WATCH_POLL_SEC: 폴링 주기 (기본값: 2)
+    """
+    roots = watch_roots_from_env()
+    if not roots:
+        return None
+    backend = (os.environ.get("MCP_JAVA_INDEX_WATCH_BACKEND") or "auto").strip().lower()
+    if backend not in ("auto", "inotify", "polling"):
+        backend = "auto"
+    return FileWatcher(
+        roots,
+        reindex,
+        backend=backend,
+        debounce_sec=_env_float("MCP_JAVA_INDEX_WATCH_DEBOUNCE_MS", 300.0) / 1000,
+        poll_sec=_env_float("MCP_JAVA_INDEX_WATCH_POLL_SEC", 2.0) or 2.0,
+    )